@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+JSON-LD çıkarıcı mikro benchmark scripti
+Eski DOTALL regex yaklaşımını ortak artımlı tarayıcı ile karşılaştırır
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import json
+import re
+import timeit
+from typing import Dict, Optional
+
+from json_ld_extract import JsonLdScanner, extract_product_json_ld
+
+PRODUCT = {
+    '@context': 'https://schema.org',
+    '@type': 'Product',
+    'name': 'Kraken X60 Brushless Motor',
+    'sku': 'WCP-0940',
+    'brand': {'@type': 'Brand', 'name': 'WCP'},
+    'offers': {'@type': 'Offer', 'price': '199.99', 'priceCurrency': 'USD',
+               'availability': 'https://schema.org/InStock'}
+}
+
+BREADCRUMB = {
+    '@context': 'https://schema.org',
+    '@type': 'BreadcrumbList',
+    'itemListElement': [{'@type': 'ListItem', 'position': i, 'name': f'Kategori {i}'} for i in range(5)]
+}
+
+
+def regex_extract_json_ld(html: str) -> Optional[Dict]:
+    """Motorlardaki eski çıkarıcı (karşılaştırma için birebir kopya)"""
+    try:
+        pattern = r'<script[^>]+type="application/ld\+json"[^>]*>(.*?)</script>'
+        matches = re.findall(pattern, html, re.DOTALL | re.IGNORECASE)
+
+        for match in matches:
+            try:
+                data = json.loads(match.strip())
+
+                if isinstance(data, list):
+                    for item in data:
+                        if item.get('@type') == 'Product':
+                            return item
+                elif isinstance(data, dict) and data.get('@type') == 'Product':
+                    return data
+
+            except json.JSONDecodeError:
+                continue
+
+    except Exception:
+        pass
+
+    return None
+
+
+def ld_block(data) -> str:
+    return f'<script type="application/ld+json">{json.dumps(data)}</script>\n'
+
+
+def filler(size: int) -> str:
+    """Gerçek sayfalara benzer işaretleme ve script içeriği"""
+    row = ('<div class="product-card"><a href="/products/item">Item</a>'
+           '<span class="price">$9.99</span></div>\n'
+           '<script>window.dataLayer = window.dataLayer || []; dataLayer.push({"event": "view"});</script>\n')
+    return row * (size // len(row))
+
+
+def build_pages() -> Dict[str, str]:
+    """Farklı senaryolar için ~300 KB sayfalar"""
+    head = '<html><head><title>Kraken X60</title>'
+    body = filler(300 * 1024)
+    return {
+        'product_in_head': head + ld_block(BREADCRUMB) + ld_block(PRODUCT) + '</head><body>' + body,
+        'product_at_end': head + '</head><body>' + body + ld_block(BREADCRUMB) + ld_block(PRODUCT),
+        'graph_wrapper': head + ld_block({'@context': 'https://schema.org',
+                                          '@graph': [BREADCRUMB, PRODUCT]}) + '</head><body>' + body,
+        'no_product': head + ld_block(BREADCRUMB) + '</head><body>' + body,
+    }
+
+
+def bench(fn, html: str, number: int) -> float:
+    """Çağrı başına ortalama süre (ms)"""
+    return timeit.timeit(lambda: fn(html), number=number) / number * 1000
+
+
+def check_partial(html: str):
+    """Sayfayı 16 KB parçalarla ver, Product'ın kaçıncı parçada bulunduğunu göster"""
+    scanner = JsonLdScanner()
+    chunk_size = 16 * 1024
+    for index in range(0, len(html), chunk_size):
+        if scanner.feed(html[index:index + chunk_size]) is not None:
+            return index + chunk_size
+    return None
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    pages = build_pages()
+
+    print("⏱️  JSON-LD extraction benchmark")
+    print("=" * 72)
+    print(f"{'sayfa':<18}{'boyut':>9}{'regex (ms)':>13}{'scanner (ms)':>15}{'hız':>8}  sonuç")
+    print("-" * 72)
+
+    for name, html in pages.items():
+        old = regex_extract_json_ld(html)
+        new = extract_product_json_ld(html)
+        # Eski çıkarıcı @graph'ı desteklemiyordu; diğer senaryolarda sonuçlar aynı olmalı
+        if name == 'graph_wrapper':
+            outcome = 'graph ✅' if new == PRODUCT and old is None else 'graph ❌'
+        else:
+            outcome = 'aynı ✅' if old == new else 'farklı ❌'
+
+        regex_ms = bench(regex_extract_json_ld, html, number)
+        scanner_ms = bench(extract_product_json_ld, html, number)
+        print(f"{name:<18}{len(html) // 1024:>7}KB{regex_ms:>13.3f}{scanner_ms:>15.3f}"
+              f"{regex_ms / scanner_ms:>7.1f}x  {outcome}")
+
+    consumed = check_partial(pages['product_in_head'])
+    print("-" * 72)
+    print(f"Kısmi gövde: product_in_head sayfasında Product ilk {consumed // 1024} KB içinde bulundu "
+          f"({len(pages['product_in_head']) // 1024} KB'ın tamamını indirmeye gerek yok)")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,27 +3,49 @@ URL→fiyat/stok/img önbellek sistemi
 24-48 saat TTL ile akıllı önbellek yönetimi
 """
 
-import json
+import atexit
+import threading
 import time
 import hashlib
 import os
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 import logging
 
+from cache_storage import CacheStorage, JSONFileStorage, SQLiteCacheStorage, WriteBehindStorage
+from memory_cache import BoundedMemoryCache
+from expiry_index import ExpiryIndex
+
 logger = logging.getLogger(__name__)
 
 class CacheManager:
-    def __init__(self, cache_dir: str = "cache", default_ttl: int = 24 * 3600):
+    def __init__(self, cache_dir: str = "cache", default_ttl: int = 24 * 3600,
+                 backend: str = "sqlite", storage: Optional[CacheStorage] = None,
+                 memory_max_entries: int = 1000, memory_max_bytes: int = 16 * 1024 * 1024,
+                 write_behind: bool = False, flush_interval: float = 2.0, flush_threshold: int = 50,
+                 empty_result_ttl: int = 30 * 60, error_result_ttl: int = 2 * 60):
         """
         Önbellek yöneticisi
         
         Args:
             cache_dir: Önbellek dosyalarının saklanacağı dizin
             default_ttl: Varsayılan TTL (saniye) - 24 saat
+            backend: Kalıcı depolama türü - "sqlite" (WAL, satır bazlı) veya "json" (eski format)
+            storage: Hazır depolama nesnesi (verilirse backend yok sayılır)
+            memory_max_entries: Bellek katmanında namespace başına maksimum kayıt sayısı
+            memory_max_bytes: Bellek katmanında namespace başına yaklaşık maksimum boyut (bayt)
+            write_behind: Yazımları bellekte biriktirip arka planda toplu olarak kaydet
+            flush_interval: Write-behind flush aralığı (saniye)
+            flush_threshold: Write-behind erken flush için bekleyen kayıt sayısı
+            empty_result_ttl: "Arandı, bulunamadı" negatif kayıtlarının TTL'i (saniye)
+            error_result_ttl: "Tedarikçi hata verdi" negatif kayıtlarının TTL'i (saniye)
         """
         self.cache_dir = cache_dir
         self.default_ttl = default_ttl
+        self.negative_ttls = {
+            'empty': empty_result_ttl,
+            'error': error_result_ttl
+        }
         
         # Önbellek dizinini oluştur
         os.makedirs(cache_dir, exist_ok=True)
@@ -32,29 +54,52 @@ class CacheManager:
         self.url_cache_file = os.path.join(cache_dir, "url_cache.json")
         self.search_cache_file = os.path.join(cache_dir, "search_cache.json")
         self.product_cache_file = os.path.join(cache_dir, "product_cache.json")
+        self.db_file = os.path.join(cache_dir, "cache.db")
+        
+        json_files = {
+            'url': self.url_cache_file,
+            'search': self.search_cache_file,
+            'product': self.product_cache_file
+        }
         
-        # Önbellek verilerini yükle
-        self.url_cache = self._load_cache(self.url_cache_file)
-        self.search_cache = self._load_cache(self.search_cache_file)
-        self.product_cache = self._load_cache(self.product_cache_file)
-
-    def _load_cache(self, file_path: str) -> Dict:
-        """Önbellek dosyasını yükle"""
-        try:
-            if os.path.exists(file_path):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-        except Exception as e:
-            logger.warning(f"Failed to load cache from {file_path}: {e}")
-        return {}
-
-    def _save_cache(self, file_path: str, cache_data: Dict):
-        """Önbellek dosyasını kaydet"""
-        try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            logger.warning(f"Failed to save cache to {file_path}: {e}")
+        # Kalıcı depolama katmanı
+        if storage is not None:
+            self.storage = storage
+        elif backend == "sqlite":
+            self.storage = SQLiteCacheStorage(self.db_file)
+            # Eski JSON önbelleklerini tek seferlik içe aktar
+            self.storage.migrate_from_json(json_files)
+        elif backend == "json":
+            self.storage = JSONFileStorage(json_files)
+        else:
+            raise ValueError(f"Unknown cache backend: {backend}")
+        
+        # Write-behind: istek thread'i disk I/O için beklemez
+        if write_behind:
+            self.storage = WriteBehindStorage(self.storage, flush_interval, flush_threshold)
+            atexit.register(self.close)
+        
+        # Sınırlı bellek katmanları (kalıcı katmandan talep üzerine doldurulur)
+        self.url_cache = BoundedMemoryCache(memory_max_entries, memory_max_bytes)
+        self.search_cache = BoundedMemoryCache(memory_max_entries, memory_max_bytes)
+        self.product_cache = BoundedMemoryCache(memory_max_entries, memory_max_bytes)
+        self._tiers = {
+            'url': self.url_cache,
+            'search': self.search_cache,
+            'product': self.product_cache
+        }
+        
+        # Son kullanma indeksi (yalnızca anahtar + son kullanma zamanı tutulur)
+        self._expiry = ExpiryIndex()
+        # Yazma, silme ve süre dolumu temizliği aynı kilitle sıralanır: süresi dolan
+        # anahtar indeksten alınıp silinene kadar araya yenileme yazısı giremez
+        self._write_lock = threading.RLock()
+        for namespace in self._tiers:
+            for key, timestamp, ttl in self.storage.expiry_items(namespace):
+                # timestamp'i olmayan eski kayıtlar süresi dolmuş sayılır
+                expires_at = (timestamp or 0) + (ttl if ttl is not None else default_ttl)
+                self._expiry.schedule(namespace, key, expires_at)
+        self._expire_due()
 
     def _generate_key(self, *args) -> str:
         """Önbellek anahtarı oluştur"""
@@ -65,23 +110,44 @@ class CacheManager:
         """Önbellek kaydının süresi dolmuş mu kontrol et"""
         return time.time() - timestamp > ttl
 
-    def _clean_expired_entries(self, cache_data: Dict, ttl: int = None) -> Dict:
-        """Süresi dolmuş kayıtları temizle"""
-        if ttl is None:
-            ttl = self.default_ttl
+    def _entry_expired(self, entry: Dict) -> bool:
+        """Kaydın kendi TTL değerine göre süresi dolmuş mu"""
+        return self._is_expired(entry.get('timestamp', 0), entry.get('ttl', self.default_ttl))
+
+    def _expire_due(self):
+        """Yalnızca süresi dolmuş kayıtları bellekten ve kalıcı depolamadan temizle"""
+        expired_by_namespace: Dict[str, List[str]] = {}
+        with self._write_lock:
+            for namespace, key in self._expiry.pop_expired(time.time()):
+                self._tiers[namespace].pop(key)
+                expired_by_namespace.setdefault(namespace, []).append(key)
             
-        current_time = time.time()
-        cleaned_cache = {}
-        
-        for key, value in cache_data.items():
-            if isinstance(value, dict) and 'timestamp' in value:
-                if current_time - value['timestamp'] <= ttl:
-                    cleaned_cache[key] = value
-            else:
-                # Eski format - timestamp yoksa varsayılan TTL uygula
-                cleaned_cache[key] = value
-                
-        return cleaned_cache
+            for namespace, keys in expired_by_namespace.items():
+                self.storage.delete_many(namespace, keys)
+
+    def _read_entry(self, namespace: str, key: str) -> Optional[Dict]:
+        """Kaydı önce bellek katmanından, yoksa kalıcı katmandan oku"""
+        tier = self._tiers[namespace]
+        entry = tier.get(key)
+        if entry is None:
+            entry = self.storage.get(namespace, key)
+            if entry is not None:
+                tier.put(key, entry)
+        return entry
+
+    def _write_entry(self, namespace: str, key: str, entry: Dict):
+        """Kaydı bellek katmanına ve kalıcı katmana yaz"""
+        with self._write_lock:
+            self._tiers[namespace].put(key, entry)
+            self.storage.set(namespace, key, entry)
+            self._expiry.schedule(namespace, key, entry['timestamp'] + entry['ttl'])
+
+    def _delete_entry(self, namespace: str, key: str):
+        """Kaydı her iki katmandan sil"""
+        with self._write_lock:
+            self._tiers[namespace].pop(key)
+            self.storage.delete(namespace, key)
+            self._expiry.discard(namespace, key)
 
     def get_url_status(self, url: str) -> Optional[Dict]:
         """
@@ -94,9 +160,9 @@ class CacheManager:
             URL durumu bilgisi veya None
         """
         key = self._generate_key("url", url)
-        entry = self.url_cache.get(key)
+        entry = self._read_entry('url', key)
         
-        if entry and not self._is_expired(entry.get('timestamp', 0), self.default_ttl):
+        if entry and not self._entry_expired(entry):
             return entry.get('data')
         
         return None
@@ -114,17 +180,16 @@ class CacheManager:
             ttl = self.default_ttl
             
         key = self._generate_key("url", url)
-        self.url_cache[key] = {
+        entry = {
             'data': status,
             'timestamp': time.time(),
             'ttl': ttl
         }
+        # Önbelleğe tek satır olarak kaydet
+        self._write_entry('url', key, entry)
         
         # Süresi dolmuş kayıtları temizle
-        self.url_cache = self._clean_expired_entries(self.url_cache, ttl)
-        
-        # Önbelleği kaydet
-        self._save_cache(self.url_cache_file, self.url_cache)
+        self._expire_due()
 
     def get_search_results(self, query: str, vendor: str = None) -> Optional[List[Dict]]:
         """
@@ -138,14 +203,43 @@ class CacheManager:
             Arama sonuçları veya None
         """
         key = self._generate_key("search", query, vendor or "all")
-        entry = self.search_cache.get(key)
+        entry = self._read_entry('search', key)
         
-        if entry and not self._is_expired(entry.get('timestamp', 0), self.default_ttl):
+        if entry and not self._entry_expired(entry):
             return entry.get('data')
         
         return None
 
-    def set_search_results(self, query: str, results: List[Dict], vendor: str = None, ttl: int = None):
+    def get_search_entry(self, query: str, vendor: str = None) -> Optional[Dict]:
+        """
+        Arama sonuçlarını tazelik bilgisiyle birlikte önbellekten al
+        
+        Args:
+            query: Arama terimi
+            vendor: Tedarikçi (opsiyonel)
+            
+        Returns:
+            {'data', 'age', 'stale', 'negative'} veya None (kayıt yok ya da hard TTL dolmuş).
+            stale=True ise kayıt soft TTL'i geçmiştir ve yenilenmelidir.
+            negative: Negatif kayıtlarda 'empty' veya 'error', normal kayıtlarda None.
+        """
+        key = self._generate_key("search", query, vendor or "all")
+        entry = self._read_entry('search', key)
+        
+        if not entry or self._entry_expired(entry):
+            return None
+        
+        age = time.time() - entry.get('timestamp', 0)
+        soft_ttl = entry.get('soft_ttl')
+        return {
+            'data': entry.get('data'),
+            'age': age,
+            'stale': soft_ttl is not None and age > soft_ttl,
+            'negative': entry.get('negative')
+        }
+
+    def set_search_results(self, query: str, results: List[Dict], vendor: str = None, ttl: int = None,
+                           soft_ttl: int = None):
         """
         Arama sonuçlarını önbelleğe kaydet
         
@@ -153,23 +247,52 @@ class CacheManager:
             query: Arama terimi
             results: Arama sonuçları
             vendor: Tedarikçi (opsiyonel)
-            ttl: TTL (saniye)
+            ttl: TTL (saniye) - bu süreden sonra kayıt hiç sunulmaz (hard TTL)
+            soft_ttl: Tazelik süresi (saniye) - aşılınca kayıt bayat sayılır ama ttl dolana kadar sunulabilir
         """
         if ttl is None:
             ttl = self.default_ttl
             
         key = self._generate_key("search", query, vendor or "all")
-        self.search_cache[key] = {
+        entry = {
             'data': results,
             'timestamp': time.time(),
             'ttl': ttl
         }
+        if soft_ttl is not None:
+            entry['soft_ttl'] = soft_ttl
+        # Önbelleğe tek satır olarak kaydet
+        self._write_entry('search', key, entry)
         
         # Süresi dolmuş kayıtları temizle
-        self.search_cache = self._clean_expired_entries(self.search_cache, ttl)
+        self._expire_due()
+
+    def set_negative_search_result(self, query: str, reason: str, vendor: str = None):
+        """
+        Sonuçsuz aramayı negatif kayıt olarak önbelleğe kaydet
+
+        Boş sonuç da önbellek isabeti sayılır; böylece tedarikçilerde olmayan
+        parçalar için her sorguda tekrar scraping yapılmaz. Negatif kayıtlar
+        kısa TTL ile tutulur ve bayat sunulmaz.
+
+        Args:
+            query: Arama terimi
+            reason: 'empty' (arandı, bulunamadı) veya 'error' (tedarikçi hata verdi)
+            vendor: Tedarikçi (opsiyonel)
+        """
+        if reason not in self.negative_ttls:
+            raise ValueError(f"Unknown negative cache reason: {reason}")
+
+        key = self._generate_key("search", query, vendor or "all")
+        entry = {
+            'data': [],
+            'timestamp': time.time(),
+            'ttl': self.negative_ttls[reason],
+            'negative': reason
+        }
+        self._write_entry('search', key, entry)
         
-        # Önbelleği kaydet
-        self._save_cache(self.search_cache_file, self.search_cache)
+        self._expire_due()
 
     def get_product_info(self, url: str) -> Optional[Dict]:
         """
@@ -182,9 +305,9 @@ class CacheManager:
             Ürün bilgileri veya None
         """
         key = self._generate_key("product", url)
-        entry = self.product_cache.get(key)
+        entry = self._read_entry('product', key)
         
-        if entry and not self._is_expired(entry.get('timestamp', 0), self.default_ttl):
+        if entry and not self._entry_expired(entry):
             return entry.get('data')
         
         return None
@@ -202,17 +325,32 @@ class CacheManager:
             ttl = self.default_ttl
             
         key = self._generate_key("product", url)
-        self.product_cache[key] = {
+        entry = {
             'data': product_info,
             'timestamp': time.time(),
             'ttl': ttl
         }
+        # Önbelleğe tek satır olarak kaydet
+        self._write_entry('product', key, entry)
         
         # Süresi dolmuş kayıtları temizle
-        self.product_cache = self._clean_expired_entries(self.product_cache, ttl)
+        self._expire_due()
+
+    def product_entries(self) -> List[Tuple[Dict, float]]:
+        """
+        Kalıcı depodaki süresi dolmamış ürün kayıtları (sunucu başlarken indeksleri doldurmak için)
         
-        # Önbelleği kaydet
-        self._save_cache(self.product_cache_file, self.product_cache)
+        Returns:
+            (ürün bilgileri, kalan TTL saniye) listesi
+        """
+        now = time.time()
+        entries = []
+        for entry in self.storage.load('product').values():
+            data = entry.get('data') if isinstance(entry, dict) else None
+            if not isinstance(data, dict) or self._entry_expired(entry):
+                continue
+            entries.append((data, entry.get('timestamp', 0) + entry.get('ttl', self.default_ttl) - now))
+        return entries
 
     def get_cached_price(self, url: str) -> Optional[float]:
         """Önbellekten fiyat bilgisini al"""
@@ -238,70 +376,58 @@ class CacheManager:
     def invalidate_url(self, url: str):
         """Belirli URL'nin önbelleğini temizle"""
         key = self._generate_key("url", url)
-        if key in self.url_cache:
-            del self.url_cache[key]
-            self._save_cache(self.url_cache_file, self.url_cache)
+        self._delete_entry('url', key)
 
     def invalidate_product(self, url: str):
         """Belirli ürünün önbelleğini temizle"""
         key = self._generate_key("product", url)
-        if key in self.product_cache:
-            del self.product_cache[key]
-            self._save_cache(self.product_cache_file, self.product_cache)
+        self._delete_entry('product', key)
 
     def invalidate_search(self, query: str, vendor: str = None):
         """Belirli arama sonuçlarının önbelleğini temizle"""
         key = self._generate_key("search", query, vendor or "all")
-        if key in self.search_cache:
-            del self.search_cache[key]
-            self._save_cache(self.search_cache_file, self.search_cache)
+        self._delete_entry('search', key)
 
     def clear_all_cache(self):
         """Tüm önbelleği temizle"""
-        self.url_cache = {}
-        self.search_cache = {}
-        self.product_cache = {}
-        
-        self._save_cache(self.url_cache_file, self.url_cache)
-        self._save_cache(self.search_cache_file, self.search_cache)
-        self._save_cache(self.product_cache_file, self.product_cache)
+        with self._write_lock:
+            for namespace, tier in self._tiers.items():
+                tier.clear()
+                self.storage.clear(namespace)
+                self._expiry.clear(namespace)
 
     def get_cache_stats(self) -> Dict:
         """Önbellek istatistiklerini al"""
-        current_time = time.time()
-        
-        def count_valid_entries(cache_data: Dict, ttl: int) -> int:
-            count = 0
-            for entry in cache_data.values():
-                if isinstance(entry, dict) and 'timestamp' in entry:
-                    if current_time - entry['timestamp'] <= ttl:
-                        count += 1
-                else:
-                    count += 1
-            return count
+        # Süresi dolanlar indeksten düşülünce sayımlar O(1) okunur
+        self._expire_due()
+        counts = {namespace: self._expiry.count(namespace) for namespace in self._tiers}
         
         return {
-            'url_cache_entries': count_valid_entries(self.url_cache, self.default_ttl),
-            'search_cache_entries': count_valid_entries(self.search_cache, self.default_ttl),
-            'product_cache_entries': count_valid_entries(self.product_cache, self.default_ttl),
-            'total_entries': (
-                count_valid_entries(self.url_cache, self.default_ttl) +
-                count_valid_entries(self.search_cache, self.default_ttl) +
-                count_valid_entries(self.product_cache, self.default_ttl)
+            'url_cache_entries': counts['url'],
+            'search_cache_entries': counts['search'],
+            'product_cache_entries': counts['product'],
+            'total_entries': sum(counts.values()),
+            'memory_tier': {namespace: tier.stats() for namespace, tier in self._tiers.items()},
+            'pending_writes': (
+                self.storage.pending_count() if isinstance(self.storage, WriteBehindStorage) else 0
             ),
             'cache_dir': self.cache_dir,
-            'default_ttl_hours': self.default_ttl / 3600
+            'default_ttl_hours': self.default_ttl / 3600,
+            'negative_ttl_seconds': dict(self.negative_ttls)
         }
 
     def cleanup_expired(self):
         """Süresi dolmuş tüm kayıtları temizle"""
-        self.url_cache = self._clean_expired_entries(self.url_cache)
-        self.search_cache = self._clean_expired_entries(self.search_cache)
-        self.product_cache = self._clean_expired_entries(self.product_cache)
-        
-        self._save_cache(self.url_cache_file, self.url_cache)
-        self._save_cache(self.search_cache_file, self.search_cache)
-        self._save_cache(self.product_cache_file, self.product_cache)
+        self._expire_due()
+
+    def flush(self):
+        """Bekleyen yazımları kalıcı depolamaya aktar (write-behind modunda)"""
+        if isinstance(self.storage, WriteBehindStorage):
+            self.storage.flush()
+
+    def close(self):
+        """Bekleyen yazımları kaydet ve depolamayı kapat"""
+        self.storage.close()
 
     def set_custom_ttl(self, url: str, ttl_hours: int):
         """
@@ -315,17 +441,15 @@ class CacheManager:
         
         # URL cache'de varsa güncelle
         key = self._generate_key("url", url)
-        if key in self.url_cache:
-            self.url_cache[key]['ttl'] = ttl_seconds
+        entry = self._read_entry('url', key)
+        if entry is not None:
+            self._write_entry('url', key, dict(entry, ttl=ttl_seconds))
         
         # Product cache'de varsa güncelle
         product_key = self._generate_key("product", url)
-        if product_key in self.product_cache:
-            self.product_cache[product_key]['ttl'] = ttl_seconds
-        
-        # Önbellekleri kaydet
-        self._save_cache(self.url_cache_file, self.url_cache)
-        self._save_cache(self.product_cache_file, self.product_cache)
+        product_entry = self._read_entry('product', product_key)
+        if product_entry is not None:
+            self._write_entry('product', product_key, dict(product_entry, ttl=ttl_seconds))
 
 
 # Test ve örnek kullanım
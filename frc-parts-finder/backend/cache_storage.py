@@ -0,0 +1,484 @@
+"""
+Önbellek kalıcı depolama katmanları
+JSON dosyası (eski format) ve SQLite/WAL tabanlı satır bazlı depolama
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CacheStorage(ABC):
+    """
+    Önbellek depolama arayüzü
+
+    Kayıtlar namespace ('url', 'search', 'product') ve anahtar ile saklanır.
+    Her kayıt {'data', 'timestamp', 'ttl', ...} yapısında bir dict'tir.
+    """
+
+    @abstractmethod
+    def load(self, namespace: str) -> Dict[str, Dict]:
+        """Namespace'teki tüm kayıtları yükle"""
+
+    @abstractmethod
+    def get(self, namespace: str, key: str) -> Optional[Dict]:
+        """Tek bir kaydı oku"""
+
+    @abstractmethod
+    def set(self, namespace: str, key: str, entry: Dict):
+        """Tek bir kaydı ekle veya güncelle"""
+
+    @abstractmethod
+    def delete(self, namespace: str, key: str):
+        """Tek bir kaydı sil"""
+
+    @abstractmethod
+    def clear(self, namespace: str):
+        """Namespace'teki tüm kayıtları sil"""
+
+    def set_many(self, namespace: str, entries: Dict[str, Dict]):
+        """Birden fazla kaydı tek seferde ekle veya güncelle"""
+        for key, entry in entries.items():
+            self.set(namespace, key, entry)
+
+    @abstractmethod
+    def delete_many(self, namespace: str, keys: List[str]):
+        """Birden fazla kaydı tek seferde sil"""
+
+    @abstractmethod
+    def expiry_items(self, namespace: str) -> List[Tuple[str, Optional[float], Optional[int]]]:
+        """Son kullanma indeksi için (anahtar, timestamp, ttl) listesi"""
+
+    @abstractmethod
+    def count(self, namespace: str) -> int:
+        """Namespace'teki kayıt sayısı"""
+
+    def close(self):
+        """Depolamayı kapat"""
+        pass
+
+
+class JSONFileStorage(CacheStorage):
+    """Namespace başına tek JSON dosyası (eski davranış, her yazımda tüm dosya yazılır)"""
+
+    def __init__(self, files: Dict[str, str]):
+        """
+        Args:
+            files: namespace -> JSON dosya yolu
+        """
+        self.files = files
+        self._data = {namespace: self._load_file(path) for namespace, path in files.items()}
+        self._lock = threading.Lock()
+
+    def _load_file(self, file_path: str) -> Dict:
+        """Önbellek dosyasını yükle"""
+        try:
+            if os.path.exists(file_path):
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.warning(f"Failed to load cache from {file_path}: {e}")
+        return {}
+
+    def _save(self, namespace: str):
+        """Namespace dosyasını geçici dosya üzerinden atomik olarak kaydet"""
+        file_path = self.files[namespace]
+        tmp_path = f"{file_path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._data[namespace], f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, file_path)
+        except Exception as e:
+            logger.warning(f"Failed to save cache to {file_path}: {e}")
+
+    def load(self, namespace: str) -> Dict[str, Dict]:
+        return dict(self._data[namespace])
+
+    def get(self, namespace: str, key: str) -> Optional[Dict]:
+        return self._data[namespace].get(key)
+
+    def set(self, namespace: str, key: str, entry: Dict):
+        with self._lock:
+            self._data[namespace][key] = entry
+            self._save(namespace)
+
+    def delete(self, namespace: str, key: str):
+        with self._lock:
+            if self._data[namespace].pop(key, None) is not None:
+                self._save(namespace)
+
+    def clear(self, namespace: str):
+        with self._lock:
+            self._data[namespace] = {}
+            self._save(namespace)
+
+    def set_many(self, namespace: str, entries: Dict[str, Dict]):
+        with self._lock:
+            self._data[namespace].update(entries)
+            self._save(namespace)
+
+    def delete_many(self, namespace: str, keys: List[str]):
+        with self._lock:
+            cache_data = self._data[namespace]
+            removed = [key for key in keys if cache_data.pop(key, None) is not None]
+            if removed:
+                self._save(namespace)
+
+    def expiry_items(self, namespace: str) -> List[Tuple[str, Optional[float], Optional[int]]]:
+        return [
+            (key, value.get('timestamp'), value.get('ttl'))
+            for key, value in self._data[namespace].items()
+            if isinstance(value, dict)
+        ]
+
+    def count(self, namespace: str) -> int:
+        return len(self._data[namespace])
+
+
+class SQLiteCacheStorage(CacheStorage):
+    """
+    SQLite (WAL modu) tabanlı önbellek depolama
+
+    Her yazım tek satırlık bir upsert'tir ve kendi transaction'ı içinde
+    commit edilir; yazım maliyeti önbellek boyutundan bağımsızdır ve
+    yarıda kalan bir yazım veritabanını bozmaz.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS cache_entries (
+            namespace TEXT NOT NULL,
+            key TEXT NOT NULL,
+            value TEXT NOT NULL,
+            timestamp REAL,
+            ttl INTEGER,
+            PRIMARY KEY (namespace, key)
+        );
+        CREATE INDEX IF NOT EXISTS idx_cache_entries_timestamp
+            ON cache_entries (namespace, timestamp);
+        CREATE TABLE IF NOT EXISTS cache_meta (
+            name TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Args:
+            db_path: SQLite veritabanı dosya yolu
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+
+    @staticmethod
+    def _row_to_entry(value: str) -> Optional[Dict]:
+        try:
+            return json.loads(value)
+        except (TypeError, ValueError):
+            return None
+
+    def _upsert_rows(self, rows: Iterable[tuple]):
+        self._conn.executemany(
+            """
+            INSERT INTO cache_entries (namespace, key, value, timestamp, ttl)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (namespace, key) DO UPDATE SET
+                value = excluded.value,
+                timestamp = excluded.timestamp,
+                ttl = excluded.ttl
+            """,
+            rows
+        )
+
+    @staticmethod
+    def _entry_row(namespace: str, key: str, entry: Dict) -> tuple:
+        timestamp = entry.get('timestamp') if isinstance(entry, dict) else None
+        ttl = entry.get('ttl') if isinstance(entry, dict) else None
+        return (namespace, key, json.dumps(entry, ensure_ascii=False), timestamp, ttl)
+
+    def load(self, namespace: str) -> Dict[str, Dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value FROM cache_entries WHERE namespace = ?", (namespace,)
+            ).fetchall()
+        entries = {}
+        for key, value in rows:
+            entry = self._row_to_entry(value)
+            if entry is not None:
+                entries[key] = entry
+        return entries
+
+    def get(self, namespace: str, key: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM cache_entries WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+        return self._row_to_entry(row[0]) if row else None
+
+    def set(self, namespace: str, key: str, entry: Dict):
+        row = self._entry_row(namespace, key, entry)
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._upsert_rows([row])
+
+    def delete(self, namespace: str, key: str):
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (namespace, key)
+            )
+
+    def clear(self, namespace: str):
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (namespace,))
+
+    def set_many(self, namespace: str, entries: Dict[str, Dict]):
+        rows = [self._entry_row(namespace, key, entry) for key, entry in entries.items()]
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._upsert_rows(rows)
+
+    def delete_many(self, namespace: str, keys: List[str]):
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                [(namespace, key) for key in keys]
+            )
+
+    def expiry_items(self, namespace: str) -> List[Tuple[str, Optional[float], Optional[int]]]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT key, timestamp, ttl FROM cache_entries WHERE namespace = ?", (namespace,)
+            ).fetchall()
+
+    def count(self, namespace: str) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?", (namespace,)
+            ).fetchone()
+        return row[0]
+
+    def migrate_from_json(self, files: Dict[str, str]) -> int:
+        """
+        Eski JSON önbellek dosyalarını tek seferlik olarak içe aktar
+
+        Args:
+            files: namespace -> JSON dosya yolu
+
+        Returns:
+            Aktarılan kayıt sayısı (migration daha önce yapıldıysa 0)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM cache_meta WHERE name = 'json_migrated_at'"
+            ).fetchone()
+            if row:
+                return 0
+
+            rows = []
+            for namespace, file_path in files.items():
+                if not os.path.exists(file_path):
+                    continue
+                try:
+                    with open(file_path, 'r', encoding='utf-8') as f:
+                        cache_data = json.load(f)
+                except Exception as e:
+                    logger.warning(f"Skipping unreadable cache file {file_path}: {e}")
+                    continue
+                if not isinstance(cache_data, dict):
+                    continue
+                for key, entry in cache_data.items():
+                    if isinstance(entry, dict):
+                        rows.append(self._entry_row(namespace, key, entry))
+
+            with self._conn:
+                self._conn.execute("BEGIN")
+                # Mevcut (daha yeni) satırların üzerine yazma
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO cache_entries (namespace, key, value, timestamp, ttl) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows
+                )
+                self._conn.execute(
+                    "INSERT INTO cache_meta (name, value) VALUES ('json_migrated_at', ?)",
+                    (str(time.time()),)
+                )
+
+        if rows:
+            logger.info(f"Migrated {len(rows)} cache entries from JSON into {self.db_path}")
+        return len(rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class WriteBehindStorage(CacheStorage):
+    """
+    Yazımları bellekte biriktirip arka planda toplu olarak kalıcı hale getiren sarmalayıcı
+
+    set/delete/clear çağrıları yalnızca bellek içi günlüğe (journal) yazılır
+    ve hemen döner. Arka plan thread'i günlüğü flush_interval saniyede bir
+    veya bekleyen kayıt sayısı flush_threshold'a ulaştığında, namespace
+    başına tek transaction ile alttaki depolamaya aktarır. Okumalar önce
+    günlüğe bakar, böylece henüz yazılmamış değişiklikler de görünür.
+    """
+
+    def __init__(self, inner: CacheStorage, flush_interval: float = 2.0, flush_threshold: int = 50):
+        """
+        Args:
+            inner: Asıl kalıcı depolama
+            flush_interval: Periyodik flush aralığı (saniye)
+            flush_threshold: Erken flush tetikleyen bekleyen kayıt sayısı
+        """
+        self.inner = inner
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = self._new_journal()
+        self._flushing = self._new_journal()
+        self._wakeup = threading.Event()
+        self._stopped = False
+
+        self.flush_count = 0
+        self.flushed_entries = 0
+
+        self._thread = threading.Thread(target=self._run, name="cache-write-behind", daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def _new_journal() -> Dict:
+        # ops: (namespace, key) -> kayıt veya silme için None
+        return {'cleared': set(), 'ops': {}}
+
+    def _journal(self, namespace: str, key: str, entry: Optional[Dict]):
+        with self._lock:
+            self._pending['ops'][(namespace, key)] = entry
+            pending_count = len(self._pending['ops'])
+        if pending_count >= self.flush_threshold:
+            self._wakeup.set()
+
+    def _lookup(self, namespace: str, key: str):
+        """Günlükte kayıt varsa (True, kayıt) döndür"""
+        with self._lock:
+            for journal in (self._pending, self._flushing):
+                if (namespace, key) in journal['ops']:
+                    return True, journal['ops'][(namespace, key)]
+                if namespace in journal['cleared']:
+                    return True, None
+        return False, None
+
+    def load(self, namespace: str) -> Dict[str, Dict]:
+        self.flush()
+        return self.inner.load(namespace)
+
+    def get(self, namespace: str, key: str) -> Optional[Dict]:
+        found, entry = self._lookup(namespace, key)
+        if found:
+            return entry
+        return self.inner.get(namespace, key)
+
+    def set(self, namespace: str, key: str, entry: Dict):
+        self._journal(namespace, key, entry)
+
+    def set_many(self, namespace: str, entries: Dict[str, Dict]):
+        for key, entry in entries.items():
+            self._journal(namespace, key, entry)
+
+    def delete(self, namespace: str, key: str):
+        self._journal(namespace, key, None)
+
+    def delete_many(self, namespace: str, keys: List[str]):
+        for key in keys:
+            self._journal(namespace, key, None)
+
+    def clear(self, namespace: str):
+        with self._lock:
+            ops = self._pending['ops']
+            for item in [item for item in ops if item[0] == namespace]:
+                del ops[item]
+            self._pending['cleared'].add(namespace)
+
+    def expiry_items(self, namespace: str) -> List[Tuple[str, Optional[float], Optional[int]]]:
+        self.flush()
+        return self.inner.expiry_items(namespace)
+
+    def count(self, namespace: str) -> int:
+        self.flush()
+        return self.inner.count(namespace)
+
+    def pending_count(self) -> int:
+        """Henüz kalıcı hale getirilmemiş değişiklik sayısı"""
+        with self._lock:
+            return len(self._pending['ops']) + len(self._pending['cleared'])
+
+    def flush(self):
+        """Bekleyen tüm değişiklikleri alttaki depolamaya yaz"""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending['ops'] and not self._pending['cleared']:
+                    return
+                self._flushing = self._pending
+                self._pending = self._new_journal()
+            batch = self._flushing
+
+            try:
+                # Önce temizlemeler, sonra bu temizlemeden sonra gelen yazımlar
+                for namespace in batch['cleared']:
+                    self.inner.clear(namespace)
+
+                upserts: Dict[str, Dict[str, Dict]] = {}
+                deletes: Dict[str, List[str]] = {}
+                for (namespace, key), entry in batch['ops'].items():
+                    if entry is None:
+                        deletes.setdefault(namespace, []).append(key)
+                    else:
+                        upserts.setdefault(namespace, {})[key] = entry
+                for namespace, entries in upserts.items():
+                    self.inner.set_many(namespace, entries)
+                for namespace, keys in deletes.items():
+                    self.inner.delete_many(namespace, keys)
+
+                self.flush_count += 1
+                self.flushed_entries += len(batch['ops'])
+            except Exception as e:
+                logger.warning(f"Write-behind flush failed, will retry: {e}")
+                # Sonradan gelen yazımları ezmeden günlüğe geri koy
+                with self._lock:
+                    for item, entry in batch['ops'].items():
+                        if item not in self._pending['ops'] and item[0] not in self._pending['cleared']:
+                            self._pending['ops'][item] = entry
+                    self._pending['cleared'] |= batch['cleared']
+            finally:
+                with self._lock:
+                    self._flushing = self._new_journal()
+
+    def _run(self):
+        while not self._stopped:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def close(self):
+        """Arka plan thread'ini durdur, son değişiklikleri yaz ve depolamayı kapat"""
+        if self._stopped:
+            return
+        self._stopped = True
+        self._wakeup.set()
+        self._thread.join(timeout=5)
+        self.flush()
+        self.inner.close()
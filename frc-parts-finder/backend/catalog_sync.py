@@ -0,0 +1,785 @@
+"""
+Shopify ve WooCommerce tedarikçileri için yerel ürün kataloğu
+Katalog artımlı senkronize edilir (updated_at / modified / sitemap <lastmod>); /api/search sonuçları tedarikçiye gitmeden buradan döner
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import logging
+
+from keyword_matcher import compile_keywords
+from page_document import normalize_text
+from shopify_search import ShopifySearchEngine
+from woocommerce_search import WooCommerceSearchEngine
+
+logger = logging.getLogger(__name__)
+
+CATALOG_DB_PATH = os.path.join('cache', 'catalog.db')
+
+# Şema değiştiğinde artırılır; eski katalog silinip yeniden senkronize edilir
+CATALOG_SCHEMA_VERSION = 2
+
+# Senkronizasyon aralığı (saniye) ve bu sürenin kaç katından sonra katalog bayat sayılır
+CATALOG_SYNC_INTERVAL = 6 * 3600
+CATALOG_STALE_FACTOR = 2
+
+# Artımlı turlarda görülmeyen silmeler ve kaçan değişiklikler için periyodik tam tarama
+CATALOG_FULL_SYNC_INTERVAL = 7 * 24 * 3600
+
+# High-water mark'tan bu kadar önceki değişiklikler de tekrar kontrol edilir (saat farkı, önbellek gecikmesi)
+CATALOG_HWM_OVERLAP = 300
+
+# Artımlı turda bundan fazla ürün değiştiyse tek tek çekmek yerine tam tarama yapılır
+CATALOG_INCREMENTAL_MAX = 100
+
+# Shopify products.json sayfa başına en fazla 250, WooCommerce Store API 100 ürün döndürür
+CATALOG_PAGE_LIMIT = 250
+WOOCOMMERCE_PAGE_LIMIT = 100
+CATALOG_MAX_PAGES = 200
+
+_TAG_RE = re.compile(r'<[^>]+>')
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[float]:
+    """
+    ISO 8601 zamanını epoch saniyesine çevir (saat dilimi yoksa UTC)
+
+    Args:
+        value: '2024-01-05T10:20:30-05:00', '2024-01-05T15:20:30Z', '2024-01-05' gibi
+
+    Returns:
+        Epoch saniyesi (çözülemezse None)
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def format_timestamp(timestamp: float) -> str:
+    """Epoch saniyesini ISO 8601 UTC zamanına çevir"""
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+
+
+def _strip_html(html: Optional[str]) -> str:
+    return normalize_text(_TAG_RE.sub(' ', html or ''))
+
+
+def normalize_shopify_product(domain: str, product: Dict) -> Optional[Dict]:
+    """
+    products.json ürününü arama sonucu formatına çevir
+
+    Args:
+        domain: Tedarikçi domain
+        product: products.json'daki ürün
+
+    Returns:
+        Normalize ürün (handle yoksa None)
+    """
+    handle = product.get('handle')
+    if not handle or product.get('id') is None:
+        return None
+
+    variants = product.get('variants') or []
+    prices = []
+    for variant in variants:
+        try:
+            prices.append(float(variant.get('price')))
+        except (TypeError, ValueError):
+            continue
+    skus = [variant.get('sku') for variant in variants if variant.get('sku')]
+    images = product.get('images') or []
+    tags = product.get('tags') or []
+    if isinstance(tags, str):
+        tags = [tag.strip() for tag in tags.split(',') if tag.strip()]
+
+    return {
+        'id': str(product['id']),
+        'name': product.get('title', ''),
+        'url': f"https://{domain}/products/{handle}",
+        'price': min(prices) if prices else None,
+        'inStock': any(variant.get('available', True) for variant in variants) if variants else True,
+        'sku': skus[0] if skus else None,
+        'skus': skus,
+        'image': images[0].get('src') if images and isinstance(images[0], dict) else None,
+        'brand': product.get('vendor'),
+        'description': _strip_html(product.get('body_html'))[:200],
+        'product_type': product.get('product_type', ''),
+        'tags': tags,
+        'updated_at': product.get('updated_at')
+    }
+
+
+def normalize_woocommerce_product(domain: str, product: Dict) -> Optional[Dict]:
+    """
+    WooCommerce Store API (veya v3) ürününü arama sonucu formatına çevir
+
+    Args:
+        domain: Tedarikçi domain
+        product: API'deki ürün
+
+    Returns:
+        Normalize ürün (id veya bağlantı yoksa None)
+    """
+    url = product.get('permalink')
+    if not url or product.get('id') is None:
+        return None
+
+    # Store API fiyatı en küçük para biriminde verir ("1999" + minor unit 2 -> 19.99)
+    price = None
+    prices = product.get('prices')
+    try:
+        if isinstance(prices, dict) and prices.get('price'):
+            price = int(prices['price']) / 10 ** int(prices.get('currency_minor_unit', 2))
+        elif product.get('price'):
+            price = float(product['price'])
+    except (TypeError, ValueError):
+        price = None
+
+    if 'is_in_stock' in product:
+        in_stock = bool(product['is_in_stock'])
+    else:
+        in_stock = product.get('stock_status', 'instock') == 'instock'
+
+    images = product.get('images') or []
+    categories = [category.get('name') for category in product.get('categories') or [] if category.get('name')]
+    tags = [tag.get('name') for tag in product.get('tags') or [] if tag.get('name')]
+    description = product.get('short_description') or product.get('description')
+
+    return {
+        'id': str(product['id']),
+        'name': normalize_text(product.get('name', '')),
+        'url': url,
+        'price': price,
+        'inStock': in_stock,
+        'sku': product.get('sku') or None,
+        'skus': [product['sku']] if product.get('sku') else [],
+        'image': images[0].get('src') if images and isinstance(images[0], dict) else None,
+        'brand': None,
+        'description': _strip_html(description)[:200],
+        'product_type': ', '.join(categories),
+        'tags': tags,
+        # Store API değişiklik zamanı vermez; v3 API verir
+        'updated_at': product.get('date_modified_gmt') or product.get('date_modified')
+    }
+
+
+def catalog_search_text(product: Dict) -> str:
+    """Ürünün aranan alanlarını tek küçük harfli metinde birleştir"""
+    parts = [product.get('name'), product.get('brand'), product.get('product_type'),
+             product_handle(product['url']), product.get('description')]
+    parts.extend(product.get('skus') or [])
+    parts.extend(product.get('tags') or [])
+    return ' '.join(part for part in parts if part).lower()
+
+
+def product_handle(url: str) -> str:
+    """Ürün URL'sinin son yol parçası (Shopify handle'ı)"""
+    return url.split('?', 1)[0].rstrip('/').rsplit('/', 1)[-1]
+
+
+class CatalogStore:
+    """
+    SQLite (WAL) tabanlı yerel katalog
+
+    Ürünler tedarikçi + ürün id'si ile saklanır; bir tedarikçinin
+    senkronizasyon sonucu (eklenen, değişen, silinen ürünler ve yeni
+    high-water mark) tek transaction'da uygulanır, yarıda kalan bir
+    senkronizasyon eski kataloğu bozmaz. İçeriği değişmeyen ürünler
+    yeniden yazılmaz.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS catalog_products (
+            vendor TEXT NOT NULL,
+            product_id TEXT NOT NULL,
+            url TEXT NOT NULL,
+            data TEXT NOT NULL,
+            search_text TEXT NOT NULL,
+            modified REAL,
+            synced_at REAL,
+            PRIMARY KEY (vendor, product_id)
+        );
+        CREATE TABLE IF NOT EXISTS catalog_vendors (
+            vendor TEXT PRIMARY KEY,
+            name TEXT,
+            platform TEXT,
+            synced_at REAL,
+            full_synced_at REAL,
+            high_water_mark REAL,
+            product_count INTEGER
+        );
+    """
+
+    def __init__(self, db_path: str = CATALOG_DB_PATH):
+        """
+        Args:
+            db_path: SQLite veritabanı dosya yolu
+        """
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
+
+    def _migrate(self):
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < CATALOG_SCHEMA_VERSION:
+            # Katalog tedarikçiden yeniden üretilebilir; eski şema taşınmak yerine silinir
+            self._conn.executescript("DROP TABLE IF EXISTS catalog_products; DROP TABLE IF EXISTS catalog_vendors;")
+            self._conn.execute(f"PRAGMA user_version = {CATALOG_SCHEMA_VERSION}")
+        self._conn.executescript(self.SCHEMA)
+
+    def apply_sync(self, vendor: str, name: str, platform: str, products: List[Dict],
+                   removed_ids: Iterable[str] = (), full: bool = False,
+                   high_water_mark: Optional[float] = None) -> Dict[str, int]:
+        """
+        Senkronizasyon sonucunu kataloğa uygula
+
+        Args:
+            vendor: Tedarikçi domain
+            name: Tedarikçi görünen adı
+            platform: 'shopify' / 'woocommerce'
+            products: Çekilen normalize ürünler (tam taramada tedarikçinin tüm ürünleri)
+            removed_ids: Tedarikçiden kaldırılan ürün id'leri
+            full: Tam tarama ise listede olmayan ürünler de silinir
+            high_water_mark: Bu turda görülen en yeni değişiklik zamanı (ürünlerin updated_at'i ayrıca hesaba katılır)
+
+        Returns:
+            {'added', 'changed', 'removed', 'unchanged', 'products'} sayıları
+        """
+        now = time.time()
+        counts = {'added': 0, 'changed': 0, 'removed': 0, 'unchanged': 0}
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                existing = dict(self._conn.execute(
+                    "SELECT product_id, data FROM catalog_products WHERE vendor = ?", (vendor,)
+                ).fetchall())
+
+                rows, seen = [], set()
+                for product in products:
+                    seen.add(product['id'])
+                    modified = parse_timestamp(product.get('updated_at'))
+                    if modified is not None:
+                        high_water_mark = max(high_water_mark or modified, modified)
+                    data = json.dumps(product, ensure_ascii=False, sort_keys=True)
+                    previous = existing.get(product['id'])
+                    if previous == data:
+                        counts['unchanged'] += 1
+                        continue
+                    counts['added' if previous is None else 'changed'] += 1
+                    rows.append((vendor, product['id'], product['url'], data,
+                                 catalog_search_text(product), modified, now))
+
+                self._conn.executemany(
+                    """
+                    INSERT INTO catalog_products (vendor, product_id, url, data, search_text, modified, synced_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (vendor, product_id) DO UPDATE SET
+                        url = excluded.url,
+                        data = excluded.data,
+                        search_text = excluded.search_text,
+                        modified = excluded.modified,
+                        synced_at = excluded.synced_at
+                    """,
+                    rows
+                )
+
+                # Tam taramada görülmeyen ürünler tedarikçiden kaldırılmıştır
+                removed = set(existing) - seen if full else (set(removed_ids) & set(existing)) - seen
+                self._conn.executemany(
+                    "DELETE FROM catalog_products WHERE vendor = ? AND product_id = ?",
+                    [(vendor, product_id) for product_id in removed]
+                )
+                counts['removed'] = len(removed)
+                counts['products'] = len(existing) + counts['added'] - counts['removed']
+
+                self._conn.execute(
+                    """
+                    INSERT INTO catalog_vendors (vendor, name, platform, synced_at, full_synced_at,
+                                                 high_water_mark, product_count)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (vendor) DO UPDATE SET
+                        name = excluded.name,
+                        platform = excluded.platform,
+                        synced_at = excluded.synced_at,
+                        full_synced_at = COALESCE(excluded.full_synced_at, catalog_vendors.full_synced_at),
+                        high_water_mark = MAX(COALESCE(excluded.high_water_mark, 0),
+                                              COALESCE(catalog_vendors.high_water_mark, 0)),
+                        product_count = excluded.product_count
+                    """,
+                    (vendor, name, platform, now, now if full else None, high_water_mark, counts['products'])
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return counts
+
+    def vendors(self) -> Dict[str, Dict]:
+        """Senkronize edilmiş tedarikçiler: domain -> durum (synced_at, high_water_mark, ...)"""
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT vendor, name, platform, synced_at, full_synced_at, high_water_mark, product_count
+                FROM catalog_vendors
+                """
+            ).fetchall()
+        return {
+            vendor: {
+                'name': name,
+                'platform': platform,
+                'synced_at': synced_at,
+                'full_synced_at': full_synced_at,
+                'high_water_mark': high_water_mark or None,
+                'product_count': product_count
+            }
+            for vendor, name, platform, synced_at, full_synced_at, high_water_mark, product_count in rows
+        }
+
+    def vendor_products(self, vendor: str) -> Dict[str, Tuple[str, Optional[float]]]:
+        """
+        Tedarikçinin katalogdaki ürünleri
+
+        Returns:
+            URL -> (ürün id, değişiklik zamanı)
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url, product_id, modified FROM catalog_products WHERE vendor = ?", (vendor,)
+            ).fetchall()
+        return {url: (product_id, modified) for url, product_id, modified in rows}
+
+    def products(self) -> List[Tuple[str, Dict]]:
+        """
+        Katalogdaki tüm ürünler
+
+        Returns:
+            (tedarikçi görünen adı, normalize ürün) listesi
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT v.name, p.data FROM catalog_products p
+                JOIN catalog_vendors v ON v.vendor = p.vendor
+                ORDER BY p.vendor, p.rowid
+                """
+            ).fetchall()
+        return [(name, json.loads(data)) for name, data in rows]
+
+    def product_ids(self) -> List[Tuple[str, str]]:
+        """Katalogdaki (tedarikçi domain, ürün id) çiftleri"""
+        with self._lock:
+            return self._conn.execute("SELECT vendor, product_id FROM catalog_products").fetchall()
+
+    def rows_since(self, synced_after: float) -> List[Tuple[str, str, str, Dict]]:
+        """
+        Verilen zamandan sonra yazılan (eklenen/değişen) ürünler
+
+        Args:
+            synced_after: Epoch saniyesi
+
+        Returns:
+            (tedarikçi domain, görünen ad, ürün id, normalize ürün) listesi
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT p.vendor, v.name, p.product_id, p.data FROM catalog_products p
+                JOIN catalog_vendors v ON v.vendor = p.vendor
+                WHERE p.synced_at > ?
+                """,
+                (synced_after,)
+            ).fetchall()
+        return [(vendor, name, product_id, json.loads(data)) for vendor, name, product_id, data in rows]
+
+    def last_synced_at(self) -> Optional[float]:
+        """En son senkronizasyon turunun zamanı (hiç senkronize edilmediyse None)"""
+        with self._lock:
+            return self._conn.execute("SELECT MAX(synced_at) FROM catalog_vendors").fetchone()[0]
+
+    def search(self, query: str, vendors: List[str], canonical_specs: Optional[Dict] = None,
+               limit: int = 20) -> Dict[str, List[Dict]]:
+        """
+        Katalogda ara - tüm sorgu kelimeleri ürün metninde geçmeli
+
+        Args:
+            query: Arama terimi
+            vendors: Aranacak tedarikçi domainleri
+            canonical_specs: Canonical parça özellikleri (zorunlu kelimeler filtre olarak uygulanır)
+            limit: Tedarikçi başına en fazla sonuç
+
+        Returns:
+            Tedarikçi domain -> ürünler
+        """
+        words = query.lower().split()
+        results: Dict[str, List[Dict]] = {vendor: [] for vendor in vendors}
+        if not words or not vendors:
+            return results
+
+        must = compile_keywords(canonical_specs['must_keywords']) if canonical_specs and canonical_specs.get('must_keywords') else None
+        conditions = ' AND '.join(["instr(search_text, ?) > 0"] * len(words))
+        placeholders = ', '.join('?' * len(vendors))
+        sql = (f"SELECT vendor, data, search_text FROM catalog_products "
+               f"WHERE vendor IN ({placeholders}) AND {conditions} ORDER BY vendor, rowid")
+
+        with self._lock:
+            rows = self._conn.execute(sql, [*vendors, *words]).fetchall()
+
+        for vendor, data, search_text in rows:
+            if len(results[vendor]) >= limit:
+                continue
+            if must is not None and not must.contains_all(search_text):
+                continue
+            results[vendor].append(json.loads(data))
+        return results
+
+    def stats(self) -> Dict:
+        """Katalog istatistikleri"""
+        return {'db_path': self.db_path, 'vendors': self.vendors()}
+
+    def close(self):
+        """Veritabanını kapat"""
+        with self._lock:
+            self._conn.close()
+
+
+class CatalogSync:
+    """
+    Shopify ve WooCommerce tedarikçilerini yerel kataloğa senkronize eder
+
+    İlk senkronizasyon ve periyodik tam taramalar tüm ürün listesini çeker.
+    Aradaki turlar artımlıdır ve tedarikçi başına high-water mark (görülen
+    en yeni değişiklik zamanı) kullanır:
+
+    - Shopify: ürün sitemap'inin <lastmod> değerleri high-water mark ile
+      karşılaştırılır; yalnızca yeni/değişen ürünler /products/{handle}.json
+      ile çekilir, sitemap'ten çıkan ürünler silinir.
+    - WooCommerce: Store API'den yalnızca high-water mark'tan sonra
+      değişen (modified) ürünler istenir; silmeler tam taramada görülür.
+
+    İstekler arama motorlarının _make_request'i üzerinden yapılır (paylaşılan
+    bağlantı havuzu ve domain hız sınırları). Bir istek hata verirse o
+    tedarikçinin turu iptal edilir ve eski katalog korunur.
+    """
+
+    def __init__(self, store: CatalogStore, shopify_engine: Optional[ShopifySearchEngine] = None,
+                 woocommerce_engine: Optional[WooCommerceSearchEngine] = None,
+                 interval: float = CATALOG_SYNC_INTERVAL,
+                 full_interval: float = CATALOG_FULL_SYNC_INTERVAL):
+        """
+        Args:
+            store: Katalog deposu
+            shopify_engine: Shopify arama motoru (tedarikçi listesi ve HTTP istekleri için)
+            woocommerce_engine: WooCommerce arama motoru
+            interval: Periyodik senkronizasyon aralığı (saniye)
+            full_interval: Tam tarama aralığı (saniye)
+        """
+        self.store = store
+        self.shopify_engine = shopify_engine or ShopifySearchEngine()
+        self.woocommerce_engine = woocommerce_engine or WooCommerceSearchEngine()
+        self.interval = interval
+        self.full_interval = full_interval
+        self._sync_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._listeners: List[Callable[[], None]] = []
+        self.last_results: Dict[str, Dict] = {}
+
+    @property
+    def vendors(self) -> Dict[str, Dict[str, str]]:
+        """Katalogu tutulan tedarikçiler: domain -> {'name', 'platform'}"""
+        vendors = {
+            domain: {'name': info['name'], 'platform': 'shopify'}
+            for domain, info in self.shopify_engine.shopify_vendors.items()
+        }
+        vendors.update({
+            domain: {'name': info['name'], 'platform': 'woocommerce'}
+            for domain, info in self.woocommerce_engine.woocommerce_vendors.items()
+        })
+        return vendors
+
+    def platform_vendors(self, platform: str) -> Dict[str, str]:
+        """Platformun tedarikçileri: domain -> görünen ad"""
+        return {domain: info['name'] for domain, info in self.vendors.items() if info['platform'] == platform}
+
+    # --- senkronizasyon ---
+
+    def sync_vendor(self, domain: str, full: bool = False) -> Dict:
+        """
+        Tek tedarikçiyi senkronize et
+
+        Args:
+            domain: Tedarikçi domain
+            full: Artımlı yerine tam tarama zorla
+
+        Returns:
+            Senkronizasyon sonucu ('status', 'mode', 'added', 'changed', 'removed', 'seconds')
+        """
+        started = time.time()
+        vendor = self.vendors[domain]
+        state = self.store.vendors().get(domain)
+        full = (full or state is None or state['high_water_mark'] is None
+                or not state['full_synced_at'] or started - state['full_synced_at'] >= self.full_interval)
+
+        if vendor['platform'] == 'shopify':
+            changes = self._shopify_changes(domain, state, full)
+        else:
+            changes = self._woocommerce_changes(domain, state, full, started)
+
+        if changes is None:
+            result = {'status': 'error'}
+        else:
+            counts = self.store.apply_sync(
+                domain, vendor['name'], vendor['platform'], changes['products'],
+                removed_ids=changes['removed'], full=changes['full'],
+                high_water_mark=changes['high_water_mark']
+            )
+            result = {'status': 'ok', 'mode': 'full' if changes['full'] else 'incremental',
+                      'fetched': len(changes['products']), **counts}
+        result['seconds'] = round(time.time() - started, 2)
+        self.last_results[domain] = result
+        logger.info(f"Catalog sync {domain}: {result}")
+        return result
+
+    def add_listener(self, callback: Callable[[], None]):
+        """
+        Senkronizasyon turu bitince çağrılacak fonksiyonu kaydet
+
+        Katalogdan türetilen indeksler (SKU, tam metin) istek yolunda değil,
+        katalog değiştikten sonra bu çağrılarla yeniden kurulur.
+
+        Args:
+            callback: Parametresiz fonksiyon (hataları loglanır, senkronizasyonu bozmaz)
+        """
+        self._listeners.append(callback)
+
+    def _notify(self):
+        for callback in self._listeners:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Catalog sync listener failed: {e}")
+
+    def sync_all(self, full: bool = False) -> Dict[str, Dict]:
+        """Tüm tedarikçileri sırayla senkronize et (aynı anda tek senkronizasyon)"""
+        with self._sync_lock:
+            results = {domain: self.sync_vendor(domain, full) for domain in self.vendors}
+        self._notify()
+        return results
+
+    def _shopify_changes(self, domain: str, state: Optional[Dict], full: bool) -> Optional[Dict]:
+        """Shopify tedarikçisinin değişiklikleri (hata durumunda None)"""
+        if not full:
+            changes = self._shopify_incremental(domain, state)
+            if changes is not None:
+                return changes
+            logger.info(f"Incremental catalog sync for {domain} not possible, running full sync")
+
+        engine = self.shopify_engine
+        products = self._fetch_pages(
+            domain, lambda page: engine.get_products_json(domain, page=page, limit=CATALOG_PAGE_LIMIT),
+            CATALOG_PAGE_LIMIT, engine, normalize_shopify_product
+        )
+        if products is None:
+            return None
+        return {'products': products, 'removed': [], 'full': True, 'high_water_mark': None}
+
+    def _shopify_incremental(self, domain: str, state: Dict) -> Optional[Dict]:
+        """
+        Sitemap <lastmod> değerleriyle yalnızca değişen Shopify ürünlerini çek
+
+        Returns:
+            Değişiklikler (sitemap alınamazsa, bir ürün çekilemezse veya çok
+            fazla ürün değiştiyse None - tam taramaya geçilir)
+        """
+        engine = self.shopify_engine
+        engine.failures.reset()
+        index = engine.get_product_sitemap(domain)
+        if not index.refresh():
+            # Sitemap'in tamamı alınamadı (ör. bir alt sitemap hata verdi): listede
+            # görünmeyen ürünler silinmiş sayılamaz, tam taramaya geçilir
+            return None
+
+        known = {product_handle(url): ids for url, ids in self.store.vendor_products(domain).items()}
+        entries = index.entries()
+        if known and not entries:
+            # Boş ürün sitemap'i büyük ihtimalle tedarikçi tarafında geçici bir hata
+            return None
+
+        since = state['high_water_mark'] - CATALOG_HWM_OVERLAP
+        changed, seen, high_water_mark = [], set(), None
+        for url, lastmod in entries:
+            handle = product_handle(url)
+            if handle in seen:
+                continue
+            seen.add(handle)
+            modified = parse_timestamp(lastmod)
+            if modified is not None:
+                high_water_mark = max(high_water_mark or modified, modified)
+            if handle not in known:
+                changed.append(handle)
+            elif modified is not None and modified > since and modified != known[handle][1]:
+                changed.append(handle)
+
+        if len(changed) > CATALOG_INCREMENTAL_MAX:
+            return None
+
+        products = []
+        for handle in changed:
+            product = engine.get_product_json(domain, handle)
+            if engine.failures.count:
+                return None
+            normalized = normalize_shopify_product(domain, product) if product else None
+            if normalized:
+                products.append(normalized)
+
+        removed = [product_id for handle, (product_id, _) in known.items() if handle not in seen]
+        return {'products': products, 'removed': removed, 'full': False, 'high_water_mark': high_water_mark}
+
+    def _woocommerce_changes(self, domain: str, state: Optional[Dict], full: bool,
+                             started: float) -> Optional[Dict]:
+        """WooCommerce tedarikçisinin değişiklikleri (hata durumunda None)"""
+        engine = self.woocommerce_engine
+        modified_after = None if full else format_timestamp(state['high_water_mark'] - CATALOG_HWM_OVERLAP)
+        products = self._fetch_pages(
+            domain,
+            lambda page: engine.get_store_products(domain, page=page, per_page=WOOCOMMERCE_PAGE_LIMIT,
+                                                   modified_after=modified_after),
+            WOOCOMMERCE_PAGE_LIMIT, engine, normalize_woocommerce_product
+        )
+        if products is None:
+            return None
+        # Store API ürün değişiklik zamanı vermez; o durumda turun başlangıcı high-water mark olur
+        has_modified = any(product.get('updated_at') for product in products)
+        return {'products': products, 'removed': [], 'full': full,
+                'high_water_mark': None if has_modified else started}
+
+    def _fetch_pages(self, domain: str, fetch_page: Callable[[int], List[Dict]], page_size: int, engine,
+                     normalize: Callable[[str, Dict], Optional[Dict]]) -> Optional[List[Dict]]:
+        """
+        Sayfalı ürün listesini sonuna kadar çek
+
+        Args:
+            domain: Tedarikçi domain
+            fetch_page: Sayfa numarası -> ham ürünler
+            page_size: İstenen sayfa boyutu (eksik dolu sayfa son sayfadır)
+            engine: Hata sayacı kullanılan arama motoru
+            normalize: (domain, ham ürün) -> normalize ürün
+
+        Returns:
+            Normalize ürünler (bir sayfa hata verdiyse veya CATALOG_MAX_PAGES
+            sayfada son sayfaya ulaşılamadıysa None - eksik listeyle tam tarama
+            yapılırsa sınırın ötesindeki ürünler silinirdi)
+        """
+        products: List[Dict] = []
+        engine.failures.reset()
+        for page in range(1, CATALOG_MAX_PAGES + 1):
+            page_products = fetch_page(page)
+            if engine.failures.count:
+                logger.warning(f"Catalog sync for {domain} failed on page {page}, keeping previous catalog")
+                return None
+            products.extend(product for product in (normalize(domain, p) for p in page_products) if product)
+            if len(page_products) < page_size:
+                return products
+        logger.error(f"Catalog sync for {domain} stopped at the {CATALOG_MAX_PAGES} page limit "
+                     f"without reaching the last page, keeping previous catalog")
+        return None
+
+    # --- sorgu ---
+
+    def is_ready(self, platform: str = 'shopify') -> bool:
+        """Platformun tüm tedarikçilerinin kataloğu en az bir kez senkronize edildi mi"""
+        synced = self.store.vendors()
+        return all(domain in synced for domain in self.platform_vendors(platform))
+
+    def age_seconds(self, platform: str = 'shopify') -> Optional[float]:
+        """Platformdaki en eski tedarikçi senkronizasyonunun yaşı"""
+        synced = self.store.vendors()
+        domains = self.platform_vendors(platform)
+        times = [synced[domain]['synced_at'] for domain in domains if domain in synced]
+        if not times or len(times) < len(domains):
+            return None
+        return time.time() - min(times)
+
+    def is_stale(self, platform: str = 'shopify') -> bool:
+        """Katalog yenileme aralığının CATALOG_STALE_FACTOR katından eski mi"""
+        age = self.age_seconds(platform)
+        return age is None or age > self.interval * CATALOG_STALE_FACTOR
+
+    def search(self, query: str, canonical_specs: Optional[Dict] = None,
+               status: Optional[Dict[str, str]] = None, platform: str = 'shopify') -> Dict[str, List[Dict]]:
+        """
+        Katalogda ara - search_all_vendors ile aynı biçimde sonuç döndürür
+
+        Args:
+            query: Arama terimi
+            canonical_specs: Canonical parça özellikleri
+            status: Tedarikçi adı -> 'ok' / 'empty' ile doldurulur (opsiyonel)
+            platform: 'shopify' / 'woocommerce'
+
+        Returns:
+            Tedarikçi adı -> ürünler
+        """
+        vendors = self.platform_vendors(platform)
+        by_domain = self.store.search(query, list(vendors), canonical_specs)
+        results = {vendors[domain]: products for domain, products in by_domain.items()}
+        if status is not None:
+            status.update({name: 'ok' if products else 'empty' for name, products in results.items()})
+        return results
+
+    # --- arka plan ---
+
+    def start(self):
+        """Arka plan senkronizasyonunu başlat (katalog güncelse ilk tur aralık sonunda)"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name='catalog-sync', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Arka plan senkronizasyonunu durdur"""
+        self._stop.set()
+
+    def _run(self):
+        synced = self.store.vendors()
+        if all(domain in synced for domain in self.vendors):
+            age = time.time() - min((synced[domain]['synced_at'] for domain in self.vendors), default=0)
+            wait = max(0.0, self.interval - age)
+        else:
+            wait = 0
+        while not self._stop.wait(wait):
+            try:
+                self.sync_all()
+            except Exception as e:
+                logger.error(f"Catalog sync failed: {e}")
+            wait = self.interval
+
+
+# Elle senkronizasyon: python catalog_sync.py [--full]
+if __name__ == "__main__":
+    import sys
+
+    full_sync = '--full' in sys.argv
+    sync = CatalogSync(CatalogStore())
+    print("🔄 Catalog sync" + (" (full)" if full_sync else ""))
+    print("=" * 50)
+    for vendor_domain, sync_result in sync.sync_all(full=full_sync).items():
+        print(f"{vendor_domain}: {sync_result}")
+    print(json.dumps(sync.store.stats(), indent=2, ensure_ascii=False))
@@ -0,0 +1,98 @@
+"""
+İstek kapsamlı süre bütçesi (deadline)
+contextvars ile motorlara, tedarikçi görevlerine ve HTTP isteklerine taşınır
+"""
+
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple, Union
+
+
+class DeadlineExceeded(Exception):
+    """İstek süre bütçesi doldu"""
+
+
+class Deadline:
+    """
+    Monotonic saate göre mutlak bitiş zamanı
+
+    Bütçe bir kez başlatılır; alt işler kalan süreyi okuyup kendi zaman
+    aşımlarını buna göre kısaltır.
+    """
+
+    def __init__(self, budget: float):
+        """
+        Args:
+            budget: Toplam süre bütçesi (saniye)
+        """
+        self.budget = budget
+        self.started_at = time.monotonic()
+        self.expires_at = self.started_at + budget
+
+    def remaining(self) -> float:
+        """Kalan süre (saniye, en az 0)"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def elapsed(self) -> float:
+        """Başlangıçtan beri geçen süre (saniye)"""
+        return time.monotonic() - self.started_at
+
+    def expired(self) -> bool:
+        """Bütçe doldu mu"""
+        return time.monotonic() >= self.expires_at
+
+    def clamp(self, timeout: Optional[float]) -> float:
+        """Zaman aşımını kalan süreyle sınırla"""
+        remaining = self.remaining()
+        return remaining if timeout is None else min(timeout, remaining)
+
+
+_current_deadline: contextvars.ContextVar = contextvars.ContextVar('request_deadline', default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Geçerli bağlamdaki deadline (yoksa None)"""
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline_scope(budget: float) -> Iterator[Deadline]:
+    """
+    Blok süresince geçerli deadline'ı ayarla
+
+    Thread havuzlarına gönderilen işler bağlamı contextvars.copy_context()
+    ile taşıdığında aynı deadline'ı görür.
+    """
+    deadline = Deadline(budget)
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def clamp_timeout(timeout: Optional[float]) -> Optional[float]:
+    """Geçerli deadline varsa zaman aşımını kalan süreyle sınırla"""
+    deadline = current_deadline()
+    if deadline is None:
+        return timeout
+    return deadline.clamp(timeout)
+
+
+def clamp_request_timeout(timeout: Union[float, Tuple[float, float]]) -> Union[float, Tuple[float, float]]:
+    """
+    HTTP (bağlantı, okuma) zaman aşımını kalan süreyle sınırla
+
+    Raises:
+        DeadlineExceeded: Bütçe zaten dolmuşsa
+    """
+    deadline = current_deadline()
+    if deadline is None:
+        return timeout
+    remaining = deadline.remaining()
+    if remaining <= 0:
+        raise DeadlineExceeded("request deadline exceeded")
+    if isinstance(timeout, tuple):
+        return tuple(min(part, remaining) for part in timeout)
+    return min(timeout, remaining)
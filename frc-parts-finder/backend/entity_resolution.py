@@ -0,0 +1,226 @@
+"""
+Tedarikçiler arası ürün eşleştirme (entity resolution)
+Farklı motorlardan gelen aynı ürün SKU/MPN/GTIN ve kanonik URL ile gruplanır; her grup bir kez doğrulanır, teklifler tek üründe toplanır
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Bundan kısa tanımlayıcılar ("1", "A12") ürünleri yanlışlıkla birleştirebilir
+MIN_IDENTIFIER_LENGTH = 5
+
+# Grubun doğrulanacak temsilcisi: katalog ürünleri sayfa çekmeden doğrulanmış sayılır
+SOURCE_PRIORITY = {
+    'catalog': 0,
+    'database': 1,
+    'real_vendors': 2,
+    'real_vendor': 2,
+    'shopify': 3,
+    'woocommerce': 4
+}
+
+_NON_ALNUM_RE = re.compile(r'[^0-9A-Z]')
+_SHOPIFY_COLLECTION_RE = re.compile(r'^/collections/[^/]+(/products/.+)$')
+
+
+def canonical_url(url: Optional[str]) -> Optional[str]:
+    """
+    Ürün URL'sini karşılaştırma için kanonik biçime getir
+
+    Şema, 'www.', sorgu parametreleri, fragment ve sondaki '/' atılır;
+    Shopify'ın /collections/{x}/products/{handle} yolu /products/{handle}'a
+    indirgenir.
+
+    Returns:
+        'revrobotics.com/rev-21-1650' gibi anahtar (URL yoksa None)
+    """
+    if not url:
+        return None
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if not host:
+        return None
+    path = parts.path.rstrip('/')
+    collection = _SHOPIFY_COLLECTION_RE.match(path)
+    if collection:
+        path = collection.group(1)
+    return f"{host}{path.lower()}"
+
+
+def normalize_identifier(value) -> Optional[str]:
+    """
+    SKU/MPN/GTIN'i karşılaştırma için normalize et
+
+    Büyük harf, yalnızca harf ve rakam: 'am-4213' -> 'AM4213',
+    'REV-21-1650' -> 'REV211650'. Yalnızca rakamdan oluşan GTIN'ler
+    14 haneye tamamlanır (UPC-A ve EAN-13 aynı GTIN-14'e iner).
+
+    Returns:
+        Normalize tanımlayıcı (çok kısaysa None)
+    """
+    if value is None:
+        return None
+    identifier = _NON_ALNUM_RE.sub('', str(value).upper())
+    if len(identifier) < MIN_IDENTIFIER_LENGTH:
+        return None
+    if identifier.isdigit() and 12 <= len(identifier) <= 14:
+        identifier = identifier.zfill(14)
+    return identifier
+
+
+def listing_keys(listing: Dict) -> List[str]:
+    """Listelemenin eşleştirme anahtarları (kanonik URL ve normalize tanımlayıcılar)"""
+    keys = []
+    url = canonical_url(listing.get('url'))
+    if url:
+        keys.append(f"url:{url}")
+    identifiers = [listing.get('sku'), listing.get('mpn'), listing.get('gtin')]
+    identifiers.extend(listing.get('skus') or [])
+    for value in identifiers:
+        identifier = normalize_identifier(value)
+        if identifier and f"id:{identifier}" not in keys:
+            keys.append(f"id:{identifier}")
+    return keys
+
+
+class _DisjointSet:
+    """Birleşim-bul (path halving + boyuta göre birleşim)"""
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+        self.size = [1] * size
+
+    def find(self, item: int) -> int:
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, first: int, second: int):
+        first, second = self.find(first), self.find(second)
+        if first == second:
+            return
+        if self.size[first] < self.size[second]:
+            first, second = second, first
+        self.parent[second] = first
+        self.size[first] += self.size[second]
+
+
+class ProductGroup:
+    """
+    Aynı ürünün listelemeleri
+
+    candidates doğrulama sırasını verir (kaynak önceliği, sonra geliş
+    sırası); offers her tedarikçi + URL için tek teklif döndürür.
+    """
+
+    def __init__(self, listings: List[Dict]):
+        """
+        Args:
+            listings: Gruptaki listelemeler (geliş sırasıyla)
+        """
+        self.listings = listings
+        self.candidates = sorted(
+            listings, key=lambda listing: SOURCE_PRIORITY.get(listing.get('source'), len(SOURCE_PRIORITY))
+        )
+
+    @property
+    def representative(self) -> Dict:
+        """Doğrulanacak ilk listeleme"""
+        return self.candidates[0]
+
+    def offers(self, rejected: Iterable[Dict] = ()) -> List[Dict]:
+        """
+        Tedarikçi teklifleri (fiyata göre, fiyatı olmayanlar sonda)
+
+        Args:
+            rejected: Doğrulamadan geçemeyen listelemeler (teklif olarak gösterilmez)
+
+        Returns:
+            {'vendor', 'url', 'price', 'inStock', 'source'} listesi
+        """
+        offers, seen = [], {(listing.get('vendor'), canonical_url(listing.get('url'))) for listing in rejected}
+        for listing in self.listings:
+            key = (listing.get('vendor'), canonical_url(listing.get('url')))
+            if key in seen:
+                continue
+            seen.add(key)
+            offers.append({
+                'vendor': listing.get('vendor'),
+                'url': listing.get('url'),
+                'price': listing.get('price'),
+                'inStock': listing.get('inStock'),
+                'source': listing.get('source')
+            })
+        offers.sort(key=lambda offer: (offer['price'] is None, offer['price'] or 0))
+        return offers
+
+
+def resolve_listings(listings: List[Dict]) -> List[ProductGroup]:
+    """
+    Listelemeleri ürünlere grupla
+
+    Aynı kanonik URL'yi veya aynı normalize SKU/MPN/GTIN'i paylaşan
+    listelemeler (geçişli olarak) aynı gruba düşer.
+
+    Args:
+        listings: Tüm motorlardan gelen ürünler
+
+    Returns:
+        Gruplar (her grubun ilk listelemesinin geliş sırasıyla)
+    """
+    groups = _DisjointSet(len(listings))
+    owner: Dict[str, int] = {}
+    for index, listing in enumerate(listings):
+        for key in listing_keys(listing):
+            if key in owner:
+                groups.union(owner[key], index)
+            else:
+                owner[key] = index
+
+    members: Dict[int, List[Dict]] = {}
+    for index, listing in enumerate(listings):
+        members.setdefault(groups.find(index), []).append(listing)
+    resolved = [ProductGroup(group) for group in members.values()]
+    if len(resolved) < len(listings):
+        logger.debug(f"Resolved {len(listings)} listings into {len(resolved)} products")
+    return resolved
+
+
+def attach_offers(product: Dict, group: ProductGroup, rejected: Iterable[Dict] = ()) -> Dict:
+    """
+    Doğrulanan temsilci ürüne grubun tekliflerini ekle
+
+    Args:
+        product: Doğrulanmış ürün
+        group: Ürünün grubu
+        rejected: Gruptan doğrulamadan geçemeyen listelemeler
+
+    Returns:
+        'offers' ve 'vendor_count' alanları eklenmiş ürün
+    """
+    offers = group.offers(rejected)
+    product['offers'] = offers
+    product['vendor_count'] = len({offer['vendor'] for offer in offers})
+    return product
+
+
+if __name__ == "__main__":
+    sample = [
+        {'name': 'MAXSpline Shaft', 'url': 'https://www.revrobotics.com/rev-21-2800/', 'sku': 'REV-21-2800',
+         'vendor': 'REV Robotics', 'price': 9.0, 'source': 'real_vendors'},
+        {'name': 'MAXSpline Shaft 8in', 'url': 'https://revrobotics.com/rev-21-2800', 'price': 9.0,
+         'vendor': 'REV Robotics', 'source': 'shopify'},
+        {'name': 'MAXSpline Shaft', 'url': 'https://example-reseller.com/products/maxspline', 'sku': 'rev 21 2800',
+         'vendor': 'Reseller', 'price': 8.5, 'source': 'woocommerce'},
+        {'name': 'Kraken X60', 'url': 'https://store.ctr-electronics.com/kraken-x60/', 'sku': 'WCP-0940',
+         'vendor': 'CTRE', 'price': 199.99, 'source': 'woocommerce'}
+    ]
+    for group in resolve_listings(sample):
+        print(group.representative['name'], '->', [(offer['vendor'], offer['price']) for offer in group.offers()])
@@ -0,0 +1,81 @@
+"""
+Önbellek kayıtları için son kullanma indeksi
+Min-heap ile yalnızca süresi dolan kayıtlara dokunan temizlik
+"""
+
+import heapq
+import threading
+from typing import Dict, List, Tuple
+
+
+class ExpiryIndex:
+    """
+    (namespace, anahtar) -> son kullanma zamanı indeksi
+
+    Kayıtlar son kullanma zamanına göre bir min-heap'te tutulur. Bir kayıt
+    güncellendiğinde veya silindiğinde eski heap girdisi yerinde bırakılır
+    ve heap'ten çıkarken geçersiz sayılır (lazy deletion). Böylece
+    pop_expired() yalnızca süresi dolmuş kayıtlar kadar iş yapar ve
+    namespace başına canlı kayıt sayısı O(1) ile okunur.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[float, str, str]] = []
+        self._live: Dict[Tuple[str, str], float] = {}
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def schedule(self, namespace: str, key: str, expires_at: float):
+        """Kaydın son kullanma zamanını ekle veya güncelle"""
+        with self._lock:
+            if (namespace, key) not in self._live:
+                self._counts[namespace] = self._counts.get(namespace, 0) + 1
+            self._live[(namespace, key)] = expires_at
+            heapq.heappush(self._heap, (expires_at, namespace, key))
+            self._maybe_compact()
+
+    def discard(self, namespace: str, key: str):
+        """Kaydı indeksten çıkar"""
+        with self._lock:
+            if self._live.pop((namespace, key), None) is not None:
+                self._counts[namespace] -= 1
+
+    def clear(self, namespace: str):
+        """Namespace'e ait tüm kayıtları indeksten çıkar"""
+        with self._lock:
+            self._live = {item: exp for item, exp in self._live.items() if item[0] != namespace}
+            self._counts[namespace] = 0
+            self._heap = [item for item in self._heap if item[1] != namespace]
+            heapq.heapify(self._heap)
+
+    def pop_expired(self, now: float) -> List[Tuple[str, str]]:
+        """
+        Süresi dolmuş kayıtları indeksten çıkar
+
+        Args:
+            now: Şu anki zaman (epoch saniye)
+
+        Returns:
+            (namespace, anahtar) listesi
+        """
+        expired = []
+        with self._lock:
+            while self._heap and self._heap[0][0] < now:
+                expires_at, namespace, key = heapq.heappop(self._heap)
+                # Güncellenmiş veya silinmiş kayıtların eski girdilerini atla
+                if self._live.get((namespace, key)) != expires_at:
+                    continue
+                del self._live[(namespace, key)]
+                self._counts[namespace] -= 1
+                expired.append((namespace, key))
+        return expired
+
+    def count(self, namespace: str) -> int:
+        """Namespace'teki canlı kayıt sayısı"""
+        return self._counts.get(namespace, 0)
+
+    def _maybe_compact(self):
+        """Geçersiz girdiler heap'i şişirdiyse yeniden oluştur"""
+        if len(self._heap) > 64 and len(self._heap) > 2 * len(self._live):
+            self._heap = [(exp, ns, key) for (ns, key), exp in self._live.items()]
+            heapq.heapify(self._heap)
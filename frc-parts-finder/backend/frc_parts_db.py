@@ -72,10 +72,6 @@ FRC_PARTS_DATABASE = {
     ],
     'victor spx motor controller': 'victor spx',
 
-    'falcon': [
-        {'name': 'Falcon Motor', 'vendor': 'CTRE', 'price': 219.99,
-         'url': 'https://store.ctr-electronics.com/falcon-500-powered-by-talon-fx/', 'inStock': True},
-    ],
 
     # ============ SENSÖRLER ============
     'navx': [
@@ -102,10 +98,6 @@ FRC_PARTS_DATABASE = {
          'url': 'https://www.andymark.com/products/ctre-cancoder', 'inStock': True},
     ],
 
-    'through bore encoder': [
-        {'name': 'REV Through Bore Encoder', 'vendor': 'REV Robotics', 'price': 29.99,
-         'url': 'https://www.revrobotics.com/rev-11-1271/', 'inStock': True},
-    ],
     'rev encoder': 'through bore encoder',
 
     'limelight': [
@@ -0,0 +1,301 @@
+"""
+Yerel ürünler için tam metin arama (SQLite FTS5, BM25 sıralama)
+Senkronize katalog ve sayfalardan doğrulanan ürünler ad, açıklama, SKU, marka ve kategori üzerinden indekslenir
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+FULLTEXT_DB_PATH = os.path.join('cache', 'fulltext.db')
+
+# Sütun ağırlıkları (bm25): ad > SKU > marka > kategori > açıklama
+BM25_WEIGHTS = {'name': 10.0, 'description': 1.0, 'sku': 6.0, 'brand': 3.0, 'category': 2.0}
+
+# Yerel sonuç bu sayıya ulaşırsa /api/search tedarikçilere gitmez
+FULLTEXT_MIN_RESULTS = 4
+FULLTEXT_LIMIT = 20
+
+# Snippet'te eşleşen kelimeler bu işaretlerle çevrilir (düz metin, HTML değil)
+SNIPPET_MARKERS = ('«', '»')
+SNIPPET_TOKENS = 12
+
+# Ürün önbelleğinden gelen kayıtların varsayılan ömrü (önbellek TTL'i ile aynı)
+PAGE_PRODUCT_TTL = 24 * 3600
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def match_expression(query: str) -> Optional[str]:
+    """
+    Kullanıcı sorgusunu FTS5 MATCH ifadesine çevir
+
+    Her kelime tırnak içinde verilir (FTS5 operatörleri ve noktalama
+    etkisizleşir), kelimeler AND ile birleşir: "1/2 hex bearing" ->
+    '"1" "2" "hex" "bearing"'.
+
+    Returns:
+        MATCH ifadesi (kelime yoksa None)
+    """
+    tokens = _TOKEN_RE.findall(query.lower())
+    if not tokens:
+        return None
+    return ' '.join(f'"{token}"' for token in tokens)
+
+
+def document_fields(product: Dict) -> Tuple[str, str, str, str, str]:
+    """Ürünün indekslenen alanları: (ad, açıklama, SKU'lar, marka, kategori)"""
+    skus = list(product.get('skus') or [])
+    for key in ('sku', 'mpn', 'gtin'):
+        if product.get(key) and product[key] not in skus:
+            skus.append(str(product[key]))
+    categories = [product.get('product_type'), product.get('category'), product.get('frc_category')]
+    categories.extend(product.get('tags') or [])
+    return (
+        product.get('name') or '',
+        product.get('description') or '',
+        ' '.join(skus),
+        product.get('brand') or '',
+        ' '.join(str(category) for category in categories if category)
+    )
+
+
+class FullTextIndex:
+    """
+    SQLite FTS5 ürün indeksi
+
+    fulltext_docs tablosu ürünün kendisini (JSON) ve kaynağını tutar;
+    fulltext_fts aynı rowid ile aranan alanları tutar. Katalog kayıtları
+    CatalogStore ile uzlaştırılarak (refresh_catalog) güncel tutulur,
+    sayfalardan doğrulanan ürünler ürün önbelleğine yazılırken eklenir ve
+    önbellek TTL'i dolunca aramaya girmez.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS fulltext_docs (
+            rowid INTEGER PRIMARY KEY,
+            doc_key TEXT NOT NULL UNIQUE,
+            source TEXT NOT NULL,
+            vendor TEXT,
+            data TEXT NOT NULL,
+            expires_at REAL
+        );
+        CREATE INDEX IF NOT EXISTS idx_fulltext_docs_source ON fulltext_docs (source);
+        CREATE VIRTUAL TABLE IF NOT EXISTS fulltext_fts USING fts5(
+            name, description, sku, brand, category,
+            tokenize = 'porter unicode61 remove_diacritics 2'
+        );
+        CREATE TABLE IF NOT EXISTS fulltext_meta (
+            name TEXT PRIMARY KEY,
+            value REAL
+        );
+    """
+
+    def __init__(self, db_path: str = FULLTEXT_DB_PATH):
+        """
+        Args:
+            db_path: SQLite veritabanı dosya yolu
+        """
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+
+    def _upsert(self, doc_key: str, source: str, vendor: Optional[str], product: Dict,
+                expires_at: Optional[float]):
+        """Tek ürünü yaz (transaction içinde çağrılır)"""
+        row = self._conn.execute("SELECT rowid FROM fulltext_docs WHERE doc_key = ?", (doc_key,)).fetchone()
+        data = json.dumps(product, ensure_ascii=False)
+        if row is None:
+            rowid = self._conn.execute(
+                "INSERT INTO fulltext_docs (doc_key, source, vendor, data, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (doc_key, source, vendor, data, expires_at)
+            ).lastrowid
+        else:
+            rowid = row[0]
+            self._conn.execute(
+                "UPDATE fulltext_docs SET source = ?, vendor = ?, data = ?, expires_at = ? WHERE rowid = ?",
+                (source, vendor, data, expires_at, rowid)
+            )
+            self._conn.execute("DELETE FROM fulltext_fts WHERE rowid = ?", (rowid,))
+        self._conn.execute(
+            "INSERT INTO fulltext_fts (rowid, name, description, sku, brand, category) VALUES (?, ?, ?, ?, ?, ?)",
+            (rowid, *document_fields(product))
+        )
+
+    def _delete(self, doc_keys: Iterable[str]):
+        """Ürünleri sil (transaction içinde çağrılır)"""
+        for doc_key in doc_keys:
+            row = self._conn.execute("SELECT rowid FROM fulltext_docs WHERE doc_key = ?", (doc_key,)).fetchone()
+            if row is not None:
+                self._conn.execute("DELETE FROM fulltext_fts WHERE rowid = ?", row)
+                self._conn.execute("DELETE FROM fulltext_docs WHERE rowid = ?", row)
+
+    def _transaction(self, work):
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                result = work()
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return result
+
+    def add_page_product(self, product: Dict, ttl: int = PAGE_PRODUCT_TTL):
+        """
+        Sayfadan doğrulanan ürünü indeksle (ürün önbelleğine yazılırken)
+
+        Args:
+            product: Ürün (url, name, vendor, ... - JSON-LD bilgileriyle zenginleştirilmiş)
+            ttl: Kaydın aramada kalacağı süre (saniye)
+        """
+        url = product.get('url')
+        if not url or not product.get('name'):
+            return
+        expires_at = time.time() + ttl
+        try:
+            self._transaction(lambda: self._upsert(f"page:{url}", 'page', product.get('vendor'), product, expires_at))
+        except Exception as e:
+            # İndeks yardımcıdır; yazılamaması aramayı bozmamalı
+            logger.warning(f"Failed to index product {url}: {e}")
+
+    def refresh_catalog(self, catalog_store) -> Dict[str, int]:
+        """
+        Katalog kayıtlarını CatalogStore ile uzlaştır
+
+        Son uzlaştırmadan sonra senkronize edilen ürünler yeniden yazılır,
+        katalogdan kaldırılanlar silinir. Katalog değişmediyse tek bir
+        sorguyla döner.
+
+        Args:
+            catalog_store: CatalogStore
+
+        Returns:
+            {'indexed', 'removed'} sayıları
+        """
+        with self._refresh_lock:
+            last_synced = catalog_store.last_synced_at()
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value FROM fulltext_meta WHERE name = 'catalog_synced_at'"
+                ).fetchone()
+            indexed_until = row[0] if row else 0.0
+            if last_synced is None or last_synced <= indexed_until:
+                return {'indexed': 0, 'removed': 0}
+
+            changed = catalog_store.rows_since(indexed_until)
+            current = {f"catalog:{vendor}:{product_id}" for vendor, product_id in catalog_store.product_ids()}
+
+            def work():
+                indexed_keys = {key for key, in self._conn.execute(
+                    "SELECT doc_key FROM fulltext_docs WHERE source = 'catalog'"
+                ).fetchall()}
+                removed = indexed_keys - current
+                self._delete(removed)
+                for vendor, vendor_name, product_id, product in changed:
+                    product = {**product, 'vendor': vendor_name, 'source': 'catalog'}
+                    self._upsert(f"catalog:{vendor}:{product_id}", 'catalog', vendor_name, product, None)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO fulltext_meta (name, value) VALUES ('catalog_synced_at', ?)",
+                    (last_synced,)
+                )
+                return {'indexed': len(changed), 'removed': len(removed)}
+
+            counts = self._transaction(work)
+        logger.info(f"Full-text index refreshed from catalog: {counts}")
+        return counts
+
+    def search(self, query: str, limit: int = FULLTEXT_LIMIT) -> List[Dict]:
+        """
+        Tam metin arama (BM25 ile sıralı)
+
+        Args:
+            query: Serbest metin sorgu ("1/2 hex bearing")
+            limit: En fazla sonuç
+
+        Returns:
+            Ürünler - her birinde 'relevance' (büyük daha iyi) ve 'snippet' alanları
+        """
+        expression = match_expression(query)
+        if expression is None:
+            return []
+        weights = ', '.join(str(weight) for weight in BM25_WEIGHTS.values())
+        sql = f"""
+            SELECT d.data, bm25(fulltext_fts, {weights}) AS rank,
+                   snippet(fulltext_fts, -1, ?, ?, '…', {SNIPPET_TOKENS})
+            FROM fulltext_fts JOIN fulltext_docs d ON d.rowid = fulltext_fts.rowid
+            WHERE fulltext_fts MATCH ? AND (d.expires_at IS NULL OR d.expires_at > ?)
+            ORDER BY rank
+            LIMIT ?
+        """
+        try:
+            with self._lock:
+                rows = self._conn.execute(sql, (*SNIPPET_MARKERS, expression, time.time(), limit)).fetchall()
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Full-text query failed for '{query}': {e}")
+            return []
+
+        results = []
+        for data, rank, snippet in rows:
+            product = json.loads(data)
+            # bm25() negatif döner; daha negatif = daha alakalı
+            product['relevance'] = round(-rank, 3)
+            product['snippet'] = snippet
+            results.append(product)
+        return results
+
+    def purge_expired(self) -> int:
+        """Süresi dolmuş sayfa ürünlerini sil"""
+        def work():
+            keys = [key for key, in self._conn.execute(
+                "SELECT doc_key FROM fulltext_docs WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),)
+            ).fetchall()]
+            self._delete(keys)
+            return len(keys)
+        return self._transaction(work)
+
+    def clear_pages(self):
+        """Sayfalardan gelen ürünleri sil (ürün önbelleği temizlenirken)"""
+        def work():
+            self._delete([key for key, in self._conn.execute(
+                "SELECT doc_key FROM fulltext_docs WHERE source = 'page'"
+            ).fetchall()])
+        self._transaction(work)
+
+    def stats(self) -> Dict:
+        """İndeks istatistikleri"""
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT source, COUNT(*) FROM fulltext_docs GROUP BY source").fetchall())
+        return {'db_path': self.db_path, 'documents': counts}
+
+    def close(self):
+        """Veritabanını kapat"""
+        with self._lock:
+            self._conn.close()
+
+
+if __name__ == "__main__":
+    import sys
+    from catalog_sync import CatalogStore
+
+    index = FullTextIndex()
+    store = CatalogStore()
+    print(index.refresh_catalog(store))
+    for product in index.search(' '.join(sys.argv[1:]) or '1/2 hex bearing', limit=10):
+        print(f"{product['relevance']:8.3f}  {product.get('vendor')}: {product['name']}  |  {product['snippet']}")
+    store.close()
+    index.close()
@@ -0,0 +1,219 @@
+"""
+Tüm tedarikçi arama motorları için ortak HTTP istemcisi
+Host başına bağlantı havuzu (keep-alive), tedarikçiye göre ayarlanmış zaman aşımları
+"""
+
+import threading
+import time
+from typing import Dict, Optional, Tuple, Union
+from urllib.parse import urlparse
+import logging
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from deadline import DeadlineExceeded, clamp_request_timeout, current_deadline
+from page_memo import current_page_memo
+from rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+# (bağlantı, okuma) zaman aşımları (saniye)
+DEFAULT_TIMEOUT = (3.05, 10)
+
+# Tedarikçi bazında zaman aşımları - yavaş sayfalar için daha uzun okuma süresi
+VENDOR_TIMEOUTS = {
+    'www.revrobotics.com': (3.05, 10),
+    'wcproducts.com': (3.05, 10),
+    'andymark.com': (3.05, 15),
+    'www.andymark.com': (3.05, 15),
+    'store.ctr-electronics.com': (3.05, 12),
+}
+
+# Host başına maksimum açık bağlantı sayısı
+DEFAULT_POOL_MAXSIZE = 10
+VENDOR_POOL_SIZES = {
+    'www.revrobotics.com': 8,
+    'wcproducts.com': 8,
+    'andymark.com': 6,
+    'www.andymark.com': 6,
+    'store.ctr-electronics.com': 6,
+}
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+class HttpClient:
+    """
+    Paylaşılan requests.Session sarmalayıcısı
+
+    Her host kendi urllib3 bağlantı havuzunu kullanır; aynı tedarikçiye
+    giden ardışık istekler TCP+TLS bağlantısını yeniden kullanır.
+    Havuzlar thread-safe olduğu için tek istemci tüm motorlarca paylaşılır.
+    """
+
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                 host_pool_sizes: Optional[Dict[str, int]] = None,
+                 timeouts: Optional[Dict[str, Tuple[float, float]]] = None,
+                 default_timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+                 max_retries: int = 0, rate_limiter: Optional[RateLimiter] = None):
+        """
+        Args:
+            pool_connections: Önbellekte tutulacak host havuzu sayısı
+            pool_maxsize: Host başına varsayılan maksimum bağlantı sayısı
+            host_pool_sizes: Host -> maksimum bağlantı sayısı
+            timeouts: Host -> (bağlantı, okuma) zaman aşımı
+            default_timeout: Listede olmayan hostlar için zaman aşımı
+            max_retries: Bağlantı hatalarında urllib3 yeniden deneme sayısı
+            rate_limiter: Domain bazında hız sınırlayıcı (verilmezse varsayılan ayarlarla oluşturulur)
+        """
+        self.default_timeout = default_timeout
+        self.timeouts = dict(VENDOR_TIMEOUTS if timeouts is None else timeouts)
+        self.host_pool_sizes = dict(VENDOR_POOL_SIZES if host_pool_sizes is None else host_pool_sizes)
+
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.session = requests.Session()
+        self._adapters: Dict[str, HTTPAdapter] = {}
+        self._lock = threading.Lock()
+        self.request_count = 0
+        self.error_count = 0
+
+        default_adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                      max_retries=max_retries)
+        self.session.mount('https://', default_adapter)
+        self.session.mount('http://', default_adapter)
+        self._adapters['*'] = default_adapter
+
+        # Tedarikçiye özel havuz boyutları
+        for host, size in self.host_pool_sizes.items():
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=size, max_retries=max_retries)
+            self.session.mount(f'https://{host}/', adapter)
+            self.session.mount(f'http://{host}/', adapter)
+            self._adapters[host] = adapter
+
+    def timeout_for(self, url: str) -> Tuple[float, float]:
+        """URL'nin host'una göre (bağlantı, okuma) zaman aşımı"""
+        return self.timeouts.get(urlparse(url).netloc, self.default_timeout)
+
+    def request(self, method: str, url: str, timeout: Optional[Timeout] = None,
+                rate: Optional[float] = None, **kwargs) -> requests.Response:
+        """
+        Havuzlanmış HTTP isteği
+
+        Args:
+            method: HTTP metodu
+            url: İstek URL'si
+            timeout: Zaman aşımı (verilmezse tedarikçi ayarı kullanılır)
+            rate: Domain için hız ayarı yoksa kullanılacak hız (saniyede istek)
+            **kwargs: requests.Session.request parametreleri
+
+        Returns:
+            HTTP yanıtı (hata durumunda requests istisnası fırlatılır)
+            
+        Raises:
+            DeadlineExceeded: İstek süre bütçesi dolmuşsa veya beklemeye yetmiyorsa
+        """
+        # Arama kapsamında aynı sayfa (parametresiz GET) yalnızca bir kez indirilir
+        memo = current_page_memo()
+        if memo is not None and method == 'GET' and not kwargs.get('params') and not kwargs.get('stream'):
+            page = memo.get_or_fetch(url, lambda: self._send(method, url, timeout, rate, **kwargs))
+            if page.error is not None:
+                raise page.error
+            return page.response
+        return self._send(method, url, timeout, rate, **kwargs)
+
+    def _send(self, method: str, url: str, timeout: Optional[Timeout], rate: Optional[float],
+              **kwargs) -> requests.Response:
+        """Hız sınırı ve deadline uygulanmış gerçek HTTP isteği"""
+        domain = urlparse(url).netloc
+        if timeout is None:
+            timeout = self.timeout_for(url)
+        kwargs.setdefault('allow_redirects', True)
+        
+        # Domain başına nezaket beklemesi (kilit dışında uyur). Bekleme deadline'a
+        # sığmıyorsa token hiç ayrılmaz - reddedilen istekler bucket'ı borçlandırmaz
+        deadline = current_deadline()
+        wait = self.rate_limiter.reserve(domain, rate, deadline.remaining() if deadline is not None else None)
+        if wait is None:
+            raise DeadlineExceeded(f"rate limit wait for {domain} exceeds request deadline")
+        if wait > 0:
+            time.sleep(wait)
+        
+        # Zaman aşımı istek bütçesinin kalanını geçemez
+        timeout = clamp_request_timeout(timeout)
+        with self._lock:
+            self.request_count += 1
+        try:
+            response = self.session.request(method, url, timeout=timeout, **kwargs)
+        except requests.RequestException:
+            with self._lock:
+                self.error_count += 1
+            raise
+        
+        # 429/503 yanıtlarında hızı düşür, başarılı yanıtlarda geri yükselt
+        self.rate_limiter.record_response(domain, response.status_code, response.headers.get('Retry-After'))
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET isteği"""
+        return self.request('GET', url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        """HEAD isteği"""
+        return self.request('HEAD', url, **kwargs)
+
+    def stats(self) -> Dict:
+        """
+        Bağlantı yeniden kullanım istatistikleri
+
+        Returns:
+            Toplam istek/hata sayıları ve host bazında açılan bağlantı,
+            gönderilen istek ve yeniden kullanılan bağlantı sayıları
+        """
+        hosts = {}
+        for adapter in self._adapters.values():
+            pools = adapter.poolmanager.pools
+            for pool_key in pools.keys():
+                pool = pools.get(pool_key)
+                if pool is None:
+                    continue
+                host = pool.host
+                host_stats = hosts.setdefault(host, {'connections': 0, 'requests': 0})
+                host_stats['connections'] += pool.num_connections
+                host_stats['requests'] += pool.num_requests
+
+        for host_stats in hosts.values():
+            host_stats['reused'] = max(0, host_stats['requests'] - host_stats['connections'])
+            host_stats['reuse_rate'] = (
+                round(host_stats['reused'] / host_stats['requests'], 3) if host_stats['requests'] else 0.0
+            )
+
+        total_connections = sum(h['connections'] for h in hosts.values())
+        total_requests = sum(h['requests'] for h in hosts.values())
+        return {
+            'requests': self.request_count,
+            'errors': self.error_count,
+            'connections_opened': total_connections,
+            'connection_reuse_rate': (
+                round((total_requests - total_connections) / total_requests, 3) if total_requests else 0.0
+            ),
+            'hosts': hosts,
+            'rate_limits': self.rate_limiter.stats()
+        }
+
+    def close(self):
+        """Tüm bağlantıları kapat"""
+        self.session.close()
+
+
+_shared_client: Optional[HttpClient] = None
+_shared_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Süreç genelinde paylaşılan HTTP istemcisi"""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = HttpClient()
+        return _shared_client
@@ -0,0 +1,203 @@
+"""
+Ortak JSON-LD Product çıkarıcı
+HTML'i tek geçişte tarar, ilk Product bulununca durur; yarım indirilmiş sayfalarda da çalışır
+"""
+
+import json
+import re
+from typing import Any, Dict, Iterable, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Script etiketinin type değeri; HTML'in tamamını küçük harfe çevirmemek için
+# önce düz str.find ile aranır, büyük harfli yazımlar için regex yedeği kullanılır.
+# Yedek desen sabit "+" ile başlar: tamamen IGNORECASE bir desenden ~20 kat hızlıdır.
+_MARKER = 'ld+json'
+_MARKER_RE = re.compile(r'\+(?i:json)')
+_SCRIPT_END_RE = re.compile(r'</script', re.IGNORECASE)
+
+# İşaretin geriye doğru "<script" aranacağı en fazla karakter sayısı
+_TAG_LOOKBEHIND = 512
+
+_decoder = json.JSONDecoder()
+
+
+def find_product(data: Any) -> Optional[Dict]:
+    """
+    Ayrıştırılmış JSON-LD içinde ilk Product objesini bul
+
+    Tek obje, liste ve @graph sarmalayıcılarını destekler.
+
+    Args:
+        data: json ile ayrıştırılmış JSON-LD bloğu
+
+    Returns:
+        Product objesi veya None
+    """
+    if isinstance(data, list):
+        for item in data:
+            product = find_product(item)
+            if product is not None:
+                return product
+        return None
+
+    if not isinstance(data, dict):
+        return None
+
+    item_type = data.get('@type')
+    if item_type == 'Product' or (isinstance(item_type, list) and 'Product' in item_type):
+        return data
+
+    graph = data.get('@graph')
+    if graph is not None:
+        return find_product(graph)
+    return None
+
+
+class JsonLdScanner:
+    """
+    Artımlı JSON-LD Product tarayıcısı
+
+    HTML parça parça verilir (feed); tarama kaldığı yerden devam eder ve
+    yalnızca application/ld+json script blokları ayrıştırılır. İlk Product
+    bulunduğunda tarama biter, kalan içeriğin indirilmesine gerek kalmaz.
+    """
+
+    def __init__(self):
+        self._buffer = ''
+        self._pos = 0
+        self._case_sensitive = True
+        self.product: Optional[Dict] = None
+        self.blocks_parsed = 0
+
+    @property
+    def done(self) -> bool:
+        """Product bulundu mu"""
+        return self.product is not None
+
+    def feed(self, chunk: str) -> Optional[Dict]:
+        """
+        Yeni HTML parçası ekle ve taramaya devam et
+
+        Args:
+            chunk: HTML parçası
+
+        Returns:
+            Bulunduysa Product objesi, yoksa None
+        """
+        if self.product is not None:
+            return self.product
+        if chunk:
+            self._buffer += chunk
+            self._scan()
+        return self.product
+
+    def finish(self) -> Optional[Dict]:
+        """
+        Belge bitti; Product bulunamadıysa büyük harfli type yazımlarına da bak
+
+        Returns:
+            Product objesi veya None
+        """
+        if self.product is None and self._case_sensitive:
+            self._case_sensitive = False
+            self._pos = 0
+            self._scan()
+        return self.product
+
+    def _find_marker(self, start: int) -> int:
+        if self._case_sensitive:
+            return self._buffer.find(_MARKER, start)
+        # Küçük harfli bloklar ilk geçişte ayrıştırıldı, yalnızca farklı yazımlara bak
+        for match in _MARKER_RE.finditer(self._buffer, start + 2):
+            marker = match.start() - 2
+            candidate = self._buffer[marker:match.end()]
+            if candidate != _MARKER and candidate.lower() == _MARKER:
+                return marker
+        return -1
+
+    def _scan(self):
+        buffer = self._buffer
+        while self.product is None:
+            marker = self._find_marker(self._pos)
+            if marker == -1:
+                # İşaret iki parça arasında bölünmüş olabilir
+                self._pos = max(self._pos, len(buffer) - len(_MARKER) + 1)
+                break
+
+            tag_start = buffer.rfind('<', max(0, marker - _TAG_LOOKBEHIND), marker)
+            if tag_start == -1 or buffer[tag_start:tag_start + 7].lower() != '<script':
+                # Script etiketi değil (ör. link rel=alternate)
+                self._pos = marker + len(_MARKER)
+                continue
+
+            tag_end = buffer.find('>', tag_start)
+            if tag_end == -1:
+                # Etiket henüz tamamlanmadı - sonraki parçayı bekle
+                self._pos = marker
+                break
+            if tag_end < marker:
+                # İşaret etiketin içinde değil, önceki bir script'in gövdesinde (ör. JS'teki "ld+json")
+                self._pos = marker + len(_MARKER)
+                continue
+
+            script_end = _SCRIPT_END_RE.search(buffer, tag_end + 1)
+            if script_end is None:
+                # Blok henüz tamamlanmadı - sonraki parçayı bekle
+                self._pos = marker
+                break
+
+            self.product = self._parse_block(buffer, tag_end + 1, script_end.start())
+            self._pos = script_end.end()
+
+    def _parse_block(self, buffer: str, start: int, end: int) -> Optional[Dict]:
+        self.blocks_parsed += 1
+        block = buffer[start:end].strip()
+        try:
+            # raw_decode bloğun sonundaki fazlalıklara (ör. yorum) takılmaz
+            data, _ = _decoder.raw_decode(block)
+        except ValueError:
+            return None
+        return find_product(data)
+
+
+def extract_product_json_ld(html: str) -> Optional[Dict]:
+    """
+    HTML'den ilk JSON-LD Product verisini çıkar
+
+    Args:
+        html: HTML içeriği (tamamı veya indirilen kısmı)
+
+    Returns:
+        JSON-LD Product verisi veya None
+    """
+    if not html:
+        return None
+    try:
+        scanner = JsonLdScanner()
+        return scanner.feed(html) or scanner.finish()
+    except Exception as e:
+        logger.warning(f"Failed to extract JSON-LD: {e}")
+        return None
+
+
+def extract_product_json_ld_stream(chunks: Iterable[str]) -> Optional[Dict]:
+    """
+    Parça parça gelen HTML'den Product çıkar, bulununca okumayı bırak
+
+    Args:
+        chunks: HTML parçaları (ör. response.iter_content(decode_unicode=True))
+
+    Returns:
+        JSON-LD Product verisi veya None
+    """
+    scanner = JsonLdScanner()
+    try:
+        for chunk in chunks:
+            if scanner.feed(chunk) is not None:
+                return scanner.product
+    except Exception as e:
+        logger.warning(f"Failed to extract JSON-LD from stream: {e}")
+        return scanner.product
+    return scanner.finish()
@@ -4,10 +4,13 @@ FRC parçaları için özelleştirilmiş doğrulama ve eşleşme algoritmaları
 """
 
 import re
-import json
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, FrozenSet, List, Optional, Tuple
 import logging
 
+from json_ld_extract import extract_product_json_ld
+from keyword_matcher import KeywordMatcher, compile_keywords, match_ratio
+from page_document import PageDocument
+
 logger = logging.getLogger(__name__)
 
 class JSONLDValidator:
@@ -38,6 +41,9 @@ class JSONLDValidator:
             }
         }
         
+        # Genel FRC anahtar kelimeleri
+        self.frc_keywords = ['frc', 'first robotics', 'robotics competition', 'vex', 'rev', 'ctre']
+        
         # FRC özel parça tanımları
         self.frc_parts = {
             'neo': {
@@ -77,6 +83,19 @@ class JSONLDValidator:
                 'specs': ['encoder', 'magnetic', 'absolute']
             }
         }
+        
+        # Tüm tablolardaki kelimeler tek eşleştiricide derlenir; sayfa metni
+        # kelime başına değil, sayfa başına bir kez taranır
+        self.keyword_matcher = KeywordMatcher(self._table_keywords())
+
+    def _table_keywords(self) -> List[str]:
+        """Kategori, parça ve genel FRC tablolarındaki tüm kelimeler"""
+        keywords = list(self.frc_keywords)
+        for table in (self.frc_categories, self.frc_parts):
+            for specs in table.values():
+                for values in specs.values():
+                    keywords.extend(values)
+        return keywords
 
     def extract_json_ld(self, html: str) -> Optional[Dict]:
         """
@@ -88,30 +107,7 @@ class JSONLDValidator:
         Returns:
             JSON-LD Product verisi veya None
         """
-        try:
-            # JSON-LD script tag'lerini bul
-            pattern = r'<script[^>]+type="application/ld\+json"[^>]*>(.*?)</script>'
-            matches = re.findall(pattern, html, re.DOTALL | re.IGNORECASE)
-            
-            for match in matches:
-                try:
-                    data = json.loads(match.strip())
-                    
-                    # Tek obje veya liste olabilir
-                    if isinstance(data, list):
-                        for item in data:
-                            if item.get('@type') == 'Product':
-                                return item
-                    elif isinstance(data, dict) and data.get('@type') == 'Product':
-                        return data
-                        
-                except json.JSONDecodeError:
-                    continue
-                    
-        except Exception as e:
-            logger.warning(f"Failed to extract JSON-LD: {e}")
-            
-        return None
+        return extract_product_json_ld(html)
 
     def validate_product_structure(self, json_ld: Dict) -> Tuple[bool, List[str]]:
         """
@@ -174,13 +170,15 @@ class JSONLDValidator:
         except (ValueError, TypeError):
             return False
 
-    def is_frc_part(self, json_ld: Dict, html: str = '') -> Tuple[bool, str, float]:
+    def is_frc_part(self, json_ld: Dict, html: str = '',
+                    document: Optional[PageDocument] = None) -> Tuple[bool, str, float]:
         """
         Ürünün FRC parçası olup olmadığını ve eşleşme skorunu hesapla
         
         Args:
             json_ld: JSON-LD Product verisi
-            html: HTML içeriği (opsiyonel)
+            html: HTML içeriği (opsiyonel, document verilmezse kullanılır)
+            document: Sayfanın ayrıştırılmış hali (opsiyonel)
             
         Returns:
             (frc_parçası_mi, kategori, eşleşme_skoru)
@@ -188,19 +186,16 @@ class JSONLDValidator:
         if not json_ld:
             return False, 'unknown', 0.0
         
-        # Tüm metin içeriğini birleştir
-        text_content = ' '.join([
-            json_ld.get('name', ''),
-            json_ld.get('description', ''),
-            json_ld.get('sku', '') or '',
-            json_ld.get('mpn', '') or '',
-            html
-        ]).lower()
+        # JSON-LD alanları + başlık + meta + görünür metinde geçen tüm tablo
+        # kelimeleri (ham HTML'deki script/style içerikleri sayılmaz)
+        if document is None:
+            document = PageDocument(html)
+        hits = document.keyword_hits(self.keyword_matcher, json_ld)
         
         # FRC kategori skorları
         category_scores = {}
         for category, specs in self.frc_categories.items():
-            score = self._calculate_category_score(text_content, specs)
+            score = self._calculate_category_score(hits, specs)
             category_scores[category] = score
         
         # En yüksek skorlu kategoriyi bul
@@ -209,16 +204,14 @@ class JSONLDValidator:
         # FRC parça eşleşmeleri
         part_scores = {}
         for part_name, part_specs in self.frc_parts.items():
-            score = self._calculate_part_score(text_content, part_specs)
+            score = self._calculate_part_score(hits, part_specs)
             part_scores[part_name] = score
         
         # En yüksek skorlu parçayı bul
         best_part = max(part_scores.items(), key=lambda x: x[1])
         
         # Genel FRC eşleşme skoru
-        frc_keywords = ['frc', 'first robotics', 'robotics competition', 'vex', 'rev', 'ctre']
-        frc_score = sum(1 for keyword in frc_keywords if keyword in text_content)
-        frc_score = min(frc_score / len(frc_keywords), 1.0)
+        frc_score = min(match_ratio(hits, self.frc_keywords), 1.0)
         
         # Toplam skor hesapla
         total_score = max(
@@ -235,54 +228,38 @@ class JSONLDValidator:
         else:
             return is_frc, best_category[0], total_score
 
-    def _calculate_category_score(self, text: str, category_specs: Dict) -> float:
-        """Kategori eşleşme skorunu hesapla"""
+    def _calculate_category_score(self, hits: FrozenSet[str], category_specs: Dict) -> float:
+        """Kategori eşleşme skorunu metinde bulunan kelimelerden hesapla"""
         score = 0.0
         
         # Anahtar kelimeler
-        keywords = category_specs.get('keywords', [])
-        keyword_matches = sum(1 for keyword in keywords if keyword in text)
-        if keywords:
-            score += (keyword_matches / len(keywords)) * 0.4
+        score += match_ratio(hits, category_specs.get('keywords', [])) * 0.4
         
         # Markalar
-        brands = category_specs.get('brands', [])
-        brand_matches = sum(1 for brand in brands if brand.lower() in text)
-        if brands:
-            score += (brand_matches / len(brands)) * 0.3
+        score += match_ratio(hits, category_specs.get('brands', [])) * 0.3
         
         # Özellikler
-        specs = category_specs.get('specs', [])
-        spec_matches = sum(1 for spec in specs if spec in text)
-        if specs:
-            score += (spec_matches / len(specs)) * 0.3
+        score += match_ratio(hits, category_specs.get('specs', [])) * 0.3
         
         return min(score, 1.0)
 
-    def _calculate_part_score(self, text: str, part_specs: Dict) -> float:
-        """Parça eşleşme skorunu hesapla"""
+    def _calculate_part_score(self, hits: FrozenSet[str], part_specs: Dict) -> float:
+        """Parça eşleşme skorunu metinde bulunan kelimelerden hesapla"""
         score = 0.0
         
         # Zorunlu anahtar kelimeler
         must_keywords = part_specs.get('must_keywords', [])
-        must_matches = sum(1 for keyword in must_keywords if keyword.lower() in text)
         if must_keywords:
-            must_score = must_matches / len(must_keywords)
+            must_score = match_ratio(hits, must_keywords)
             if must_score < 1.0:  # Tüm zorunlu kelimeler yoksa düşük skor
                 return 0.0
             score += must_score * 0.6
         
         # Opsiyonel anahtar kelimeler
-        optional_keywords = part_specs.get('optional_keywords', [])
-        optional_matches = sum(1 for keyword in optional_keywords if keyword.lower() in text)
-        if optional_keywords:
-            score += (optional_matches / len(optional_keywords)) * 0.2
+        score += match_ratio(hits, part_specs.get('optional_keywords', [])) * 0.2
         
         # Marka eşleşmesi
-        brands = part_specs.get('brands', [])
-        brand_matches = sum(1 for brand in brands if brand.lower() in text)
-        if brands:
-            score += (brand_matches / len(brands)) * 0.2
+        score += match_ratio(hits, part_specs.get('brands', [])) * 0.2
         
         return min(score, 1.0)
 
@@ -364,14 +341,16 @@ class JSONLDValidator:
             'mpn': json_ld.get('mpn')
         }
 
-    def validate_canonical_match(self, json_ld: Dict, canonical_specs: Dict, html: str = '') -> Tuple[bool, float]:
+    def validate_canonical_match(self, json_ld: Dict, canonical_specs: Dict, html: str = '',
+                                 document: Optional[PageDocument] = None) -> Tuple[bool, float]:
         """
         Canonical parça özellikleriyle eşleşme kontrolü
         
         Args:
             json_ld: JSON-LD Product verisi
             canonical_specs: Canonical parça özellikleri
-            html: HTML içeriği
+            html: HTML içeriği (document verilmezse kullanılır)
+            document: Sayfanın ayrıştırılmış hali (opsiyonel)
             
         Returns:
             (eşleşme_var_mı, eşleşme_skoru)
@@ -379,38 +358,28 @@ class JSONLDValidator:
         if not json_ld or not canonical_specs:
             return False, 0.0
         
-        # Tüm metin içeriğini birleştir
-        text_content = ' '.join([
-            json_ld.get('name', ''),
-            json_ld.get('description', ''),
-            json_ld.get('sku', '') or '',
-            json_ld.get('mpn', '') or '',
-            html
-        ]).lower()
+        # JSON-LD alanları + başlık + meta + görünür metin
+        if document is None:
+            document = PageDocument(html)
+        text_content = document.product_text(json_ld)
         
-        # Zorunlu anahtar kelimeler
+        # Zorunlu anahtar kelimeler - biri eksikse diğer kelimeler için tarama yapılmaz
         must_keywords = canonical_specs.get('must_keywords', [])
         if must_keywords:
-            must_matches = sum(1 for keyword in must_keywords if keyword.lower() in text_content)
-            must_score = must_matches / len(must_keywords)
-            if must_score < 1.0:  # Tüm zorunlu kelimeler yoksa eşleşme yok
-                return False, 0.0
-        else:
-            must_score = 1.0
+            if not compile_keywords(must_keywords).contains_all(text_content):
+                return False, 0.0  # Tüm zorunlu kelimeler yoksa eşleşme yok
+        must_score = 1.0
         
-        # Opsiyonel anahtar kelimeler
+        # Opsiyonel kelimeler ve markalar tek taramada
         optional_keywords = canonical_specs.get('optional_keywords', [])
-        optional_score = 0.0
-        if optional_keywords:
-            optional_matches = sum(1 for keyword in optional_keywords if keyword.lower() in text_content)
-            optional_score = optional_matches / len(optional_keywords)
+        expected_brands = canonical_specs.get('brands', [])
+        hits = compile_keywords(list(optional_keywords) + list(expected_brands)).find_all(text_content)
+        
+        # Opsiyonel anahtar kelimeler
+        optional_score = match_ratio(hits, optional_keywords)
         
         # Marka eşleşmesi
-        brand_score = 0.0
-        expected_brands = canonical_specs.get('brands', [])
-        if expected_brands:
-            brand_matches = sum(1 for brand in expected_brands if brand.lower() in text_content)
-            brand_score = brand_matches / len(expected_brands)
+        brand_score = match_ratio(hits, expected_brands)
         
         # Toplam skor
         total_score = (must_score * 0.5 + optional_score * 0.3 + brand_score * 0.2)
@@ -0,0 +1,162 @@
+"""
+Derlenmiş çoklu anahtar kelime eşleştirici
+Tüm kelime tabloları bir kez derlenir; metin başına tek taramada bulunan kelimeler kümesi çıkar
+"""
+
+import string
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+# Uzun metinler kelime başına taranmadan önce tekil kelime dizilerine indirgenir.
+# İndirgeme ~1 ms/100 KB sürdüğü için yalnızca çok kelimeli eşleştiricilerde ve
+# uzun metinlerde kullanılır.
+REDUCE_MIN_LENGTH = 16 * 1024
+REDUCE_MIN_KEYWORDS = 16
+
+_WORD_CHARS = frozenset((string.ascii_lowercase + string.digits).encode())
+# [a-z0-9] ve ASCII olmayan baytlar korunur, boşluk \x01 olur, diğer her şey ayraçtır
+_REDUCE_TABLE = bytes(
+    0x01 if byte == 0x20 else byte if byte in _WORD_CHARS or byte >= 0x80 else 0x20
+    for byte in range(256)
+)
+
+
+def _encode_keyword(keyword: str) -> Optional[bytes]:
+    """İndirgenmiş metinde aranabilecek kelimenin bayt hali (yalnızca [a-z0-9 ] kelimeler)"""
+    if not keyword or any(char != ' ' and ord(char) not in _WORD_CHARS for char in keyword):
+        return None
+    return keyword.encode('ascii').replace(b' ', b'\x01')
+
+
+def reduce_text(text: str) -> bytes:
+    """
+    Metni tekil [a-z0-9 ] dizilerine indirge
+
+    Bir [a-z0-9 ] kelimesi metinde ancak bu karakterlerden oluşan en uzun
+    dizilerden birinin içinde geçebilir. HTML'deki tekrarlar (sınıf adları,
+    menüler) tekilleştirilince taranacak metin birkaç kat kısalır.
+
+    Args:
+        text: Küçük harfe çevrilmiş metin
+
+    Returns:
+        Satırlarla ayrılmış tekil diziler (boşluklar \x01 olarak)
+    """
+    runs = text.encode('utf-8', 'surrogatepass').translate(_REDUCE_TABLE).split()
+    return b'\n'.join(set(runs))
+
+
+class KeywordMatcher:
+    """
+    Bir kelime kümesinin hangi elemanlarının metinde geçtiğini bulur
+
+    Kelimeler küçük harfe çevrilip tekilleştirilir ve uzundan kısaya
+    sıralanır. Bir kelime diğerini içeriyorsa (ör. "cancoder" -> "can")
+    uzun kelimenin bulunması kısayı da bulunmuş sayar, kısa kelime için
+    metin ayrıca taranmaz. Uzun metinler önce reduce_text ile tekil
+    dizilere indirgenir. Sonuç bir küme olduğundan kategori, parça ve
+    marka skorları metne tekrar bakmadan bu kümeden hesaplanır.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        """
+        Args:
+            keywords: Aranacak kelimeler (büyük/küçük harf fark etmez)
+        """
+        unique = {keyword.lower() for keyword in keywords if keyword}
+        self.keywords: Tuple[str, ...] = tuple(sorted(unique, key=lambda k: (-len(k), k)))
+        self._encoded: Dict[str, bytes] = {}
+        for keyword in self.keywords:
+            encoded = _encode_keyword(keyword)
+            if encoded is not None:
+                self._encoded[keyword] = encoded
+        # Kelime -> içerdiği diğer kelimeler
+        self._implied: Dict[str, FrozenSet[str]] = {
+            keyword: frozenset(other for other in unique if other != keyword and other in keyword)
+            for keyword in self.keywords
+        }
+
+    def find_all(self, text: str) -> FrozenSet[str]:
+        """
+        Metinde geçen kelimeleri bul
+
+        Args:
+            text: Küçük harfe çevrilmiş metin
+
+        Returns:
+            Bulunan kelimeler (küçük harfli)
+        """
+        reduced = self._reduce(text)
+        found = set()
+        for keyword in self.keywords:
+            if keyword in found:
+                continue
+            if self._contains(keyword, text, reduced):
+                found.add(keyword)
+                found.update(self._implied[keyword])
+        return frozenset(found)
+
+    def contains_all(self, text: str) -> bool:
+        """
+        Tüm kelimeler metinde geçiyor mu (ilk eksik kelimede durur)
+
+        Args:
+            text: Küçük harfe çevrilmiş metin
+
+        Returns:
+            Hepsi geçiyorsa True
+        """
+        reduced = self._reduce(text)
+        found = set()
+        for keyword in self.keywords:
+            if keyword in found:
+                continue
+            if not self._contains(keyword, text, reduced):
+                return False
+            found.update(self._implied[keyword])
+        return True
+
+    def _reduce(self, text: str) -> Optional[bytes]:
+        if len(text) < REDUCE_MIN_LENGTH or len(self._encoded) < REDUCE_MIN_KEYWORDS:
+            return None
+        return reduce_text(text)
+
+    def _contains(self, keyword: str, text: str, reduced: Optional[bytes]) -> bool:
+        encoded = self._encoded.get(keyword) if reduced is not None else None
+        if encoded is None:
+            return keyword in text
+        return encoded in reduced
+
+
+@lru_cache(maxsize=256)
+def _compile(keywords: Tuple[str, ...]) -> KeywordMatcher:
+    return KeywordMatcher(keywords)
+
+
+def compile_keywords(keywords: Iterable[str]) -> KeywordMatcher:
+    """
+    Kelime listesi için derlenmiş eşleştiriciyi döndür (aynı liste tekrar derlenmez)
+
+    Args:
+        keywords: Kelimeler
+
+    Returns:
+        KeywordMatcher
+    """
+    return _compile(tuple(sorted({keyword.lower() for keyword in keywords if keyword})))
+
+
+def match_ratio(hits: FrozenSet[str], keywords: List[str]) -> float:
+    """
+    Kelimelerin bulunan kısmının oranı
+
+    Args:
+        hits: find_all sonucu
+        keywords: Oranı hesaplanacak kelimeler
+
+    Returns:
+        0-1 arası oran (liste boşsa 0)
+    """
+    if not keywords:
+        return 0.0
+    return sum(1 for keyword in keywords if keyword.lower() in hits) / len(keywords)
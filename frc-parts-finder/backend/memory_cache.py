@@ -0,0 +1,206 @@
+"""
+Sınırlı boyutlu bellek içi önbellek katmanı
+LRU tahliye + TinyLFU kabul politikası (count-min sketch ile erişim sıklığı)
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class FrequencySketch:
+    """
+    Count-min sketch tabanlı yaklaşık erişim sıklığı sayacı
+
+    Sayaçlar 15'te doyar; toplam artış sample_size'a ulaştığında tüm
+    sayaçlar yarıya indirilir (yaşlandırma), böylece eski popülerlik
+    zamanla unutulur.
+    """
+
+    DEPTH = 4
+    MAX_COUNT = 15
+
+    def __init__(self, width: int = 4096, sample_size: int = 40960):
+        # Genişliği 2'nin kuvvetine yuvarla (maskeleme için)
+        self.width = 1 << max(4, (width - 1).bit_length())
+        self.mask = self.width - 1
+        self.sample_size = sample_size
+        self.additions = 0
+        self.rows = [[0] * self.width for _ in range(self.DEPTH)]
+
+    def _indexes(self, key: str) -> List[int]:
+        h = hash(key)
+        return [((h >> (i * 8)) ^ (h * (i + 1) * 0x9E3779B1)) & self.mask for i in range(self.DEPTH)]
+
+    def increment(self, key: str):
+        """Anahtarın sıklığını artır"""
+        added = False
+        for row, index in zip(self.rows, self._indexes(key)):
+            if row[index] < self.MAX_COUNT:
+                row[index] += 1
+                added = True
+        if added:
+            self.additions += 1
+            if self.additions >= self.sample_size:
+                self._reset()
+
+    def frequency(self, key: str) -> int:
+        """Anahtarın tahmini sıklığı"""
+        return min(row[index] for row, index in zip(self.rows, self._indexes(key)))
+
+    def _reset(self):
+        """Yaşlandırma - tüm sayaçları yarıya indir"""
+        for row in self.rows:
+            for i, value in enumerate(row):
+                row[i] = value >> 1
+        self.additions //= 2
+
+
+class BoundedMemoryCache:
+    """
+    Kayıt sayısı ve yaklaşık bayt boyutu ile sınırlandırılmış bellek katmanı
+
+    Kapasite dolduğunda en uzun süredir kullanılmayan kayıtlar (LRU
+    kurbanları) aday kayıtla karşılaştırılır: aday, atılacak kurbanların
+    toplamından daha sık erişilmiyorsa belleğe alınmaz ve hiçbir kayıt
+    atılmaz. Böylece "neo", "spark max" gibi sık aranan kayıtlar tek
+    seferlik sorgular tarafından bellekten atılmaz. Bellekten çıkan
+    kayıtlar kalıcı katmanda kalmaya devam eder.
+    """
+
+    def __init__(self, max_entries: int = 1000, max_bytes: int = 16 * 1024 * 1024,
+                 admission: bool = True):
+        """
+        Args:
+            max_entries: Maksimum kayıt sayısı
+            max_bytes: Yaklaşık maksimum bellek kullanımı (bayt)
+            admission: TinyLFU kabul politikası aktif mi
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.admission = admission
+
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._total_bytes = 0
+        self._sketch = FrequencySketch(width=max_entries * 4, sample_size=max_entries * 10)
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.rejections = 0
+
+    @staticmethod
+    def _estimate_size(entry: Dict) -> int:
+        """Kaydın yaklaşık boyutu (JSON uzunluğu)"""
+        try:
+            return len(json.dumps(entry, ensure_ascii=False, default=str))
+        except (TypeError, ValueError):
+            return 1024
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Kaydı oku ve LRU sırasını güncelle"""
+        with self._lock:
+            self._sketch.increment(key)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, entry: Dict) -> bool:
+        """
+        Kaydı belleğe ekle
+
+        Returns:
+            Kayıt bellekte tutuluyorsa True, kabul politikası reddettiyse False
+        """
+        size = self._estimate_size(entry)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            elif size > self.max_bytes:
+                self.rejections += 1
+                return False
+
+            # Yer açacak LRU kurbanları önce yalnızca seçilir; aday hepsinin toplam
+            # sıklığından daha sık kullanılmıyorsa hiçbir kayıt atılmadan reddedilir
+            victims = self._select_victims(size)
+            if self.admission and victims and (
+                self._sketch.frequency(key) <= sum(self._sketch.frequency(victim) for victim in victims)
+            ):
+                self.rejections += 1
+                return False
+            for victim in victims:
+                self._remove(victim)
+                self.evictions += 1
+
+            self._entries[key] = entry
+            self._sizes[key] = size
+            self._total_bytes += size
+            return True
+
+    def _select_victims(self, size: int) -> List[str]:
+        """Adaya yer açmak için atılması gereken LRU kayıtları (kilit tutulurken çağrılır)"""
+        victims = []
+        count, total_bytes = len(self._entries), self._total_bytes
+        for victim in self._entries:
+            if count < self.max_entries and total_bytes + size <= self.max_bytes:
+                break
+            victims.append(victim)
+            count -= 1
+            total_bytes -= self._sizes.get(victim, 0)
+        return victims
+
+    def _remove(self, key: str):
+        del self._entries[key]
+        self._total_bytes -= self._sizes.pop(key, 0)
+
+    def pop(self, key: str) -> Optional[Dict]:
+        """Kaydı bellekten çıkar"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._remove(key)
+            return entry
+
+    def clear(self):
+        """Tüm kayıtları sil"""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._total_bytes = 0
+
+    def items(self) -> List:
+        """Kayıtların anlık kopyası"""
+        with self._lock:
+            return list(self._entries.items())
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict:
+        """Bellek katmanı istatistikleri"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'approx_bytes': self._total_bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'evictions': self.evictions,
+                'rejections': self.rejections
+            }
@@ -0,0 +1,179 @@
+"""
+Ayrıştırılmış ürün sayfası modeli
+Her sayfa bir kez işlenir; JSON-LD, meta etiketleri, başlık ve görünür metin motorlar ile doğrulayıcı arasında paylaşılır
+"""
+
+import html as html_lib
+import re
+import threading
+from typing import Dict, FrozenSet, Optional
+
+from json_ld_extract import extract_product_json_ld
+from keyword_matcher import KeywordMatcher
+from page_memo import current_page_memo
+
+# Görünür metne katılmayan bloklar: yorumlar, script/style gibi içerikler ve etiketler.
+# Küçük harfe çevrilmiş HTML'e uygulanır (IGNORECASE bu desende ~3 kat yavaş).
+# Başlık ayrıca eklendiği için <title> da çıkarılır.
+_MARKUP_RE = re.compile(
+    r'<!--.*?-->'
+    r'|<(script|style|noscript|template|svg|iframe|title)\b.*?</\1\s*>'
+    r'|<[^>]*>',
+    re.DOTALL
+)
+_TITLE_RE = re.compile(r'<title[^>]*>(.*?)</title', re.IGNORECASE | re.DOTALL)
+_META_RE = re.compile(r'<meta\s[^>]*>', re.IGNORECASE)
+_ATTR_RE = re.compile(r'''([\w:.-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))''')
+
+# Sınıflandırma metnine eklenen meta alanları
+TEXT_META_KEYS = ('description', 'og:title', 'og:description', 'keywords')
+
+# Sayfa hafızasında belge için kullanılan anahtar
+PAGE_DOCUMENT = 'page_document'
+
+
+def normalize_text(text: str) -> str:
+    """HTML varlıklarını çöz, boşlukları tekilleştir"""
+    return ' '.join(html_lib.unescape(text).split())
+
+
+class PageDocument:
+    """
+    Bir ürün sayfasının bir kez ayrıştırılmış hali
+
+    Alanlar ilk erişimde hesaplanır ve saklanır. Sınıflandırma ham HTML
+    yerine product_text() üzerinden yapılır: JSON-LD alanları, başlık,
+    meta açıklamaları ve script/style içermeyen görünür metin. Bu metin
+    ham HTML'in küçük bir kısmıdır ve script gövdelerindeki kelimeler
+    (ör. "can") yanlış eşleşme üretmez.
+    """
+
+    def __init__(self, html: str, url: str = ''):
+        """
+        Args:
+            html: Sayfa HTML'i
+            url: Sayfa URL'si
+        """
+        self.html = html or ''
+        self.url = url
+        self._json_ld: Optional[Dict] = None
+        self._json_ld_done = False
+        self._title: Optional[str] = None
+        self._meta: Optional[Dict[str, str]] = None
+        self._visible_text: Optional[str] = None
+        self._product_text: Optional[str] = None
+        self._hits: Dict[KeywordMatcher, FrozenSet[str]] = {}
+        self._lock = threading.RLock()
+
+    @property
+    def json_ld(self) -> Optional[Dict]:
+        """JSON-LD Product verisi (yoksa None)"""
+        with self._lock:
+            if not self._json_ld_done:
+                self._json_ld = extract_product_json_ld(self.html)
+                self._json_ld_done = True
+            return self._json_ld
+
+    @property
+    def title(self) -> str:
+        """<title> içeriği"""
+        with self._lock:
+            if self._title is None:
+                match = _TITLE_RE.search(self.html)
+                self._title = normalize_text(match.group(1)) if match else ''
+            return self._title
+
+    @property
+    def meta(self) -> Dict[str, str]:
+        """Meta etiketleri: name/property -> content"""
+        with self._lock:
+            if self._meta is None:
+                self._meta = self._parse_meta()
+            return self._meta
+
+    @property
+    def visible_text(self) -> str:
+        """Script, style ve etiketlerden arındırılmış, küçük harfli görünür metin"""
+        with self._lock:
+            if self._visible_text is None:
+                self._visible_text = normalize_text(_MARKUP_RE.sub(' ', self.html.lower()))
+            return self._visible_text
+
+    def product_text(self, json_ld: Optional[Dict] = None) -> str:
+        """
+        Sınıflandırmada kullanılan küçük harfli metin
+
+        Args:
+            json_ld: Kullanılacak JSON-LD (verilmezse sayfanınki)
+
+        Returns:
+            JSON-LD alanları + başlık + meta açıklamaları + görünür metin
+        """
+        own = json_ld is None or json_ld is self.json_ld
+        with self._lock:
+            if own and self._product_text is not None:
+                return self._product_text
+
+            data = self.json_ld if json_ld is None else json_ld
+            parts = [str(data.get(key) or '') for key in ('name', 'description', 'sku', 'mpn')] if data else []
+            parts.append(self.title)
+            parts.extend(self.meta.get(key, '') for key in TEXT_META_KEYS)
+            parts.append(self.visible_text)
+            text = ' '.join(part for part in parts if part).lower()
+
+            if own:
+                self._product_text = text
+            return text
+
+    def keyword_hits(self, matcher: KeywordMatcher, json_ld: Optional[Dict] = None) -> FrozenSet[str]:
+        """
+        Eşleştiricinin kelimelerinden sayfa metninde geçenler (eşleştirici başına bir kez)
+
+        Args:
+            matcher: Derlenmiş kelime eşleştirici
+            json_ld: Kullanılacak JSON-LD (verilmezse sayfanınki)
+
+        Returns:
+            Bulunan kelimeler
+        """
+        if json_ld is not None and json_ld is not self.json_ld:
+            return matcher.find_all(self.product_text(json_ld))
+        with self._lock:
+            hits = self._hits.get(matcher)
+            if hits is None:
+                hits = matcher.find_all(self.product_text())
+                self._hits[matcher] = hits
+            return hits
+
+    def _parse_meta(self) -> Dict[str, str]:
+        # Meta etiketleri <head> içindedir; uzun gövdeyi taramaya gerek yok
+        head_end = self.html.find('</head')
+        head = self.html if head_end == -1 else self.html[:head_end]
+        meta = {}
+        for tag in _META_RE.findall(head):
+            attrs = {
+                name.lower(): next((value for value in values if value), '')
+                for name, *values in _ATTR_RE.findall(tag)
+            }
+            key = attrs.get('name') or attrs.get('property') or attrs.get('itemprop')
+            if key and 'content' in attrs:
+                meta.setdefault(key.lower(), normalize_text(attrs['content']))
+        return meta
+
+
+def page_document(url: str, html: str) -> PageDocument:
+    """
+    Sayfanın belgesini döndür - arama içinde aynı URL için tek belge oluşturulur
+
+    Args:
+        url: Sayfa URL'si
+        html: Sayfa HTML'i
+
+    Returns:
+        PageDocument
+    """
+    memo = current_page_memo()
+    page = memo.peek(url) if memo is not None else None
+    if page is None:
+        return PageDocument(html, url)
+    return page.derived(PAGE_DOCUMENT, lambda: PageDocument(html, url))
@@ -0,0 +1,143 @@
+"""
+Tedarikçi içi eşzamanlı ürün sayfası çekme
+Host başına sınırlı eşzamanlılık, sonuç sırası korunur
+"""
+
+import contextvars
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from typing import Callable, Deque, Dict, List, Optional, Tuple, TypeVar
+from urllib.parse import urlparse
+import logging
+
+from deadline import current_deadline
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# Tüm motorların paylaştığı sayfa çekme havuzu
+PAGE_POOL_SIZE = 16
+
+# Host başına aynı anda açık ürün sayfası isteği - nezaket sınırı
+# (istek hızı ayrıca rate_limiter'daki token bucket ile sınırlıdır)
+DEFAULT_HOST_CONCURRENCY = 2
+HOST_CONCURRENCY = {
+    'www.revrobotics.com': 4,
+    'wcproducts.com': 4,
+    'andymark.com': 2,
+    'www.andymark.com': 2,
+    'store.ctr-electronics.com': 2,
+}
+
+
+class _HostQueue:
+    """Tek host'un çalışan iş sayısı ve sırada bekleyen işleri"""
+
+    __slots__ = ('limit', 'active', 'waiting')
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self.waiting: Deque[Tuple[Future, contextvars.Context, Callable, str]] = deque()
+
+
+class PageFetcher:
+    """
+    Ürün sayfalarını paralel işleyen sınırlı havuz
+
+    map() verilen fonksiyonu her URL için havuzda çalıştırır ve sonuçları
+    URL sırasıyla döndürür. Aynı host'a giden eşzamanlı işler host başına
+    sınırlıdır ve bu sınır tüm aramalar arasında ortaktır: sınırı dolu
+    host'un işleri havuza gönderilmeden host kuyruğunda bekler, bir iş
+    bitince sıradaki havuza verilir. Böylece yoğun bir host havuz
+    thread'lerini bekleyerek tüketmez. Görevler çağıranın contextvars
+    bağlamının kopyasında çalışır.
+    """
+
+    def __init__(self, max_workers: int = PAGE_POOL_SIZE,
+                 host_limits: Optional[Dict[str, int]] = None,
+                 default_limit: int = DEFAULT_HOST_CONCURRENCY):
+        """
+        Args:
+            max_workers: Havuzdaki thread sayısı
+            host_limits: Host -> eşzamanlı istek sınırı
+            default_limit: Listede olmayan hostlar için sınır
+        """
+        self.host_limits = dict(HOST_CONCURRENCY if host_limits is None else host_limits)
+        self.default_limit = default_limit
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='page-fetch')
+        self._hosts: Dict[str, _HostQueue] = {}
+        self._lock = threading.Lock()
+
+    def _submit(self, fn: Callable[[str], Optional[T]], url: str) -> Future:
+        """İşi host sınırı izin veriyorsa havuza gönder, yoksa host kuyruğuna ekle"""
+        future: Future = Future()
+        host = urlparse(url).netloc
+        context = contextvars.copy_context()
+        with self._lock:
+            queue = self._hosts.get(host)
+            if queue is None:
+                queue = _HostQueue(self.host_limits.get(host, self.default_limit))
+                self._hosts[host] = queue
+            if queue.active >= queue.limit:
+                queue.waiting.append((future, context, fn, url))
+                return future
+            queue.active += 1
+        self._executor.submit(self._run, queue, future, context, fn, url)
+        return future
+
+    def _run(self, queue: _HostQueue, future: Future, context: contextvars.Context,
+             fn: Callable[[str], Optional[T]], url: str):
+        while future is not None:
+            # Beklerken iptal edilen (deadline'ı dolan) işler çalıştırılmaz
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(context.run(fn, url))
+                except Exception as e:
+                    logger.warning(f"Failed to process page {url}: {e}")
+                    future.set_result(None)
+            future = None
+            with self._lock:
+                if queue.waiting:
+                    # Host slotu bırakılmaz - sıradaki iş aynı thread'de sürer
+                    future, context, fn, url = queue.waiting.popleft()
+                else:
+                    queue.active -= 1
+
+    def map(self, fn: Callable[[str], Optional[T]], urls: List[str]) -> List[Optional[T]]:
+        """
+        fn'i her URL için paralel çalıştır
+
+        Args:
+            fn: URL -> sonuç (hata durumunda sonuç None sayılır)
+            urls: İşlenecek URL'ler
+
+        Returns:
+            URL sırasıyla sonuçlar - istek deadline'ı dolduğunda bitmemiş
+            sayfalar None olarak döner
+        """
+        futures = [self._submit(fn, url) for url in urls]
+        deadline = current_deadline()
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result(timeout=deadline.remaining() if deadline else None))
+            except FuturesTimeout:
+                future.cancel()
+                results.append(None)
+        return results
+
+
+_shared_fetcher: Optional[PageFetcher] = None
+_shared_lock = threading.Lock()
+
+
+def get_page_fetcher() -> PageFetcher:
+    """Süreç genelinde paylaşılan sayfa çekici"""
+    global _shared_fetcher
+    with _shared_lock:
+        if _shared_fetcher is None:
+            _shared_fetcher = PageFetcher()
+        return _shared_fetcher
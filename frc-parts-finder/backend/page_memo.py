@@ -0,0 +1,131 @@
+"""
+Arama isteği kapsamlı sayfa çekim hafızası
+Bir ürün URL'si arama boyunca en fazla bir kez indirilir; JSON-LD ve canlılık bilgisi paylaşılır
+"""
+
+import contextvars
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import requests
+
+from deadline import DeadlineExceeded
+from single_flight import SingleFlight
+
+class MemoizedPage:
+    """Tek URL'nin istek boyunca paylaşılan çekim sonucu"""
+
+    def __init__(self, response: Optional[requests.Response] = None, error: Optional[Exception] = None):
+        self.response = response
+        self.error = error
+        self._text: Optional[str] = None
+        self._derived: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def status_code(self) -> Optional[int]:
+        return self.response.status_code if self.response is not None else None
+
+    @property
+    def alive(self) -> bool:
+        """Sayfa çekimi başarılı mı (canlılık kontrolü için HEAD yerine kullanılır)"""
+        return self.response is not None and self.response.status_code < 400
+
+    @property
+    def text(self) -> str:
+        """Çözülmüş HTML (Response.text her erişimde yeniden çözdüğü için saklanır)"""
+        if self._text is None and self.response is not None:
+            self._text = self.response.text
+        return self._text or ''
+
+    def derived(self, name: str, compute: Callable[[], Any]) -> Any:
+        """Sayfadan türetilen değeri (ör. ayrıştırılmış belge) bir kez hesapla ve sakla"""
+        with self._lock:
+            if name not in self._derived:
+                self._derived[name] = compute()
+            return self._derived[name]
+
+
+class PageMemo:
+    """
+    URL -> MemoizedPage hafızası
+
+    Aynı URL için eşzamanlı istekler tek çekimde birleşir; kesin hatalar da
+    saklanır, böylece başarısız bir sayfa aynı arama içinde tekrar denenmez.
+    Deadline ve zaman aşımı hataları saklanmaz.
+    """
+
+    def __init__(self):
+        self._pages: Dict[str, MemoizedPage] = {}
+        self._flight = SingleFlight()
+        self._lock = threading.Lock()
+        self.fetches = 0
+        self.hits = 0
+
+    def peek(self, url: str) -> Optional[MemoizedPage]:
+        """Çekilmiş sayfayı döndür (yoksa None, çekim yapmaz)"""
+        with self._lock:
+            return self._pages.get(url)
+
+    def get_or_fetch(self, url: str, fetch: Callable[[], requests.Response]) -> MemoizedPage:
+        """
+        Sayfayı hafızadan al, yoksa bir kez çek
+
+        Args:
+            url: Sayfa URL'si
+            fetch: HTTP isteğini yapan fonksiyon
+
+        Returns:
+            MemoizedPage (çekim hatası error alanında)
+        """
+        with self._lock:
+            page = self._pages.get(url)
+            if page is not None:
+                self.hits += 1
+                return page
+        return self._flight.do(url, lambda: self._load(url, fetch))
+
+    def _load(self, url: str, fetch: Callable[[], requests.Response]) -> MemoizedPage:
+        with self._lock:
+            page = self._pages.get(url)
+            if page is not None:
+                self.hits += 1
+                return page
+            self.fetches += 1
+        try:
+            page = MemoizedPage(response=fetch())
+        except (DeadlineExceeded, requests.Timeout) as e:
+            # Süre kaynaklı hatalar saklanmaz: motorun daha kısa tedarikçi deadline'ında
+            # zaman aşımına uğrayan sayfa, istek bütçesinde vakit varken yeniden çekilebilir
+            return MemoizedPage(error=e)
+        except Exception as e:
+            page = MemoizedPage(error=e)
+        with self._lock:
+            self._pages[url] = page
+        return page
+
+    def stats(self) -> Dict:
+        """Hafıza istatistikleri"""
+        with self._lock:
+            return {'pages': len(self._pages), 'fetches': self.fetches, 'hits': self.hits}
+
+
+_current_memo: contextvars.ContextVar = contextvars.ContextVar('page_memo', default=None)
+
+
+def current_page_memo() -> Optional[PageMemo]:
+    """Geçerli bağlamdaki sayfa hafızası (yoksa None)"""
+    return _current_memo.get()
+
+
+@contextmanager
+def page_memo_scope() -> Iterator[PageMemo]:
+    """Blok süresince yeni bir sayfa hafızası kullan (bağlam kopyalarıyla paylaşılır)"""
+    memo = PageMemo()
+    token = _current_memo.set(memo)
+    try:
+        yield memo
+    finally:
+        _current_memo.reset(token)
+
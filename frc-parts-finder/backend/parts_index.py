@@ -0,0 +1,457 @@
+"""
+FRC parça veritabanı indeksi
+FRC_PARTS_DATABASE import sırasında bir kez derlenir: takma adları çözülmüş anahtar haritası, kelime -> parça posting listeleri ve yazım hatası toleranslı trigram indeksi
+"""
+
+import ast
+import inspect
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Mapping, NamedTuple, Optional, Set, Tuple
+
+import frc_parts_db
+from frc_parts_db import FRC_PARTS_DATABASE
+
+# Kısmi eşleşme önbelleğindeki en fazla sorgu
+RESOLVE_CACHE_SIZE = 1024
+
+# Sorgu kelimesinin içinde geçerek eşleşebilecek en kısa anahtar kelimesi. Takma adlardaki
+# "2" gibi kısa kelimeler her parça numarasının içinde geçer ("rev-21-1650" -> "pigeon 2").
+# Bu yönde yalnızca parça anahtarlarının kelimeleri aranır; takma adlar ("rev encoder") birebir eşleşir
+MIN_FRAGMENT_LENGTH = 3
+
+# Yazım hatası eşleşmesi için en düşük güven (1 - düzenleme mesafesi / uzunluk)
+FUZZY_MIN_CONFIDENCE = 0.75
+
+# Trigram benzerliğine göre düzenleme mesafesi hesaplanacak en fazla aday
+FUZZY_CANDIDATES = 8
+
+# Yazım hatası düzeltilecek en kısa kelime. Kısa kelimelerde tek düzenleme başka
+# bir gerçek kelimeye götürür ("bolt" -> "belt", "cube" -> "tube"), tahmin güvenilmez
+FUZZY_MIN_WORD_LENGTH = 5
+
+
+class PartMatch(NamedTuple):
+    """Sorgunun eşleştiği parça"""
+    key: str                # Parça anahtarı (takma ad çözülmüş)
+    parts: List[Dict]       # Parça listesi
+    confidence: float       # 1.0 tam/kısmi eşleşme, altı yazım hatası düzeltmesi
+    fuzzy: bool             # Yazım hatası toleranslı eşleşme mi
+
+
+class PartsIndexError(ValueError):
+    """Parça veritabanı derlenemedi (yinelenen anahtar, çözülemeyen takma ad...)"""
+
+
+def find_duplicate_keys(module=frc_parts_db, name: str = 'FRC_PARTS_DATABASE') -> List[Tuple[str, int, int]]:
+    """
+    Sözlük literal'inde birden fazla yazılmış anahtarları bul
+
+    Python yinelenen anahtarda sessizce son değeri tutar; bu yüzden kontrol
+    kaynak kod üzerinden yapılır.
+
+    Args:
+        module: Sözlüğü tanımlayan modül
+        name: Sözlük değişkeninin adı
+
+    Returns:
+        (anahtar, ilk satır, tekrar satırı) listesi (kaynak okunamazsa boş)
+    """
+    try:
+        tree = ast.parse(inspect.getsource(module))
+    except (OSError, TypeError):
+        return []
+
+    duplicates = []
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.Assign) and isinstance(node.value, ast.Dict)):
+            continue
+        if not any(isinstance(target, ast.Name) and target.id == name for target in node.targets):
+            continue
+        first_seen: Dict[str, int] = {}
+        for key in node.value.keys:
+            if not (isinstance(key, ast.Constant) and isinstance(key.value, str)):
+                continue
+            if key.value in first_seen:
+                duplicates.append((key.value, first_seen[key.value], key.lineno))
+            else:
+                first_seen[key.value] = key.lineno
+    return duplicates
+
+
+def _substrings(word: str, max_length: Optional[int] = None, min_length: int = 1) -> Set[str]:
+    """Kelimenin min_length..max_length uzunluklu alt dizeleri (max_length verilmezse tümü)"""
+    longest = len(word) if max_length is None else min(max_length, len(word))
+    return {
+        word[start:start + length]
+        for length in range(min_length, longest + 1) for start in range(len(word) - length + 1)
+    }
+
+
+def compact(text: str) -> str:
+    """Boşluk ve tireleri kaldır ("talon srx" / "talonsrx" / "talon-srx" aynı olur)"""
+    return ''.join(char for char in text.lower() if char not in ' -_')
+
+
+def digits(text: str) -> str:
+    """Metindeki rakamlar ("kraken x60" -> "60")"""
+    return ''.join(char for char in text if char.isdigit())
+
+
+def trigrams(text: str) -> Set[str]:
+    """Kenarları işaretlenmiş metnin trigram'ları ("neo" -> {"$ne", "neo", "eo$"})"""
+    padded = f"${text}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(first: str, second: str, max_distance: int) -> int:
+    """
+    Yer değiştirmeli Levenshtein (OSA) mesafesi
+
+    Args:
+        first: Birinci metin
+        second: İkinci metin
+        max_distance: Bu değeri aşan mesafeler için hesaplama erken biter
+
+    Returns:
+        Mesafe (max_distance'ı aşıyorsa max_distance + 1)
+    """
+    if abs(len(first) - len(second)) > max_distance:
+        return max_distance + 1
+    previous2: List[int] = []
+    previous = list(range(len(second) + 1))
+    for i, char in enumerate(first, 1):
+        current = [i] + [0] * len(second)
+        for j, other in enumerate(second, 1):
+            cost = char != other
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and char == second[j - 2] and first[i - 2] == other:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class _TrigramIndex:
+    """
+    Kelimeleri trigram'a göre indeksler, en yakın kelimeyi düzenleme mesafesiyle seçer
+
+    Rakamlar düzeltilmez: model numarası farklı olan kelime yazım hatası
+    değil başka üründür ("falcon 600" -> "falcon 500", "pigeon 3" -> "pigeon").
+    """
+
+    def __init__(self, words):
+        self.words: Tuple[str, ...] = tuple(sorted(set(words)))
+        postings: Dict[str, List[int]] = {}
+        for word_id, word in enumerate(self.words):
+            for gram in trigrams(word):
+                postings.setdefault(gram, []).append(word_id)
+        self._postings: Mapping[str, Tuple[int, ...]] = MappingProxyType(
+            {gram: tuple(ids) for gram, ids in postings.items()}
+        )
+
+    def closest(self, text: str, min_confidence: float = FUZZY_MIN_CONFIDENCE) -> Optional[Tuple[str, float]]:
+        """
+        Metne en yakın kelime
+
+        Returns:
+            (kelime, güven) (yeterince yakın kelime yoksa None)
+        """
+        shared: Dict[int, int] = {}
+        for gram in trigrams(text):
+            for word_id in self._postings.get(gram, ()):
+                shared[word_id] = shared.get(word_id, 0) + 1
+        text_digits = digits(text)
+        candidates = sorted(
+            (word_id for word_id in shared if digits(self.words[word_id]) == text_digits),
+            key=lambda word_id: (-shared[word_id], self.words[word_id])
+        )
+
+        best: Optional[Tuple[str, float]] = None
+        for word_id in candidates[:FUZZY_CANDIDATES]:
+            word = self.words[word_id]
+            length = max(len(word), len(text))
+            max_distance = int(length * (1 - min_confidence))
+            distance = edit_distance(text, word, max_distance)
+            if distance > max_distance:
+                continue
+            confidence = 1 - distance / length
+            if best is None or confidence > best[1]:
+                best = (word, confidence)
+        return best
+
+
+class PartsIndex:
+    """
+    Parça veritabanının değişmez indeksi
+
+    Her anahtar (takma adlar dahil) kelimelerine ayrılır. Sorgu kelimesi
+    bir anahtar kelimesiyle eşleşir: biri diğerinin içinde geçiyorsa
+    ("spark" -> "spark max", "neo550" -> "neo"). Anahtar kelimelerinin tüm
+    alt dizeleri önceden indekslendiğinden eşleşen anahtarlar tarama
+    yapmadan sözlük aramaları ve posting listesi kesişimiyle bulunur.
+    Birden fazla anahtar eşleşirse sonuç dict sırasına değil puana göre
+    seçilir: tam kelime eşleşmesi, önek eşleşmesi, anahtardaki eşleşmeyen
+    kelime sayısı ve son olarak anahtarın kendisi.
+    """
+
+    def __init__(self, database: Mapping[str, object], duplicates: Optional[List[Tuple[str, int, int]]] = None):
+        """
+        Args:
+            database: Anahtar -> parça listesi veya başka anahtarın adı (takma ad)
+            duplicates: find_duplicate_keys sonucu (varsa derleme hatası)
+
+        Raises:
+            PartsIndexError: Yinelenen anahtar, çözülemeyen veya döngüsel takma ad
+        """
+        if duplicates:
+            details = ', '.join(f"'{key}' (satır {first} ve {again})" for key, first, again in duplicates)
+            raise PartsIndexError(f"Parça veritabanında yinelenen anahtar: {details}")
+
+        parts: Dict[str, Tuple[Dict, ...]] = {}
+        for key, value in database.items():
+            if isinstance(value, list):
+                parts[key.lower()] = tuple(value)
+
+        key_map: Dict[str, str] = {}
+        for key in database:
+            key_map[key.lower()] = self._resolve_alias(database, key)
+
+        self._parts: Mapping[str, Tuple[Dict, ...]] = MappingProxyType(parts)
+        self.key_map: Mapping[str, str] = MappingProxyType(key_map)
+
+        # Anahtar kelimeleri: tam kelime -> anahtarlar, alt dize -> kelimeler
+        keys = tuple(sorted(key_map))
+        self._keys = keys
+        self._key_words: Tuple[Tuple[str, ...], ...] = tuple(tuple(key.split()) for key in keys)
+        postings: Dict[str, Set[int]] = {}
+        for key_id, words in enumerate(self._key_words):
+            for word in words:
+                postings.setdefault(word, set()).add(key_id)
+        self._postings: Mapping[str, FrozenSet[int]] = MappingProxyType(
+            {word: frozenset(ids) for word, ids in postings.items()}
+        )
+        # Sorgu kelimesinin içinde aranabilecek anahtar kelimeleri (parça anahtarlarından, kısa olmayan)
+        self._fragment_words: FrozenSet[str] = frozenset(
+            word for key_id, words in enumerate(self._key_words) if key_map[keys[key_id]] == keys[key_id]
+            for word in words if len(word) >= MIN_FRAGMENT_LENGTH
+        )
+        # Sorgu kelimesinin bundan uzun parçaları hiçbir anahtar kelimesi olamaz
+        self._max_word_length = max((len(word) for word in self._fragment_words), default=0)
+        containing: Dict[str, Set[str]] = {}
+        for word in self._postings:
+            for fragment in _substrings(word):
+                containing.setdefault(fragment, set()).add(word)
+        self._containing: Mapping[str, FrozenSet[str]] = MappingProxyType(
+            {fragment: frozenset(words) for fragment, words in containing.items()}
+        )
+        self._resolve_partial = lru_cache(maxsize=RESOLVE_CACHE_SIZE)(self._best_partial_match)
+
+        # Yazım hatası toleransı: boşluksuz anahtarlar ve tek tek anahtar kelimeleri
+        compact_keys: Dict[str, str] = {}
+        for key in keys:
+            compact_keys.setdefault(compact(key), key)
+        self._compact_keys: Mapping[str, str] = MappingProxyType(compact_keys)
+        self._fuzzy_keys = _TrigramIndex(compact_keys)
+        self._fuzzy_words = _TrigramIndex(self._postings)
+        self._lookup_fuzzy = lru_cache(maxsize=RESOLVE_CACHE_SIZE)(self._fuzzy_match)
+
+    @staticmethod
+    def _resolve_alias(database: Mapping[str, object], key: str) -> str:
+        """Takma ad zincirini parça listesi olan anahtara kadar izle"""
+        seen = [key]
+        value = database[key]
+        while isinstance(value, str):
+            if value not in database:
+                raise PartsIndexError(f"Takma ad '{seen[-1]}' olmayan anahtarı gösteriyor: '{value}'")
+            if value in seen:
+                raise PartsIndexError(f"Döngüsel takma ad: {' -> '.join(seen + [value])}")
+            seen.append(value)
+            value = database[value]
+        if not isinstance(value, list):
+            raise PartsIndexError(f"'{seen[-1]}' anahtarının değeri liste veya takma ad olmalı")
+        return seen[-1].lower()
+
+    @property
+    def part_keys(self) -> List[str]:
+        """Parça listesi olan (takma ad olmayan) anahtarlar"""
+        return list(self._parts)
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        """
+        Anahtarın (veya takma adın) parça listesi
+
+        Args:
+            key: Veritabanı anahtarı
+
+        Returns:
+            Parçalar (anahtar yoksa None)
+        """
+        part_key = self.key_map.get(key.strip().lower())
+        return list(self._parts[part_key]) if part_key else None
+
+    def resolve(self, query: str, fuzzy: bool = False) -> Optional[List[Dict]]:
+        """
+        Kullanıcının sorgusunu veritabanındaki parça ile eşleştir
+
+        Args:
+            query: Arama terimi
+            fuzzy: Eşleşme yoksa yazım hatası toleranslı eşleşme dene
+
+        Returns:
+            Parçalar (eşleşme yoksa None)
+        """
+        match = self.lookup(query, fuzzy)
+        return match.parts if match else None
+
+    def lookup(self, query: str, fuzzy: bool = True) -> Optional[PartMatch]:
+        """
+        Sorguyu parçayla eşleştir ve eşleşmenin güvenini döndür
+
+        Sıra: anahtar/takma ad, tüm sorgu kelimelerinin eşleştiği en iyi
+        anahtar, son olarak (fuzzy ise) yazım hatası düzeltmesi.
+
+        Args:
+            query: Arama terimi
+            fuzzy: Yazım hatası toleranslı eşleşme dene
+
+        Returns:
+            PartMatch (eşleşme yoksa None)
+        """
+        words = tuple(query.lower().split())
+        if not words:
+            return None
+        part_key = self.key_map.get(' '.join(words)) or self._resolve_partial(words)
+        if part_key:
+            return PartMatch(part_key, list(self._parts[part_key]), 1.0, False)
+        if not fuzzy:
+            return None
+        found = self._lookup_fuzzy(words)
+        if found is None:
+            return None
+        part_key, confidence = found
+        return PartMatch(part_key, list(self._parts[part_key]), confidence, True)
+
+    def _fuzzy_match(self, words: Tuple[str, ...]) -> Optional[Tuple[str, float]]:
+        """
+        Yazım hatalı sorgu için en yakın parça
+
+        İki yol denenir, güveni yüksek olan seçilir:
+        - Boşluksuz sorgu boşluksuz anahtarlarla karşılaştırılır ("sparkmx" -> "sparkmax")
+        - Hiçbir anahtar kelimesiyle eşleşmeyen kelimeler en yakın anahtar
+          kelimesine düzeltilir ve sorgu yeniden çözülür ("krakn x60" -> "kraken x60")
+
+        Returns:
+            (parça anahtarı, güven) (yeterince yakın parça yoksa None)
+        """
+        best: Optional[Tuple[str, float]] = None
+
+        text = compact(' '.join(words))
+        key = self._compact_keys.get(text)
+        if key is not None:
+            return self.key_map[key], 1.0
+        if len(text) >= FUZZY_MIN_WORD_LENGTH:
+            closest = self._fuzzy_keys.closest(text)
+            if closest is not None:
+                best = (self.key_map[self._compact_keys[closest[0]]], closest[1])
+
+        corrected, confidence = [], 1.0
+        for word in words:
+            if self._matching_words(word):
+                corrected.append(word)
+                continue
+            closest = self._fuzzy_words.closest(word) if len(word) >= FUZZY_MIN_WORD_LENGTH else None
+            if closest is None:
+                corrected = None
+                break
+            corrected.append(closest[0])
+            confidence = min(confidence, closest[1])
+        if corrected and (best is None or confidence > best[1]):
+            corrected_words = tuple(corrected)
+            part_key = self.key_map.get(' '.join(corrected_words)) or self._resolve_partial(corrected_words)
+            if part_key:
+                best = (part_key, confidence)
+
+        return best
+
+    def matches(self, query: str) -> List[str]:
+        """
+        Sorguyla eşleşen parça anahtarları, en iyiden kötüye
+
+        Args:
+            query: Arama terimi
+
+        Returns:
+            Parça anahtarları (takma adlar hedeflerine çözülmüş, tekrarsız)
+        """
+        words = tuple(query.lower().split())
+        if not words:
+            return []
+        ranked, seen = [], set()
+        for key_id in self._ranked_keys(words):
+            part_key = self.key_map[self._keys[key_id]]
+            if part_key not in seen:
+                seen.add(part_key)
+                ranked.append(part_key)
+        return ranked
+
+    def _best_partial_match(self, words: Tuple[str, ...]) -> Optional[str]:
+        ranked = self._ranked_keys(words)
+        return self.key_map[self._keys[ranked[0]]] if ranked else None
+
+    def _ranked_keys(self, words: Tuple[str, ...]) -> List[int]:
+        """Tüm sorgu kelimelerinin eşleştiği anahtarlar, puana göre sıralı"""
+        # Yalnızca kısa kelimelerden oluşan sorgu ("2", "x 2") bir parçayı tek başına belirleyemez
+        if all(len(word) < MIN_FRAGMENT_LENGTH for word in words):
+            return []
+        candidates: Optional[Set[int]] = None
+        for word in sorted(set(words), key=len, reverse=True):
+            ids = set()
+            for key_word in self._matching_words(word):
+                ids |= self._postings[key_word]
+            candidates = ids if candidates is None else candidates & ids
+            if not candidates:
+                return []
+        return sorted(candidates, key=lambda key_id: self._rank(key_id, words))
+
+    def _matching_words(self, word: str) -> Set[str]:
+        """
+        Sorgu kelimesiyle eşleşen anahtar kelimeleri (biri diğerinin içinde geçiyor)
+
+        Sorgu kelimesinin içinde geçen anahtar kelimeleri en az
+        MIN_FRAGMENT_LENGTH uzunlukta bir parça anahtarı kelimesi olmalı;
+        kısa kelimeler ve takma ad kelimeleri yalnızca birebir eşleşir.
+        """
+        matched = set(self._containing.get(word, ()))
+        matched.update(
+            fragment for fragment in _substrings(word, self._max_word_length, MIN_FRAGMENT_LENGTH)
+            if fragment in self._fragment_words
+        )
+        return matched
+
+    def _rank(self, key_id: int, words: Tuple[str, ...]) -> Tuple:
+        key_words = self._key_words[key_id]
+        exact = sum(1 for word in words if word in key_words)
+        prefix = sum(1 for word in words if any(key_word.startswith(word) for key_word in key_words))
+        unmatched = sum(
+            1 for key_word in key_words
+            if not any(word in key_word or key_word in word for word in words)
+        )
+        return (-exact, -prefix, unmatched, len(self._keys[key_id]), self._keys[key_id])
+
+
+# Veritabanı import sırasında bir kez derlenir; yinelenen anahtar burada hata verir
+PARTS_INDEX = PartsIndex(FRC_PARTS_DATABASE, find_duplicate_keys())
+
+
+if __name__ == "__main__":
+    print(f"📦 {len(PARTS_INDEX.part_keys)} parça, {len(PARTS_INDEX.key_map)} anahtar")
+    for sample in ['neo', 'Kraken X60', 'spark', '550', 'falcon', 'talon', 'pigeon imu', 'zzz']:
+        result = PARTS_INDEX.resolve(sample)
+        print(f"{sample!r:14} -> {PARTS_INDEX.matches(sample)[:3]} "
+              f"({len(result) if result else 0} sonuç)")
+    print("-" * 50)
+    for sample in ['sparkmx', 'krakn x60', 'talonsrx', 'limelite', 'cancodr', 'nio', 'qwerty']:
+        match = PARTS_INDEX.lookup(sample)
+        print(f"{sample!r:14} -> " + (f"{match.key} (güven {match.confidence:.2f})" if match else "eşleşme yok"))
@@ -0,0 +1,210 @@
+"""
+Domain başına token-bucket hız sınırlayıcı
+Thread-safe, bekleme kilit dışında yapılır; 429/503 yanıtlarında hız otomatik düşer
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Tedarikçi bazında (saniyede istek, burst) değerleri
+VENDOR_RATE_LIMITS = {
+    'www.revrobotics.com': (2.0, 4),
+    'wcproducts.com': (2.0, 4),
+    'andymark.com': (1.0, 2),
+    'www.andymark.com': (1.0, 2),
+    'store.ctr-electronics.com': (1.0, 2),
+}
+DEFAULT_RATE_LIMIT = (2.0, 2)
+
+# Hata yanıtlarında hız en fazla bu orana kadar düşürülür
+MIN_RATE_FRACTION = 0.05
+BACKOFF_FACTOR = 0.5
+RECOVERY_FACTOR = 1.25
+THROTTLE_STATUSES = (429, 503)
+
+
+class TokenBucket:
+    """
+    Tek bir domain için token bucket
+
+    Her istek bir token harcar; token'lar saniyede `rate` kadar, en fazla
+    `burst` adede kadar dolar. reserve() token'ı hemen ayırır ve çağıranın
+    ne kadar beklemesi gerektiğini döndürür, böylece kilit uyurken tutulmaz.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+        self.requests = 0
+        self.delayed = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.throttled = 0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, now: float, max_wait: Optional[float] = None) -> Optional[float]:
+        """
+        Bir token ayır ve gereken bekleme süresini döndür
+
+        Args:
+            now: Şu anki zaman (monotonic)
+            max_wait: Bekleme bu süreye ulaşacaksa token ayrılmaz
+
+        Returns:
+            Bekleme süresi (max_wait aşılıyorsa None - bucket değişmez)
+        """
+        self._refill(now)
+        wait = max(0.0, (1 - self.tokens) / self.rate, self.blocked_until - now)
+        if max_wait is not None and wait > 0 and wait >= max_wait:
+            # Reddedilen istek token borcu bırakmaz; sonraki isteklerin beklemesi büyümez
+            self.rejected += 1
+            return None
+        self.tokens -= 1
+
+        self.requests += 1
+        if wait > 0:
+            self.delayed += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+        return wait
+
+    def backoff(self, now: float, retry_after: Optional[float] = None):
+        """Hız sınırı yanıtı alındı - hızı düşür"""
+        self.throttled += 1
+        self.rate = max(self.base_rate * MIN_RATE_FRACTION, self.rate * BACKOFF_FACTOR)
+        if retry_after:
+            self.blocked_until = max(self.blocked_until, now + retry_after)
+
+    def recover(self):
+        """Başarılı yanıt - hızı kademeli olarak temel değere döndür"""
+        if self.rate < self.base_rate:
+            self.rate = min(self.base_rate, self.rate * RECOVERY_FACTOR)
+
+
+class RateLimiter:
+    """
+    Domain bazında token bucket'ları yöneten paylaşılan sınırlayıcı
+
+    Farklı domainler birbirini beklemez; aynı domaine giden eşzamanlı
+    istekler sırayla token ayırır ve her biri kendi bekleme süresini
+    kilit dışında uyur.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[float, int]]] = None,
+                 default_limit: Tuple[float, int] = DEFAULT_RATE_LIMIT):
+        """
+        Args:
+            limits: Domain -> (saniyede istek, burst)
+            default_limit: Listede olmayan domainler için (saniyede istek, burst)
+        """
+        self.limits = dict(VENDOR_RATE_LIMITS if limits is None else limits)
+        self.default_limit = default_limit
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, domain: str, rate: float, burst: int):
+        """Domain için hız ve burst değerini ayarla"""
+        with self._lock:
+            self.limits[domain] = (rate, burst)
+            self._buckets[domain] = TokenBucket(rate, burst)
+
+    def _bucket(self, domain: str, default_rate: Optional[float]) -> TokenBucket:
+        bucket = self._buckets.get(domain)
+        if bucket is None:
+            if domain in self.limits:
+                rate, burst = self.limits[domain]
+            elif default_rate:
+                rate, burst = default_rate, 1
+            else:
+                rate, burst = self.default_limit
+            bucket = TokenBucket(rate, burst)
+            self._buckets[domain] = bucket
+        return bucket
+
+    def reserve(self, domain: str, default_rate: Optional[float] = None,
+                max_wait: Optional[float] = None) -> Optional[float]:
+        """
+        Domain için bir istek hakkı ayır (beklemeden)
+
+        Args:
+            domain: İstek yapılacak domain
+            default_rate: Domain ayarlı değilse kullanılacak hız (saniyede istek)
+            max_wait: Gereken bekleme bu süreye ulaşırsa hak ayrılmaz (ör. kalan deadline)
+
+        Returns:
+            İstekten önce beklenmesi gereken süre (saniye) - max_wait aşılıyorsa None
+        """
+        with self._lock:
+            return self._bucket(domain, default_rate).reserve(time.monotonic(), max_wait)
+
+    def acquire(self, domain: str, default_rate: Optional[float] = None) -> float:
+        """İstek hakkı ayır ve gerekiyorsa bekle; beklenen süreyi döndür"""
+        wait = self.reserve(domain, default_rate)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, domain: str, default_rate: Optional[float] = None) -> float:
+        """acquire() ile aynı, event loop'u bloklamadan bekler"""
+        wait = self.reserve(domain, default_rate)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def record_response(self, domain: str, status_code: int, retry_after: Optional[str] = None):
+        """
+        Yanıt durumuna göre hızı uyarla
+
+        Args:
+            domain: Yanıtın geldiği domain
+            status_code: HTTP durum kodu
+            retry_after: Retry-After başlığı (saniye cinsinden ise uygulanır)
+        """
+        with self._lock:
+            bucket = self._buckets.get(domain)
+            if bucket is None:
+                return
+            if status_code in THROTTLE_STATUSES:
+                delay = None
+                if retry_after:
+                    try:
+                        delay = float(retry_after)
+                    except ValueError:
+                        delay = None
+                bucket.backoff(time.monotonic(), delay)
+                logger.warning(f"{domain} returned {status_code}, rate lowered to {bucket.rate:.2f} req/s")
+            elif status_code < 400:
+                bucket.recover()
+
+    def stats(self) -> Dict:
+        """Domain bazında bekleme istatistikleri"""
+        with self._lock:
+            return {
+                domain: {
+                    'rate': round(bucket.rate, 3),
+                    'base_rate': bucket.base_rate,
+                    'burst': bucket.burst,
+                    'requests': bucket.requests,
+                    'delayed': bucket.delayed,
+                    'rejected': bucket.rejected,
+                    'throttled': bucket.throttled,
+                    'total_wait_seconds': round(bucket.total_wait, 3),
+                    'avg_wait_seconds': round(bucket.total_wait / bucket.requests, 3) if bucket.requests else 0.0,
+                    'max_wait_seconds': round(bucket.max_wait, 3)
+                }
+                for domain, bucket in self._buckets.items()
+            }
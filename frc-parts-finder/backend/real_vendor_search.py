@@ -5,24 +5,32 @@ WCP, REV, AndyMark, CTRE siteleri için optimize edilmiş
 
 import requests
 import re
-import json
-import time
-from urllib.parse import urljoin, urlparse, quote
+from urllib.parse import urljoin, quote
 from typing import List, Dict, Optional, Tuple
 import logging
 
+from http_client import HttpClient, get_http_client
+from json_ld_extract import extract_product_json_ld
+from page_document import page_document
+from page_fetcher import get_page_fetcher
+from sitemap_index import get_sitemap_index
+from vendor_tasks import RequestFailureTracker, run_vendor_searches
+
 logger = logging.getLogger(__name__)
 
 class RealVendorSearchEngine:
-    def __init__(self, rate_limit_delay: float = 1.0):
+    def __init__(self, rate_limit_delay: float = 1.0, http_client: Optional[HttpClient] = None):
         """
         Gerçek FRC tedarikçi arama motoru
         
         Args:
-            rate_limit_delay: Domain başına istekler arası bekleme süresi (saniye)
+            rate_limit_delay: Hız ayarı olmayan domainler için istekler arası bekleme süresi (saniye)
+            http_client: Paylaşılan HTTP istemcisi (verilmezse süreç geneli istemci kullanılır)
         """
         self.rate_limit_delay = rate_limit_delay
-        self.last_request_time = {}
+        self.failures = RequestFailureTracker()
+        self.http = http_client or get_http_client()
+        self.pages = get_page_fetcher()
         
         self.headers = {
             'User-Agent': (
@@ -68,31 +76,18 @@ class RealVendorSearchEngine:
             }
         }
 
-    def _rate_limit(self, domain: str):
-        """Domain başına rate limiting"""
-        if domain in self.last_request_time:
-            elapsed = time.time() - self.last_request_time[domain]
-            if elapsed < self.rate_limit_delay:
-                time.sleep(self.rate_limit_delay - elapsed)
-        self.last_request_time[domain] = time.time()
-
-    def _make_request(self, url: str, timeout: int = 10, params: Dict = None) -> Optional[requests.Response]:
+    def _make_request(self, url: str, timeout: Optional[float] = None,
+                      params: Dict = None) -> Optional[requests.Response]:
         """Rate-limited HTTP request"""
         try:
-            domain = urlparse(url).netloc
-            self._rate_limit(domain)
-            
-            response = requests.get(
-                url, 
-                headers=self.headers, 
-                timeout=timeout,
-                params=params,
-                allow_redirects=True
-            )
+            # Domain başına hız sınırı paylaşılan istemcide uygulanır
+            response = self.http.get(url, headers=self.headers, timeout=timeout, params=params,
+                                     rate=1.0 / self.rate_limit_delay if self.rate_limit_delay else None)
             response.raise_for_status()
             return response
         except Exception as e:
             logger.warning(f"Request failed for {url}: {e}")
+            self.failures.record()
             return None
 
     def search_wcp(self, query: str) -> List[Dict]:
@@ -124,13 +119,9 @@ class RealVendorSearchEngine:
                 links = re.findall(r'href=\"(\/products\/[^\"]+)\"', html)
                 product_urls = [urljoin('https://wcproducts.com', u) for u in links]
             
-            results = []
-            for full_url in product_urls[:10]:  # İlk 10 ürün
-                product_info = self._extract_wcp_product(full_url)
-                if product_info:
-                    results.append(product_info)
-            
-            return results
+            # İlk 10 ürün (host başına sınırlı paralel, sıra korunur)
+            products = self.pages.map(self._extract_wcp_product, product_urls[:10])
+            return [product for product in products if product]
             
         except Exception as e:
             logger.error(f"WCP search failed: {e}")
@@ -139,29 +130,20 @@ class RealVendorSearchEngine:
     def search_rev(self, query: str) -> List[Dict]:
         """REV Robotics arama"""
         try:
-            # REV: search sayfası 404 verebilir; sitemap.xml deterministik
-            sitemap_url = "https://www.revrobotics.com/sitemap.xml"
-            response = self._make_request(sitemap_url)
-            if not response:
+            # REV: search sayfası 404 verebilir; sitemap.xml deterministik.
+            # Ürün URL'leri genelde /rev-xx-xxxx/ şeklinde; sitemap önbellekte indekslenir
+            index = get_sitemap_index(
+                "https://www.revrobotics.com/sitemap.xml", r'^https://www\.revrobotics\.com/[a-z0-9\-]+/$',
+                headers=self.headers
+            )
+            if not index.ensure_loaded():
+                self.failures.record()
                 return []
-            sm = response.text
-            # Ürün URL'leri genelde /rev-xx-xxxx/ şeklinde
-            urls = re.findall(r"<loc>(https:\/\/www\.revrobotics\.com\/[a-z0-9\-]+\/)<\/loc>", sm, re.IGNORECASE)
-            # Sorgu kelimelerini URL'de arayalım (basit filtre)
-            tokens = [t for t in re.split(r"\s+", query.strip()) if t]
-            def token_match(u: str) -> bool:
-                ul = u.lower()
-                return all(t.lower() in ul for t in tokens)
-            candidate_urls = [u for u in urls if token_match(u)]
-            candidate_urls = candidate_urls[:12]
-            
-            results = []
-            for full_url in candidate_urls:
-                product_info = self._extract_rev_product(full_url)
-                if product_info:
-                    results.append(product_info)
-            
-            return results
+            # Tüm sorgu kelimelerini URL'de içerenler (indeks kesişimi)
+            candidate_urls = index.lookup(query, match_all=True, limit=12)
+            
+            products = self.pages.map(self._extract_rev_product, candidate_urls)
+            return [product for product in products if product]
             
         except Exception as e:
             logger.error(f"REV search failed: {e}")
@@ -181,14 +163,9 @@ class RealVendorSearchEngine:
             html = response.text
             product_links = re.findall(r'href=\"(https?:\/\/andymark\.com[^\"]*|\/products\/[^\"]*)\"', html)
             
-            results = []
-            for link in product_links[:10]:  # İlk 10 ürün
-                full_url = urljoin('https://andymark.com', link)
-                product_info = self._extract_andymark_product(full_url)
-                if product_info:
-                    results.append(product_info)
-            
-            return results
+            product_urls = [urljoin('https://andymark.com', link) for link in product_links[:10]]  # İlk 10 ürün
+            products = self.pages.map(self._extract_andymark_product, product_urls)
+            return [product for product in products if product]
             
         except Exception as e:
             logger.error(f"AndyMark search failed: {e}")
@@ -208,14 +185,9 @@ class RealVendorSearchEngine:
             html = response.text
             product_links = re.findall(r'href=\"(https?:\/\/store\.ctr-electronics\.com[^\"]*|\/products\/[^\"]*)\"', html)
             
-            results = []
-            for link in product_links[:10]:  # İlk 10 ürün
-                full_url = urljoin('https://store.ctr-electronics.com', link)
-                product_info = self._extract_ctre_product(full_url)
-                if product_info:
-                    results.append(product_info)
-            
-            return results
+            product_urls = [urljoin('https://store.ctr-electronics.com', link) for link in product_links[:10]]  # İlk 10 ürün
+            products = self.pages.map(self._extract_ctre_product, product_urls)
+            return [product for product in products if product]
             
         except Exception as e:
             logger.error(f"CTRE search failed: {e}")
@@ -231,7 +203,7 @@ class RealVendorSearchEngine:
             html = response.text
             
             # JSON-LD Product verisi ara
-            json_ld = self._extract_json_ld(html)
+            json_ld = page_document(url, html).json_ld
             if json_ld:
                 return self._parse_json_ld_product(json_ld, url, 'WCP (West Coast Products)')
             
@@ -252,7 +224,7 @@ class RealVendorSearchEngine:
             html = response.text
             
             # JSON-LD Product verisi ara
-            json_ld = self._extract_json_ld(html)
+            json_ld = page_document(url, html).json_ld
             if json_ld:
                 return self._parse_json_ld_product(json_ld, url, 'REV Robotics')
             
@@ -273,7 +245,7 @@ class RealVendorSearchEngine:
             html = response.text
             
             # JSON-LD Product verisi ara
-            json_ld = self._extract_json_ld(html)
+            json_ld = page_document(url, html).json_ld
             if json_ld:
                 return self._parse_json_ld_product(json_ld, url, 'AndyMark')
             
@@ -294,7 +266,7 @@ class RealVendorSearchEngine:
             html = response.text
             
             # JSON-LD Product verisi ara
-            json_ld = self._extract_json_ld(html)
+            json_ld = page_document(url, html).json_ld
             if json_ld:
                 return self._parse_json_ld_product(json_ld, url, 'CTRE')
             
@@ -307,28 +279,7 @@ class RealVendorSearchEngine:
 
     def _extract_json_ld(self, html: str) -> Optional[Dict]:
         """HTML'den JSON-LD Product verilerini çıkar"""
-        try:
-            pattern = r'<script[^>]+type="application/ld\+json"[^>]*>(.*?)</script>'
-            matches = re.findall(pattern, html, re.DOTALL | re.IGNORECASE)
-            
-            for match in matches:
-                try:
-                    data = json.loads(match.strip())
-                    
-                    if isinstance(data, list):
-                        for item in data:
-                            if item.get('@type') == 'Product':
-                                return item
-                    elif isinstance(data, dict) and data.get('@type') == 'Product':
-                        return data
-                        
-                except json.JSONDecodeError:
-                    continue
-                    
-        except Exception as e:
-            logger.warning(f"Failed to extract JSON-LD: {e}")
-            
-        return None
+        return extract_product_json_ld(html)
 
     def _parse_json_ld_product(self, json_ld: Dict, url: str, vendor: str) -> Dict:
         """JSON-LD Product verisini parse et"""
@@ -454,59 +405,28 @@ class RealVendorSearchEngine:
             logger.warning(f"Failed to parse HTML product: {e}")
             return None
 
-    def search_all_vendors(self, query: str) -> Dict[str, List[Dict]]:
+    def search_all_vendors(self, query: str,
+                           status: Optional[Dict[str, str]] = None,
+                           timeout: Optional[float] = None) -> Dict[str, List[Dict]]:
         """
         Tüm gerçek FRC tedarikçilerinde arama yap
         
         Args:
             query: Arama terimi
+            status: Tedarikçi adı -> 'ok' / 'empty' / 'error' / 'timeout' ile doldurulur (opsiyonel)
+            timeout: Tedarikçi başına süre sınırı (saniye) - tedarikçiler paralel aranır
             
         Returns:
             Tedarikçi bazında sonuçlar
         """
-        all_results = {}
-        
-        # WCP arama
-        try:
-            logger.info(f"Searching WCP for: {query}")
-            wcp_results = self.search_wcp(query)
-            all_results['WCP (West Coast Products)'] = wcp_results
-            logger.info(f"Found {len(wcp_results)} products from WCP")
-        except Exception as e:
-            logger.error(f"Error searching WCP: {e}")
-            all_results['WCP (West Coast Products)'] = []
-        
-        # REV arama
-        try:
-            logger.info(f"Searching REV for: {query}")
-            rev_results = self.search_rev(query)
-            all_results['REV Robotics'] = rev_results
-            logger.info(f"Found {len(rev_results)} products from REV")
-        except Exception as e:
-            logger.error(f"Error searching REV: {e}")
-            all_results['REV Robotics'] = []
-        
-        # AndyMark arama
-        try:
-            logger.info(f"Searching AndyMark for: {query}")
-            andymark_results = self.search_andymark(query)
-            all_results['AndyMark'] = andymark_results
-            logger.info(f"Found {len(andymark_results)} products from AndyMark")
-        except Exception as e:
-            logger.error(f"Error searching AndyMark: {e}")
-            all_results['AndyMark'] = []
-        
-        # CTRE arama
-        try:
-            logger.info(f"Searching CTRE for: {query}")
-            ctre_results = self.search_ctre(query)
-            all_results['CTRE'] = ctre_results
-            logger.info(f"Found {len(ctre_results)} products from CTRE")
-        except Exception as e:
-            logger.error(f"Error searching CTRE: {e}")
-            all_results['CTRE'] = []
-        
-        return all_results
+        tasks = {
+            'WCP (West Coast Products)': lambda: self.search_wcp(query),
+            'REV Robotics': lambda: self.search_rev(query),
+            'AndyMark': lambda: self.search_andymark(query),
+            'CTRE': lambda: self.search_ctre(query),
+        }
+        logger.info(f"Searching all vendors for: {query}")
+        return run_vendor_searches(tasks, self.failures, status, timeout)
 
 
 # Test ve örnek kullanım
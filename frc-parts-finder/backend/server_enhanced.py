@@ -7,7 +7,10 @@ from flask import Flask, jsonify, request
 from flask_cors import CORS
 import requests
 import logging
-from typing import Dict, List, Optional
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from typing import Callable, Dict, List, Optional, Tuple
 
 # Import our new modules
 from shopify_search import ShopifySearchEngine
@@ -15,9 +18,22 @@ from woocommerce_search import WooCommerceSearchEngine
 from json_ld_validator import JSONLDValidator
 from cache_manager import CacheManager
 from simple_vendor_search import SimpleVendorSearch
+from single_flight import SingleFlight
+from http_client import get_http_client
+from deadline import DeadlineExceeded, current_deadline, deadline_scope
+from page_document import page_document
+from page_memo import current_page_memo, page_memo_scope
+from sitemap_index import sitemap_stats
+from catalog_sync import CatalogStore, CatalogSync
+from entity_resolution import ProductGroup, attach_offers, resolve_listings
+from fulltext_index import FULLTEXT_MIN_RESULTS, FullTextIndex
+from sku_index import SkuIndex, looks_like_part_number
+from keyword_matcher import compile_keywords
 
 # Import existing modules
-from frc_parts_db import FRC_PARTS_DATABASE, VENDOR_SEARCH_URLS
+from frc_parts_db import VENDOR_SEARCH_URLS
+from parts_index import PARTS_INDEX, PartMatch
+from suggest_index import SUGGEST_LIMIT, SuggestService, collect_entries
 
 app = Flask(__name__)
 CORS(app)
@@ -27,11 +43,22 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize search engines and cache
-shopify_engine = ShopifySearchEngine(rate_limit_delay=0.5)
-woocommerce_engine = WooCommerceSearchEngine(rate_limit_delay=0.5)
-real_vendor_engine = SimpleVendorSearch(rate_limit_delay=1.0)
+# Tüm motorlar ve URL kontrolleri aynı bağlantı havuzlarını paylaşır
+http_client = get_http_client()
+shopify_engine = ShopifySearchEngine(rate_limit_delay=0.5, http_client=http_client)
+woocommerce_engine = WooCommerceSearchEngine(rate_limit_delay=0.5, http_client=http_client)
+real_vendor_engine = SimpleVendorSearch(rate_limit_delay=1.0, http_client=http_client)
 json_ld_validator = JSONLDValidator()
-cache_manager = CacheManager()
+cache_manager = CacheManager(write_behind=True)
+# Shopify/WooCommerce tedarikçilerinin yerel kataloğu - arama sırasında bu tedarikçilere istek atılmaz
+catalog_store = CatalogStore()
+catalog_sync = CatalogSync(catalog_store, shopify_engine=shopify_engine, woocommerce_engine=woocommerce_engine)
+# Katalog + doğrulanmış sayfa ürünleri üzerinde FTS5 tam metin arama
+fulltext_index = FullTextIndex()
+# Parça numarası (SKU/MPN/GTIN) -> ürün tam eşleşme indeksi
+sku_index = SkuIndex(PARTS_INDEX)
+# Arama kutusu önerileri: parça anahtarları + katalog başlıkları/SKU'lar, aramalarla popülerlik kazanır
+suggest_service = SuggestService(lambda: collect_entries(PARTS_INDEX, catalog_store))
 
 # Default headers for requests
 DEFAULT_HEADERS = {
@@ -41,7 +68,40 @@ DEFAULT_HEADERS = {
         'Chrome/120.0 Safari/537.36'
     )
 }
-REQUEST_TIMEOUT = 8
+
+REAL_VENDOR_NAMES = ['WCP (West Coast Products)', 'REV Robotics', 'AndyMark', 'CTRE']
+
+# Arama önbelleği tazelik süreleri (saniye): soft TTL dolunca sonuç bayat
+# sayılır ve arka planda yenilenir, hard TTL dolana kadar yine de sunulur
+SEARCH_CACHE_TTLS = {
+    'real_vendors': {'soft_ttl': 3600, 'ttl': 24 * 3600},   # 1 saat / 24 saat
+    'shopify': {'soft_ttl': 7200, 'ttl': 24 * 3600},        # 2 saat / 24 saat
+    'woocommerce': {'soft_ttl': 7200, 'ttl': 24 * 3600},    # 2 saat / 24 saat
+}
+
+# Tedarikçi başına arama süre sınırı (saniye) - süresinde bitmeyen tedarikçi 'timeout' raporlanır
+VENDOR_SEARCH_TIMEOUT = 10
+
+# /api/search toplam süre bütçesi (saniye) - frontend 5 sn sonra isteği iptal eder
+DEFAULT_SEARCH_BUDGET = 4.5
+MIN_SEARCH_BUDGET = 0.5
+MAX_SEARCH_BUDGET = 30.0
+# Motorlar kendi tedarikçi görevlerini deadline'da keser; kısmi sonuçlarını
+# teslim edebilmeleri için motor sonucu bu kadar ek süre beklenir
+ENGINE_RESULT_GRACE = 0.25
+
+# Üç arama motoru /api/search içinde paralel çalışır. Motorlar tedarikçi
+# aramalarını vendor_tasks havuzuna gönderdiği için ayrı havuz kullanılır
+# (aynı havuzda iç içe beklemek kilitlenmeye yol açabilir).
+engine_executor = ThreadPoolExecutor(max_workers=6, thread_name_prefix='engine-search')
+
+# Bayat sonuçların arka plan yenilemesi (anahtar başına tek yenileme)
+refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='search-refresh')
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+# Eşzamanlı özdeş aramaları, sayfa çekimlerini ve URL kontrollerini birleştir
+inflight = SingleFlight()
 
 # FRC parça kategorileri ve canonical özellikleri
 FRC_CANONICAL_SPECS = {
@@ -77,28 +137,46 @@ FRC_CANONICAL_SPECS = {
     }
 }
 
-def resolve_query(query: str):
+def resolve_query(query: str) -> Optional[PartMatch]:
     """Kullanıcının sorgusunu veri tabanındaki parça ile eşleştir."""
-    query_lower = query.strip().lower()
-    if not query_lower:
+    # Anahtar/takma ad, kelime indeksinden kısmi eşleşme, son olarak yazım hatası düzeltmesi -
+    # "krakn x60" gibi sorgular tedarikçi taramasına düşmeden yerelde çözülür
+    return PARTS_INDEX.lookup(query, fuzzy=True)
+
+def normalize_query(query: str) -> str:
+    """Sorguyu önbellek ve istek birleştirme anahtarı için normalize et"""
+    return ' '.join(query.lower().split())
+
+def parse_search_budget(value: Optional[str]) -> Optional[float]:
+    """budget sorgu parametresini oku (geçersizse None), sınırlar içine al"""
+    if value is None or value == '':
+        return DEFAULT_SEARCH_BUDGET
+    try:
+        budget = float(value)
+    except ValueError:
         return None
-
-    if query_lower in FRC_PARTS_DATABASE:
-        result = FRC_PARTS_DATABASE[query_lower]
-        if isinstance(result, str):
-            result = FRC_PARTS_DATABASE[result]
-        return result
-
-    # kısmi eşleşme: bütün kelimeler geçsin
-    query_words = query_lower.split()
-    for key, value in FRC_PARTS_DATABASE.items():
-        if isinstance(value, str):
-            continue
-        key_words = key.split()
-        if all(any(qw in kw or kw in qw for kw in key_words) for qw in query_words):
-            return value
-
-    return None
+    if budget != budget:  # NaN
+        return None
+    return min(MAX_SEARCH_BUDGET, max(MIN_SEARCH_BUDGET, budget))
+
+def submit_in_context(executor: ThreadPoolExecutor, fn: Callable, *args) -> Future:
+    """İşi geçerli contextvars bağlamının (deadline dahil) kopyasıyla havuza gönder"""
+    return executor.submit(contextvars.copy_context().run, fn, *args)
+
+def catalog_covered_vendors() -> List[str]:
+    """Kataloğu taze olan Shopify tedarikçileri - arama sırasında sitelerine gidilmez"""
+    if catalog_sync.is_ready('shopify') and not catalog_sync.is_stale('shopify'):
+        return list(catalog_sync.platform_vendors('shopify').values())
+    return []
+
+def engine_vendor_names(source: str) -> List[str]:
+    """Arama kaynağının kapsadığı tedarikçi adları"""
+    if source == 'shopify':
+        return [vendor['name'] for vendor in shopify_engine.shopify_vendors.values()]
+    if source == 'woocommerce':
+        return [vendor['name'] for vendor in woocommerce_engine.woocommerce_vendors.values()]
+    covered = catalog_covered_vendors()
+    return [vendor for vendor in REAL_VENDOR_NAMES if vendor not in covered]
 
 def get_canonical_specs(query: str) -> Optional[Dict]:
     """Sorgu için canonical özellikleri belirle"""
@@ -120,15 +198,29 @@ def is_url_alive(url: str) -> bool:
     if cached_status is not None:
         return cached_status.get('alive', False)
     
-    # URL'yi kontrol et
+    # Sayfa bu arama içinde zaten çekildiyse canlılığı o yanıttan çıkar.
+    # HTTP durumu olmayan çekimler (deadline, zaman aşımı) canlılık hakkında bilgi vermez
+    memo = current_page_memo()
+    page = memo.peek(url) if memo is not None else None
+    if page is not None and page.status_code is not None:
+        cache_manager.set_url_status(url, {'alive': page.alive}, ttl=3600)
+        return page.alive
+    
+    # URL'yi kontrol et - aynı URL için eşzamanlı HEAD istekleri tek istekte birleşir
+    return inflight.do(('alive', url), lambda: check_url_alive(url))
+
+def check_url_alive(url: str) -> bool:
+    """URL'ye HEAD isteği at ve sonucu önbelleğe kaydet"""
     try:
-        response = requests.head(
-            url,
-            allow_redirects=True,
-            timeout=REQUEST_TIMEOUT,
-            headers=DEFAULT_HEADERS,
-        )
+        response = http_client.head(url, headers=DEFAULT_HEADERS)
         alive = response.status_code < 400
+    except DeadlineExceeded:
+        # Süre bütçesi URL hakkında bilgi vermez - durum önbelleğe yazılmaz
+        return False
+    except requests.Timeout:
+        # Kısaltılmış zaman aşımı canlı URL'yi de düşürebilir; bir sonraki arama tekrar dener
+        logger.debug(f"URL check timed out: {url}")
+        return False
     except Exception:
         alive = False
     
@@ -137,89 +229,309 @@ def is_url_alive(url: str) -> bool:
     
     return alive
 
-def search_shopify_vendors(query: str, canonical_specs: Optional[Dict] = None) -> List[Dict]:
-    """Shopify tedarikçilerinde arama yap"""
-    try:
-        # Önbellekten kontrol et
-        cached_results = cache_manager.get_search_results(query, "shopify")
-        if cached_results:
-            return cached_results
-        
-        # Arama yap
-        all_results = shopify_engine.search_all_vendors(query, canonical_specs)
-        
-        # Sonuçları birleştir ve normalize et
-        combined_results = []
-        for vendor_name, products in all_results.items():
-            for product in products:
-                product['vendor'] = vendor_name
-                product['source'] = 'shopify'
-                combined_results.append(product)
+def fetch_product_page(url: str) -> requests.Response:
+    """Ürün sayfasını çek - aynı URL için eşzamanlı istekler tek istekte birleşir"""
+    return inflight.do(
+        ('product', url),
+        lambda: http_client.get(url, headers=DEFAULT_HEADERS)
+    )
+
+def combine_vendor_results(all_results: Dict[str, List[Dict]], source: str) -> List[Dict]:
+    """Tedarikçi bazındaki sonuçları tek listede birleştir ve normalize et"""
+    combined_results = []
+    for vendor_name, products in all_results.items():
+        for product in products:
+            product['vendor'] = vendor_name
+            product['source'] = source
+            combined_results.append(product)
+    return combined_results
+
+def run_engine_search(search_all: Callable[[Dict[str, str]], Dict[str, List[Dict]]],
+                      source: str) -> Tuple[List[Dict], Dict[str, str]]:
+    """
+    Arama motorunu çalıştır, sonuçları ve tedarikçi durumlarını döndür
+    
+    Args:
+        search_all: status sözlüğünü doldurarak search_all_vendors çağıran fonksiyon
+        source: Sonuçlara yazılacak kaynak adı
         
-        # Sonuçları önbelleğe kaydet
-        cache_manager.set_search_results(query, combined_results, "shopify", ttl=7200)  # 2 saat
+    Returns:
+        (birleştirilmiş sonuçlar, tedarikçi adı -> 'ok' / 'empty' / 'error')
+    """
+    vendor_status = {}
+    all_results = search_all(vendor_status)
+    return combine_vendor_results(all_results, source), vendor_status
+
+def refresh_search_cache(cache_vendor: str, query: str,
+                         fetch: Callable[[], Tuple[List[Dict], Dict[str, str]]]) -> Tuple[List[Dict], Dict[str, str]]:
+    """
+    Aramayı tedarikçilerde çalıştır ve sonucu önbelleğe kaydet
+    
+    Aynı motor ve normalize sorgu için eşzamanlı çağrılarda yalnızca bir
+    thread tedarikçilere gider; diğerleri onun sonucunu bekler. Liderin
+    araması süre bütçesi dolduğu için yarıda kaldıysa sonuç önbelleğe
+    yazılmaz ve bekleyenler aramayı kendi bütçeleriyle tekrarlar.
+    
+    Returns:
+        (sonuçlar, tedarikçi durumları)
+    """
+    led = []
+    
+    def run_refresh():
+        led.append(True)
+        return _refresh_search_cache(cache_vendor, query, fetch)
+    
+    results, vendor_status, cut_short = inflight.do(('search', cache_vendor, normalize_query(query)), run_refresh)
+    if cut_short and not led:
+        # Liderin süre bütçesi yetmedi: yarım sonucu paylaşmak yerine kendi bütçemizle ara
+        deadline = current_deadline()
+        if deadline is None or not deadline.expired():
+            results, vendor_status, _ = _refresh_search_cache(cache_vendor, query, fetch)
+    return results, vendor_status
+
+def _refresh_search_cache(cache_vendor: str, query: str,
+                          fetch: Callable[[], Tuple[List[Dict], Dict[str, str]]]) -> Tuple[List[Dict], Dict[str, str], bool]:
+    results, vendor_status = fetch()
+    
+    # İstek bütçesi dolduğu için yarıda kalan arama önbelleğe yazılmaz
+    deadline = current_deadline()
+    if deadline is not None and deadline.expired() and 'timeout' in vendor_status.values():
+        logger.info(f"Not caching {cache_vendor} results for '{query}': search budget ran out")
+        return results, vendor_status, True
+    
+    # Süresi dolan tedarikçi de hata gibi değerlendirilir: kısa süre sonra tekrar denensin
+    vendor_failed = any(status in ('error', 'timeout') for status in vendor_status.values())
+    
+    if not results:
+        # Negatif kayıt: bilinmeyen parça sorguları her seferinde tüm tedarikçileri taramasın
+        reason = 'error' if vendor_failed else 'empty'
+        cache_manager.set_negative_search_result(normalize_query(query), reason, cache_vendor)
+        return results, vendor_status, False
+    
+    ttls = dict(SEARCH_CACHE_TTLS[cache_vendor])
+    if vendor_failed:
+        # Kısmi sonuç: hata veren tedarikçiler kısa süre sonra tekrar denensin
+        ttls['soft_ttl'] = min(ttls['soft_ttl'], cache_manager.negative_ttls['error'])
+    cache_manager.set_search_results(normalize_query(query), results, cache_vendor, **ttls)
+    return results, vendor_status, False
+
+def schedule_search_refresh(cache_vendor: str, query: str,
+                            fetch: Callable[[], Tuple[List[Dict], Dict[str, str]]]):
+    """Bayat arama sonucu için tek bir arka plan yenilemesi planla"""
+    refresh_key = (cache_vendor, normalize_query(query))
+    with _refreshing_lock:
+        if refresh_key in _refreshing:
+            return
+        _refreshing.add(refresh_key)
+    
+    def run_refresh():
+        try:
+            refresh_search_cache(cache_vendor, query, fetch)
+            logger.info(f"♻️ Refreshed stale {cache_vendor} results for: {query}")
+        except Exception as e:
+            logger.warning(f"Background refresh failed for {cache_vendor}/{query}: {e}")
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(refresh_key)
+    
+    refresh_executor.submit(run_refresh)
+
+def cached_vendor_search(cache_vendor: str, query: str,
+                         fetch: Callable[[], Tuple[List[Dict], Dict[str, str]]]) -> Tuple[List[Dict], Dict]:
+    """
+    Stale-while-revalidate ile önbellekli tedarikçi araması
+    
+    Args:
+        cache_vendor: Önbellek anahtarındaki tedarikçi grubu ('shopify', 'woocommerce', 'real_vendors')
+        query: Arama terimi
+        fetch: Önbellek ıskalandığında aramayı yapan fonksiyon - (sonuçlar, tedarikçi durumları) döndürür
         
-        return combined_results
+    Returns:
+        (sonuçlar, tazelik bilgisi)
+    """
+    entry = cache_manager.get_search_entry(normalize_query(query), cache_vendor)
+    # Boş liste de geçerli bir önbellek kaydıdır (negatif kayıt)
+    if entry is not None:
+        if entry['stale']:
+            schedule_search_refresh(cache_vendor, query, fetch)
+        return entry['data'], {
+            'cached': True,
+            'stale': entry['stale'],
+            'age_seconds': int(entry['age']),
+            'negative': entry['negative']
+        }
+    
+    results, vendor_status = refresh_search_cache(cache_vendor, query, fetch)
+    return results, {'cached': False, 'stale': False, 'age_seconds': 0, 'vendor_status': vendor_status}
+
+def merge_freshness(freshness_by_source: Dict[str, Dict]) -> Dict:
+    """Birden fazla kaynağın tazelik bilgisini tek özet halinde birleştir"""
+    return {
+        'cached': any(f.get('cached') for f in freshness_by_source.values()),
+        'stale': any(f.get('stale') for f in freshness_by_source.values()),
+        'age_seconds': max((f.get('age_seconds', 0) for f in freshness_by_source.values()), default=0),
+        'sources': freshness_by_source
+    }
+
+def merge_vendor_status(freshness_by_source: Dict[str, Dict]) -> Dict[str, str]:
+    """Canlı aramalardaki tedarikçi durumlarını tek sözlükte topla (önbellekten gelenlerde yoktur)"""
+    merged = {}
+    for freshness in freshness_by_source.values():
+        merged.update(freshness.get('vendor_status', {}))
+    return merged
+
+def search_catalog(platform: str, query: str, canonical_specs: Optional[Dict] = None) -> Tuple[List[Dict], Dict]:
+    """
+    Platformun tedarikçilerini yerel katalogdan ara (tedarikçiye istek yok)
+    
+    Args:
+        platform: 'shopify' / 'woocommerce'
         
+    Returns:
+        (sonuçlar, tazelik bilgisi - yaş son senkronizasyondan itibaren)
+    """
+    vendor_status = {}
+    all_results = catalog_sync.search(query, canonical_specs, status=vendor_status, platform=platform)
+    return combine_vendor_results(all_results, 'catalog'), {
+        'cached': True,
+        'stale': catalog_sync.is_stale(platform),
+        'age_seconds': int(catalog_sync.age_seconds(platform) or 0),
+        'vendor_status': vendor_status
+    }
+
+def refresh_sku_catalog():
+    """SKU indeksinin katalog kısmını yeniden kur (katalog senkronizasyonu bitince çağrılır)"""
+    sku_index.refresh_catalog(catalog_store)
+
+def seed_sku_index() -> int:
+    """
+    SKU indeksini kalıcı verilerden doldur (sunucu başlarken)
+    
+    Senkronize katalog ve ürün önbelleğindeki süresi dolmamış doğrulanmış
+    ürünler yüklenir; yeniden başlatma sonrası parça numarası aramaları
+    sayfa ürünlerini de bulur.
+    
+    Returns:
+        Yüklenen sayfa ürünü sayısı
+    """
+    refresh_sku_catalog()
+    entries = cache_manager.product_entries()
+    for product, ttl in entries:
+        sku_index.add_page_product(product, ttl=ttl)
+    logger.info(f"SKU index seeded with {len(entries)} cached products")
+    return len(entries)
+
+# SKU indeksinin katalog kısmı istek yolunda değil, her senkronizasyon turundan sonra yeniden kurulur
+catalog_sync.add_listener(refresh_sku_catalog)
+
+def lookup_part_number(query: str) -> List[Dict]:
+    """
+    Parça numarasıyla tam eşleşen ürünler (veritabanı, katalog, doğrulanmış sayfalar)
+    
+    Veritabanı ürünleri için ağ isteği atılmaz; yalnızca önbellekte ölü
+    olarak kayıtlı URL'ler elenir.
+    
+    Returns:
+        Ürünler
+    """
+    results = []
+    for product in sku_index.lookup(query):
+        if product.get('source') == 'database':
+            cached_status = cache_manager.get_url_status(product.get('url'))
+            if cached_status is not None and not cached_status.get('alive', False):
+                continue
+        results.append(product)
+    return results
+
+def search_local_index(query: str, canonical_specs: Optional[Dict] = None) -> List[Dict]:
+    """
+    Yerel tam metin indeksinde ara (katalog ve doğrulanmış sayfa ürünleri, BM25 sıralı)
+    
+    Returns:
+        Ürünler (zorunlu canonical kelimeleri içermeyenler elenir)
+    """
+    try:
+        fulltext_index.refresh_catalog(catalog_store)
+        results = fulltext_index.search(query)
     except Exception as e:
-        logger.error(f"Shopify search failed: {e}")
+        logger.error(f"Local full-text search failed: {e}")
         return []
+    
+    if canonical_specs and canonical_specs.get('must_keywords'):
+        must = compile_keywords(canonical_specs['must_keywords'])
+        results = [
+            product for product in results
+            if must.contains_all(' '.join(str(product.get(field) or '') for field in ('name', 'description', 'sku')).lower())
+        ]
+    return results
 
-def search_woocommerce_vendors(query: str, canonical_specs: Optional[Dict] = None) -> List[Dict]:
-    """WooCommerce tedarikçilerinde arama yap"""
+def search_shopify_vendors(query: str, canonical_specs: Optional[Dict] = None) -> Tuple[List[Dict], Dict]:
+    """Shopify tedarikçilerinde arama yap (katalog hazırsa katalogdan)"""
     try:
-        # Önbellekten kontrol et
-        cached_results = cache_manager.get_search_results(query, "woocommerce")
-        if cached_results:
-            return cached_results
-        
-        # Arama yap
-        all_results = woocommerce_engine.search_all_vendors(query, canonical_specs)
+        if catalog_sync.is_ready('shopify'):
+            return search_catalog('shopify', query, canonical_specs)
         
-        # Sonuçları birleştir ve normalize et
-        combined_results = []
-        for vendor_name, products in all_results.items():
-            for product in products:
-                product['vendor'] = vendor_name
-                product['source'] = 'woocommerce'
-                combined_results.append(product)
+        # İlk senkronizasyon tamamlanana kadar canlı arama
+        return cached_vendor_search(
+            "shopify",
+            query,
+            lambda: run_engine_search(
+                lambda status: shopify_engine.search_all_vendors(
+                    query, canonical_specs, status=status, timeout=VENDOR_SEARCH_TIMEOUT
+                ),
+                'shopify'
+            )
+        )
         
-        # Sonuçları önbelleğe kaydet
-        cache_manager.set_search_results(query, combined_results, "woocommerce", ttl=7200)  # 2 saat
+    except Exception as e:
+        logger.error(f"Shopify search failed: {e}")
+        return [], {'cached': False, 'stale': False, 'age_seconds': 0}
+
+def search_woocommerce_vendors(query: str, canonical_specs: Optional[Dict] = None) -> Tuple[List[Dict], Dict]:
+    """WooCommerce tedarikçilerinde arama yap (katalog hazırsa katalogdan)"""
+    try:
+        if catalog_sync.is_ready('woocommerce'):
+            return search_catalog('woocommerce', query, canonical_specs)
         
-        return combined_results
+        # İlk senkronizasyon tamamlanana kadar canlı arama
+        return cached_vendor_search(
+            "woocommerce",
+            query,
+            lambda: run_engine_search(
+                lambda status: woocommerce_engine.search_all_vendors(
+                    query, canonical_specs, status=status, timeout=VENDOR_SEARCH_TIMEOUT
+                ),
+                'woocommerce'
+            )
+        )
         
     except Exception as e:
         logger.error(f"WooCommerce search failed: {e}")
-        return []
+        return [], {'cached': False, 'stale': False, 'age_seconds': 0}
 
-def search_real_vendors(query: str, canonical_specs: Optional[Dict] = None) -> List[Dict]:
-    """Gerçek FRC tedarikçilerinde arama yap (WCP, REV, AndyMark, CTRE)"""
+def search_real_vendors(query: str, canonical_specs: Optional[Dict] = None) -> Tuple[List[Dict], Dict]:
+    """
+    Gerçek FRC tedarikçilerinde arama yap (WCP, REV, AndyMark, CTRE)
+    
+    Kataloğu taze olan Shopify tedarikçileri (REV, WCP) taranmaz; onların
+    ürünleri search_shopify_vendors ile katalogdan gelir.
+    """
     try:
-        # Önbellekten kontrol et
-        cached_results = cache_manager.get_search_results(query, "real_vendors")
-        if cached_results:
-            return cached_results
-        
-        # Arama yap
-        all_results = real_vendor_engine.search_all_vendors(query)
-        
-        # Sonuçları birleştir ve normalize et
-        combined_results = []
-        for vendor_name, products in all_results.items():
-            for product in products:
-                product['vendor'] = vendor_name
-                product['source'] = 'real_vendor'
-                combined_results.append(product)
-        
-        # Sonuçları önbelleğe kaydet
-        cache_manager.set_search_results(query, combined_results, "real_vendors", ttl=3600)  # 1 saat
-        
-        return combined_results
+        covered = catalog_covered_vendors()
+        return cached_vendor_search(
+            "real_vendors",
+            query,
+            lambda: run_engine_search(
+                lambda status: real_vendor_engine.search_all_vendors(
+                    query, status=status, timeout=VENDOR_SEARCH_TIMEOUT, skip=covered
+                ),
+                'real_vendor'
+            )
+        )
         
     except Exception as e:
         logger.error(f"Real vendor search failed: {e}")
-        return []
+        return [], {'cached': False, 'stale': False, 'age_seconds': 0}
 
 def validate_and_enhance_products(products: List[Dict]) -> List[Dict]:
     """Ürünleri doğrula ve geliştir"""
@@ -235,28 +547,58 @@ def validate_and_enhance_products(products: List[Dict]) -> List[Dict]:
                 enhanced_products.append(product)
                 continue
             
-            # URL'yi kontrol et
-            if not is_url_alive(product.get('url', '')):
+            # Katalog ürünleri senkronizasyonda tedarikçi API'sinden alındı; sayfa çekilmez
+            if product.get('source') == 'catalog':
+                enhanced_products.append(product)
+                continue
+            
+            # Süre bütçesi dolduysa ağ isteği gerektiren doğrulamaları atla
+            deadline = current_deadline()
+            if deadline is not None and deadline.expired():
+                continue
+            
+            url = product.get('url', '')
+            if not url:
+                continue
+            
+            # Önbellekte ölü olarak işaretli URL'leri atla
+            cached_status = cache_manager.get_url_status(url)
+            if cached_status is not None and not cached_status.get('alive', False):
                 continue
             
-            # Ürün sayfasını çek ve JSON-LD doğrula
+            # Ürün sayfasını çek - ayrı HEAD isteği yok, canlılık bu yanıttan çıkarılır.
+            # Motor aynı sayfayı bu arama içinde çektiyse yanıt sayfa hafızasından gelir.
+            try:
+                response = fetch_product_page(url)
+            except DeadlineExceeded:
+                continue
+            except requests.Timeout:
+                # Zaman aşımı sayfanın ölü olduğunu göstermez - durum önbelleğe yazılmaz
+                logger.warning(f"Timed out fetching product page {url}")
+                continue
+            except Exception as e:
+                logger.warning(f"Failed to fetch product page {url}: {e}")
+                cache_manager.set_url_status(url, {'alive': False}, ttl=3600)
+                continue
+            
+            alive = response.status_code < 400
+            cache_manager.set_url_status(url, {'alive': alive}, ttl=3600)  # 1 saat
+            if not alive:
+                continue
+            
+            # JSON-LD doğrula
             try:
-                response = requests.get(
-                    product.get('url', ''),
-                    headers=DEFAULT_HEADERS,
-                    timeout=REQUEST_TIMEOUT
-                )
-                
                 if response.status_code == 200:
-                    # JSON-LD çıkar
-                    json_ld = json_ld_validator.extract_json_ld(response.text)
+                    # Sayfa belgesi (motor aynı sayfayı ayrıştırdıysa aynı belge kullanılır)
+                    document = page_document(url, response.text)
+                    json_ld = document.json_ld
                     
                     if json_ld:
                         # Ürün bilgilerini çıkar ve doğrula
                         enhanced_info = json_ld_validator.extract_product_info(json_ld, product.get('url', ''))
                         
                         # FRC parça kontrolü
-                        is_frc, category, score = json_ld_validator.is_frc_part(json_ld, response.text)
+                        is_frc, category, score = json_ld_validator.is_frc_part(json_ld, document=document)
                         
                         if is_frc and score >= 0.3:  # Eşik değeri
                             product.update(enhanced_info)
@@ -269,6 +611,8 @@ def validate_and_enhance_products(products: List[Dict]) -> List[Dict]:
                                 enhanced_info,
                                 ttl=86400  # 24 saat
                             )
+                            fulltext_index.add_page_product(product, ttl=86400)
+                            sku_index.add_page_product(product, ttl=86400)
                             
                             enhanced_products.append(product)
                     else:
@@ -286,6 +630,40 @@ def validate_and_enhance_products(products: List[Dict]) -> List[Dict]:
     
     return enhanced_products
 
+def validate_product_groups(groups: List[ProductGroup]) -> List[Dict]:
+    """
+    Ürün gruplarını doğrula - her gruptan yalnızca bir listeleme doğrulanır
+    
+    Grubun temsilcisi doğrulanamazsa (ölü URL, FRC parçası değil) sıradaki
+    listelemesi ikinci turda denenir.
+    
+    Args:
+        groups: resolve_listings ile gruplanmış listelemeler
+        
+    Returns:
+        Tedarikçi teklifleri eklenmiş doğrulanmış ürünler (grup sırasıyla)
+    """
+    validated: Dict[int, Dict] = {}
+    rejected: Dict[int, List[Dict]] = {}
+    pending = list(range(len(groups)))
+    for attempt in range(2):
+        candidates = {
+            index: groups[index].candidates[attempt]
+            for index in pending if attempt < len(groups[index].candidates)
+        }
+        passed = {id(product) for product in validate_and_enhance_products(list(candidates.values()))}
+        for index, product in candidates.items():
+            if id(product) in passed:
+                validated[index] = product
+            else:
+                rejected.setdefault(index, []).append(product)
+        pending = [index for index in candidates if index not in validated]
+        deadline = current_deadline()
+        if not pending or (deadline is not None and deadline.expired()):
+            break
+    
+    return [attach_offers(validated[index], groups[index], rejected.get(index, ())) for index in sorted(validated)]
+
 def build_fallback_links(query: str):
     """Fallback arama linkleri oluştur"""
     encoded = query.strip().replace(' ', '+')
@@ -309,52 +687,116 @@ def search():
     if not query:
         return jsonify({'error': 'Arama terimi gerekli'}), 400
 
-    logger.info(f'🔍 Aranan: {query}')
-
-    # 1. Önce mevcut veritabanından kontrol et
-    results = resolve_query(query)
-    
-    if results:
-        # URL'leri kontrol et ve canlı olanları filtrele
-        filtered = [item for item in results if is_url_alive(item.get('url'))]
-        if filtered:
-            logger.info(f'✅ {len(filtered)} sonuç veritabanından döndü')
-            return jsonify({
-                'query': query,
-                'results': filtered,
-                'count': len(filtered),
-                'source': 'database'
-            })
-
-    # 2. Canonical özellikleri belirle
-    canonical_specs = get_canonical_specs(query)
-    
-    # 3. Gerçek FRC tedarikçilerinde arama (WCP, REV, AndyMark, CTRE)
-    real_vendor_results = search_real_vendors(query, canonical_specs)
-    
-    # 4. Shopify tedarikçilerinde arama (backup)
-    shopify_results = search_shopify_vendors(query, canonical_specs)
-    
-    # 5. WooCommerce tedarikçilerinde arama (backup)
-    woocommerce_results = search_woocommerce_vendors(query, canonical_specs)
-    
-    # 6. Tüm sonuçları birleştir (gerçek tedarikçiler öncelikli)
-    all_results = real_vendor_results + shopify_results + woocommerce_results
-    
-    if all_results:
-        # Ürünleri doğrula ve geliştir
-        validated_results = validate_and_enhance_products(all_results)
+    budget = parse_search_budget(request.args.get('budget'))
+    if budget is None:
+        return jsonify({'error': 'Geçersiz süre bütçesi (saniye olarak sayı girin)'}), 400
+
+    logger.info(f'🔍 Aranan: {query} (bütçe {budget:.1f} sn)')
+
+    # Bütçe tüm motorlara, tedarikçi görevlerine ve HTTP isteklerine taşınır
+    with deadline_scope(budget) as deadline, page_memo_scope() as page_memo:
+        # 1. Parça numarası gibi görünen sorgular (REV-21-1650, am-4567) tek sözlük aramasıyla yanıtlanır
+        if looks_like_part_number(query):
+            hits = lookup_part_number(query)
+            if hits:
+                suggest_service.record(query)
+                logger.info(f'✅ {len(hits)} sonuç parça numarası indeksinden döndü')
+                return jsonify({
+                    'query': query,
+                    'results': hits,
+                    'count': len(hits),
+                    'source': 'part_number'
+                })
         
-        if validated_results:
-            logger.info(f'✅ {len(validated_results)} sonuç yeni arama sisteminden döndü')
+        # 2. Mevcut veritabanından kontrol et
+        match = resolve_query(query)
+        suggest_service.record(query, match.key if match else None)
+        
+        if match:
+            # URL'leri kontrol et ve canlı olanları filtrele
+            filtered = [item for item in match.parts if is_url_alive(item.get('url'))]
+            if filtered:
+                logger.info(f'✅ {len(filtered)} sonuç veritabanından döndü ({match.key}, güven {match.confidence:.2f})')
+                return jsonify({
+                    'query': query,
+                    'results': filtered,
+                    'count': len(filtered),
+                    'source': 'database',
+                    'match': {'key': match.key, 'confidence': round(match.confidence, 2), 'fuzzy': match.fuzzy}
+                })
+
+        # 3. Canonical özellikleri belirle
+        canonical_specs = get_canonical_specs(query)
+        
+        # Yerel tam metin indeksi yeterli sonuç veriyorsa tedarikçilere gidilmez
+        local_results = search_local_index(query, canonical_specs)
+        if len(local_results) >= FULLTEXT_MIN_RESULTS:
+            logger.info(f'✅ {len(local_results)} sonuç yerel tam metin indeksinden döndü')
             return jsonify({
                 'query': query,
-                'results': validated_results,
-                'count': len(validated_results),
-                'source': 'enhanced_search'
+                'results': local_results,
+                'count': len(local_results),
+                'source': 'local_index'
             })
-
-    # 6. Fallback arama linkleri
+        
+        # 4-6. Gerçek tedarikçiler (WCP, REV, AndyMark, CTRE), Shopify ve WooCommerce
+        # aramaları paralel çalışır; toplam süre en yavaş motor kadardır
+        engine_searches = {
+            'real_vendors': submit_in_context(engine_executor, search_real_vendors, query, canonical_specs),
+            'shopify': submit_in_context(engine_executor, search_shopify_vendors, query, canonical_specs),
+            'woocommerce': submit_in_context(engine_executor, search_woocommerce_vendors, query, canonical_specs)
+        }
+        
+        results_by_source = {}
+        freshness_by_source = {}
+        unfinished_vendors = []
+        for source, future in engine_searches.items():
+            try:
+                results_by_source[source], freshness_by_source[source] = future.result(
+                    timeout=deadline.remaining() + ENGINE_RESULT_GRACE
+                )
+            except FuturesTimeout:
+                # Motor bütçe içinde bitmedi - tüm tedarikçileri bitmemiş sayılır
+                logger.warning(f'⏱️ {source} search did not finish within the {budget:.1f}s budget')
+                results_by_source[source] = []
+                freshness_by_source[source] = {'cached': False, 'stale': False, 'age_seconds': 0}
+                unfinished_vendors.extend(engine_vendor_names(source))
+        
+        freshness = merge_freshness(freshness_by_source)
+        vendor_status = merge_vendor_status(freshness_by_source)
+        unfinished_vendors.extend(vendor for vendor, status in vendor_status.items() if status == 'timeout')
+        
+        # 7. Tüm sonuçları birleştir (gerçek tedarikçiler öncelikli)
+        all_results = (
+            results_by_source['real_vendors'] + results_by_source['shopify'] + results_by_source['woocommerce']
+        )
+        
+        if all_results:
+            # Aynı ürünün tedarikçi/motor kopyaları gruplanır; her grup bir kez doğrulanır
+            # ve tek üründe teklifler olarak döner (bütçe dolunca o ana kadar doğrulananlar döner)
+            groups = resolve_listings(all_results)
+            logger.info(f'🔗 {len(all_results)} listeleme {len(groups)} ürüne gruplandı')
+            validated_results = validate_product_groups(groups)
+            partial = bool(unfinished_vendors) or deadline.expired()
+            logger.debug(f'Page memo: {page_memo.stats()}')
+            
+            if validated_results:
+                logger.info(f'✅ {len(validated_results)} sonuç yeni arama sisteminden döndü'
+                            f'{" (kısmi)" if partial else ""}')
+                return jsonify({
+                    'query': query,
+                    'results': validated_results,
+                    'count': len(validated_results),
+                    'source': 'enhanced_search',
+                    'freshness': freshness,
+                    'vendor_status': vendor_status,
+                    'partial': partial,
+                    'unfinished_vendors': unfinished_vendors
+                })
+
+        partial = bool(unfinished_vendors) or deadline.expired()
+
+    # 8. Fallback arama linkleri
     logger.info('⚠️ Hiçbir sonuç bulunamadı, fallback kullanılacak')
     fallback = build_fallback_links(query)
     logger.info(f'✅ {len(fallback)} fallback linki oluşturuldu')
@@ -363,7 +805,24 @@ def search():
         'query': query,
         'results': fallback,
         'count': len(fallback),
-        'source': 'fallback'
+        'source': 'fallback',
+        'vendor_status': vendor_status,
+        'partial': partial,
+        'unfinished_vendors': unfinished_vendors
+    })
+
+@app.route('/api/suggest', methods=['GET'])
+def suggest():
+    """Arama kutusu için otomatik tamamlama önerileri"""
+    prefix = request.args.get('q', '')
+    try:
+        limit = int(request.args.get('limit', SUGGEST_LIMIT))
+    except ValueError:
+        return jsonify({'error': 'Geçersiz öneri sayısı'}), 400
+
+    return jsonify({
+        'query': prefix,
+        'suggestions': suggest_service.suggest(prefix, limit)
     })
 
 @app.route('/api/search/shopify', methods=['GET'])
@@ -374,13 +833,14 @@ def search_shopify():
         return jsonify({'error': 'Arama terimi gerekli'}), 400
     
     canonical_specs = get_canonical_specs(query)
-    results = search_shopify_vendors(query, canonical_specs)
+    results, freshness = search_shopify_vendors(query, canonical_specs)
     
     return jsonify({
         'query': query,
         'results': results,
         'count': len(results),
-        'source': 'shopify'
+        'source': 'shopify',
+        'freshness': freshness
     })
 
 @app.route('/api/search/woocommerce', methods=['GET'])
@@ -391,13 +851,14 @@ def search_woocommerce():
         return jsonify({'error': 'Arama terimi gerekli'}), 400
     
     canonical_specs = get_canonical_specs(query)
-    results = search_woocommerce_vendors(query, canonical_specs)
+    results, freshness = search_woocommerce_vendors(query, canonical_specs)
     
     return jsonify({
         'query': query,
         'results': results,
         'count': len(results),
-        'source': 'woocommerce'
+        'source': 'woocommerce',
+        'freshness': freshness
     })
 
 @app.route('/api/search/real-vendors', methods=['GET'])
@@ -408,39 +869,55 @@ def search_real_vendors_endpoint():
         return jsonify({'error': 'Arama terimi gerekli'}), 400
     
     canonical_specs = get_canonical_specs(query)
-    results = search_real_vendors(query, canonical_specs)
+    results, freshness = search_real_vendors(query, canonical_specs)
     
     return jsonify({
         'query': query,
         'results': results,
         'count': len(results),
         'source': 'real_vendors',
-        'vendors': ['WCP (West Coast Products)', 'REV Robotics', 'AndyMark', 'CTRE']
+        'freshness': freshness,
+        'vendors': REAL_VENDOR_NAMES
     })
 
 @app.route('/api/cache/stats', methods=['GET'])
 def cache_stats():
     """Önbellek istatistikleri"""
     stats = cache_manager.get_cache_stats()
+    stats['single_flight'] = inflight.stats()
+    stats['sitemaps'] = sitemap_stats()
+    stats['catalog'] = {**catalog_store.stats(), 'last_sync': catalog_sync.last_results}
+    stats['suggest'] = suggest_service.stats()
+    stats['fulltext'] = fulltext_index.stats()
+    stats['sku_index'] = sku_index.stats()
     return jsonify(stats)
 
+@app.route('/api/http/stats', methods=['GET'])
+def http_stats():
+    """HTTP bağlantı havuzu istatistikleri (bağlantı yeniden kullanımı)"""
+    return jsonify(http_client.stats())
+
 @app.route('/api/cache/clear', methods=['POST'])
 def clear_cache():
     """Önbelleği temizle"""
     cache_manager.clear_all_cache()
+    fulltext_index.clear_pages()
+    sku_index.clear_pages()
     return jsonify({'message': 'Cache cleared successfully'})
 
 @app.route('/api/cache/cleanup', methods=['POST'])
 def cleanup_cache():
     """Süresi dolmuş önbellek kayıtlarını temizle"""
     cache_manager.cleanup_expired()
+    fulltext_index.purge_expired()
+    sku_index.purge_expired()
     return jsonify({'message': 'Expired cache entries cleaned up'})
 
 @app.route('/api/health', methods=['GET'])
 def health():
     """Sistem durumu"""
     cache_stats = cache_manager.get_cache_stats()
-    categories = [key for key, value in FRC_PARTS_DATABASE.items() if isinstance(value, list)]
+    categories = PARTS_INDEX.part_keys
     
     return jsonify({
         'status': 'ok',
@@ -472,4 +949,10 @@ if __name__ == '__main__':
     print('🧹 Cache Clear: POST /api/cache/clear')
     print('=' * 60)
     
+    # Parça numarası indeksi kalıcı katalog ve ürün önbelleğinden doldurulur
+    seed_sku_index()
+    
+    # Shopify kataloğu arka planda periyodik olarak senkronize edilir
+    catalog_sync.start()
+    
     app.run(host='0.0.0.0', port=5001, debug=False, use_reloader=False)
@@ -1,8 +1,9 @@
 from flask import Flask, jsonify, request
 from flask_cors import CORS
-import requests
 
-from frc_parts_db import FRC_PARTS_DATABASE, VENDOR_SEARCH_URLS
+from frc_parts_db import VENDOR_SEARCH_URLS
+from parts_index import PARTS_INDEX
+from http_client import get_http_client
 
 app = Flask(__name__)
 CORS(app)
@@ -16,30 +17,13 @@ DEFAULT_HEADERS = {
 }
 REQUEST_TIMEOUT = 8
 _AVAILABILITY_CACHE = {}
+http_client = get_http_client()
 
 
 def resolve_query(query: str):
     """Kullanıcının sorgusunu veri tabanındaki parça ile eşleştir."""
-    query_lower = query.strip().lower()
-    if not query_lower:
-        return None
-
-    if query_lower in FRC_PARTS_DATABASE:
-        result = FRC_PARTS_DATABASE[query_lower]
-        if isinstance(result, str):
-            result = FRC_PARTS_DATABASE[result]
-        return result
-
-    # kısmi eşleşme: bütün kelimeler geçsin
-    query_words = query_lower.split()
-    for key, value in FRC_PARTS_DATABASE.items():
-        if isinstance(value, str):
-            continue
-        key_words = key.split()
-        if all(any(qw in kw or kw in qw for kw in key_words) for qw in query_words):
-            return value
-
-    return None
+    # Anahtar/takma ad, kelime indeksinden kısmi eşleşme, son olarak yazım hatası düzeltmesi
+    return PARTS_INDEX.resolve(query, fuzzy=True)
 
 
 def is_url_alive(url: str) -> bool:
@@ -49,12 +33,7 @@ def is_url_alive(url: str) -> bool:
     if cached is not None:
         return cached
     try:
-        response = requests.head(
-            url,
-            allow_redirects=True,
-            timeout=REQUEST_TIMEOUT,
-            headers=DEFAULT_HEADERS,
-        )
+        response = http_client.head(url, timeout=REQUEST_TIMEOUT, headers=DEFAULT_HEADERS)
         ok = response.status_code < 400
     except Exception:
         ok = False
@@ -116,7 +95,7 @@ def search():
 
 @app.route('/api/health', methods=['GET'])
 def health():
-    categories = [key for key, value in FRC_PARTS_DATABASE.items() if isinstance(value, list)]
+    categories = PARTS_INDEX.part_keys
     return jsonify({
         'status': 'ok',
         'message': 'FRC Parts Finder API v2.0 - Statik katalog',
@@ -129,7 +108,7 @@ if __name__ == '__main__':
     print('=' * 60)
     print('🚀 FRC Parts Finder Backend Server v2.0')
     print('=' * 60)
-    print(f'📦 Katalog kategori sayısı: {len([k for k, v in FRC_PARTS_DATABASE.items() if isinstance(v, list)])}')
+    print(f'📦 Katalog kategori sayısı: {len(PARTS_INDEX.part_keys)}')
     print('🌐 API: http://localhost:5001')
     print('=' * 60)
     app.run(host='0.0.0.0', port=5001, debug=False, use_reloader=False)
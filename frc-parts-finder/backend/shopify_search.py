@@ -4,27 +4,35 @@ REV, WCP, ThriftyBot gibi Shopify kullanan tedarikçiler için optimize edilmiş
 """
 
 import requests
-import re
-import json
-import time
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin
 from typing import List, Dict, Optional, Tuple
 import logging
 
+from http_client import HttpClient, get_http_client
+from json_ld_extract import extract_product_json_ld
+from keyword_matcher import compile_keywords
+from page_document import PageDocument, page_document
+from page_fetcher import get_page_fetcher
+from sitemap_index import SitemapIndex, get_sitemap_index
+from vendor_tasks import RequestFailureTracker, run_vendor_searches
+
 # Logging setup
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class ShopifySearchEngine:
-    def __init__(self, rate_limit_delay: float = 0.5):
+    def __init__(self, rate_limit_delay: float = 0.5, http_client: Optional[HttpClient] = None):
         """
         Shopify arama motoru
         
         Args:
-            rate_limit_delay: Domain başına istekler arası bekleme süresi (saniye)
+            rate_limit_delay: Hız ayarı olmayan domainler için istekler arası bekleme süresi (saniye)
+            http_client: Paylaşılan HTTP istemcisi (verilmezse süreç geneli istemci kullanılır)
         """
         self.rate_limit_delay = rate_limit_delay
-        self.last_request_time = {}
+        self.failures = RequestFailureTracker()
+        self.http = http_client or get_http_client()
+        self.pages = get_page_fetcher()
         
         self.headers = {
             'User-Agent': (
@@ -58,30 +66,18 @@ class ShopifySearchEngine:
             }
         }
 
-    def _rate_limit(self, domain: str):
-        """Domain başına rate limiting"""
-        if domain in self.last_request_time:
-            elapsed = time.time() - self.last_request_time[domain]
-            if elapsed < self.rate_limit_delay:
-                time.sleep(self.rate_limit_delay - elapsed)
-        self.last_request_time[domain] = time.time()
-
-    def _make_request(self, url: str, timeout: int = 10) -> Optional[requests.Response]:
+    def _make_request(self, url: str, timeout: Optional[float] = None,
+                      params: Dict = None) -> Optional[requests.Response]:
         """Rate-limited HTTP request"""
         try:
-            domain = urlparse(url).netloc
-            self._rate_limit(domain)
-            
-            response = requests.get(
-                url, 
-                headers=self.headers, 
-                timeout=timeout,
-                allow_redirects=True
-            )
+            # Domain başına hız sınırı paylaşılan istemcide uygulanır
+            response = self.http.get(url, headers=self.headers, timeout=timeout, params=params,
+                                     rate=1.0 / self.rate_limit_delay if self.rate_limit_delay else None)
             response.raise_for_status()
             return response
         except Exception as e:
             logger.warning(f"Request failed for {url}: {e}")
+            self.failures.record()
             return None
 
     def search_suggest(self, domain: str, query: str, limit: int = 10) -> List[str]:
@@ -145,34 +141,69 @@ class ShopifySearchEngine:
             return data.get('products', [])
         except Exception as e:
             logger.warning(f"Failed to parse products.json for {domain}: {e}")
+            # Bozuk yanıt boş sayfa gibi görünmesin (katalog senkronizasyonu bunu son sayfa sanar)
+            self.failures.record()
             return []
 
-    def get_sitemap_products(self, domain: str) -> List[str]:
+    def get_product_json(self, domain: str, handle: str) -> Optional[Dict]:
         """
-        Sitemap.xml'den ürün URL'lerini çıkar
+        Tek ürünü /products/{handle}.json'dan al (products.json ile aynı format)
         
         Args:
             domain: Tedarikçi domain
+            handle: Ürün handle'ı
             
         Returns:
-            Ürün URL'leri listesi
+            Ürün bilgileri (hata durumunda None)
         """
         if not domain.startswith('http'):
             domain = f"https://{domain}"
             
-        sitemap_url = f"{domain}/sitemap.xml"
-        response = self._make_request(sitemap_url)
+        response = self._make_request(f"{domain}/products/{handle}.json")
         if not response:
-            return []
+            return None
             
         try:
-            # Sitemap XML parsing (basit regex yaklaşımı)
-            content = response.text
-            product_urls = re.findall(r'<loc>(https?://[^<]+/products/[^<]+)</loc>', content)
-            return product_urls
+            return response.json().get('product')
         except Exception as e:
-            logger.warning(f"Failed to parse sitemap for {domain}: {e}")
+            logger.warning(f"Failed to parse product JSON {handle} for {domain}: {e}")
+            self.failures.record()
+            return None
+
+    def get_product_sitemap(self, domain: str) -> SitemapIndex:
+        """
+        Tedarikçinin ürün sitemap indeksi (URL ve <lastmod> değerleri)
+        
+        Args:
+            domain: Tedarikçi domain
+            
+        Returns:
+            Paylaşılan SitemapIndex
+        """
+        if not domain.startswith('http'):
+            domain = f"https://{domain}"
+            
+        # Shopify sitemap.xml bir index'tir; yalnızca ürün alt sitemap'leri izlenir
+        return get_sitemap_index(
+            f"{domain}/sitemap.xml", r'^https?://[^/]+/products/',
+            child_pattern=r'sitemap_products', headers=self.headers
+        )
+
+    def get_sitemap_products(self, domain: str) -> List[str]:
+        """
+        Sitemap.xml'den ürün URL'lerini çıkar
+        
+        Args:
+            domain: Tedarikçi domain
+            
+        Returns:
+            Ürün URL'leri listesi
+        """
+        index = self.get_product_sitemap(domain)
+        if not index.ensure_loaded():
+            self.failures.record()
             return []
+        return index.urls()
 
     def extract_json_ld(self, html: str) -> Optional[Dict]:
         """
@@ -184,39 +215,18 @@ class ShopifySearchEngine:
         Returns:
             JSON-LD Product verisi veya None
         """
-        try:
-            # JSON-LD script tag'lerini bul
-            pattern = r'<script[^>]+type="application/ld\+json"[^>]*>(.*?)</script>'
-            matches = re.findall(pattern, html, re.DOTALL | re.IGNORECASE)
-            
-            for match in matches:
-                try:
-                    data = json.loads(match.strip())
-                    
-                    # Tek obje veya liste olabilir
-                    if isinstance(data, list):
-                        for item in data:
-                            if item.get('@type') == 'Product':
-                                return item
-                    elif isinstance(data, dict) and data.get('@type') == 'Product':
-                        return data
-                        
-                except json.JSONDecodeError:
-                    continue
-                    
-        except Exception as e:
-            logger.warning(f"Failed to extract JSON-LD: {e}")
-            
-        return None
+        return extract_product_json_ld(html)
 
-    def is_product_match(self, canonical_specs: Dict, json_ld: Dict, html: str) -> bool:
+    def is_product_match(self, canonical_specs: Dict, json_ld: Optional[Dict], html: str = '',
+                         document: Optional[PageDocument] = None) -> bool:
         """
         Ürünün canonical özelliklerle eşleşip eşleşmediğini kontrol et
         
         Args:
             canonical_specs: Canonical parça özellikleri
             json_ld: JSON-LD Product verisi
-            html: HTML içeriği
+            html: HTML içeriği (document verilmezse kullanılır)
+            document: Sayfanın ayrıştırılmış hali (opsiyonel)
             
         Returns:
             Eşleşme durumu
@@ -224,18 +234,13 @@ class ShopifySearchEngine:
         if not canonical_specs.get('must_keywords'):
             return True
             
-        # Tüm metin içeriğini birleştir
-        text_content = ' '.join([
-            json_ld.get('name', ''),
-            json_ld.get('description', ''),
-            json_ld.get('sku', ''),
-            json_ld.get('mpn', ''),
-            html
-        ]).lower()
+        # JSON-LD alanları + başlık + meta + görünür metin (belge başına bir kez hazırlanır)
+        if document is None:
+            document = PageDocument(html)
+        text_content = document.product_text(json_ld)
         
-        # Zorunlu anahtar kelimeleri kontrol et
-        must_keywords = [kw.lower() for kw in canonical_specs['must_keywords']]
-        return all(keyword in text_content for keyword in must_keywords)
+        # Zorunlu anahtar kelimeleri kontrol et (derlenmiş liste, ilk eksikte durur)
+        return compile_keywords(canonical_specs['must_keywords']).contains_all(text_content)
 
     def search_vendor(self, domain: str, query: str, canonical_specs: Optional[Dict] = None) -> List[Dict]:
         """
@@ -249,8 +254,6 @@ class ShopifySearchEngine:
         Returns:
             Eşleşen ürünler listesi
         """
-        results = []
-        
         # 1. Search suggest API
         product_urls = self.search_suggest(domain, query, limit=10)
         
@@ -260,30 +263,25 @@ class ShopifySearchEngine:
             product_urls = [urljoin(f"https://{domain}", p.get('handle', '')) 
                           for p in products_data if p.get('handle')]
         
-        # 3. Her ürün sayfasını kontrol et
-        for url in product_urls[:15]:  # Limit to 15 products
-            try:
-                response = self._make_request(url)
-                if not response or response.status_code != 200:
-                    continue
-                    
-                html = response.text
-                json_ld = self.extract_json_ld(html)
+        # 3. Her ürün sayfasını kontrol et (host başına sınırlı paralel, sıra korunur)
+        def process_product(url: str) -> Optional[Dict]:
+            response = self._make_request(url)
+            if not response or response.status_code != 200:
+                return None
                 
-                # Canonical specs varsa eşleşme kontrolü
-                if canonical_specs and not self.is_product_match(canonical_specs, json_ld or {}, html):
-                    continue
-                
-                # Ürün bilgilerini çıkar
-                product_info = self._extract_product_info(json_ld, html, url)
-                if product_info:
-                    results.append(product_info)
-                    
-            except Exception as e:
-                logger.warning(f"Failed to process product {url}: {e}")
-                continue
-                
-        return results
+            html = response.text
+            document = page_document(url, html)
+            json_ld = document.json_ld
+            
+            # Canonical specs varsa eşleşme kontrolü
+            if canonical_specs and not self.is_product_match(canonical_specs, json_ld, document=document):
+                return None
+            
+            # Ürün bilgilerini çıkar
+            return self._extract_product_info(json_ld, html, url)
+        
+        products = self.pages.map(process_product, product_urls[:15])  # Limit to 15 products
+        return [product for product in products if product]
 
     def _extract_product_info(self, json_ld: Optional[Dict], html: str, url: str) -> Optional[Dict]:
         """
@@ -336,30 +334,27 @@ class ShopifySearchEngine:
             'description': json_ld.get('description', '')[:200] if json_ld.get('description') else ''
         }
 
-    def search_all_vendors(self, query: str, canonical_specs: Optional[Dict] = None) -> Dict[str, List[Dict]]:
+    def search_all_vendors(self, query: str, canonical_specs: Optional[Dict] = None,
+                           status: Optional[Dict[str, str]] = None,
+                           timeout: Optional[float] = None) -> Dict[str, List[Dict]]:
         """
         Tüm Shopify tedarikçilerinde arama yap
         
         Args:
             query: Arama terimi
             canonical_specs: Canonical parça özellikleri
+            status: Tedarikçi adı -> 'ok' / 'empty' / 'error' / 'timeout' ile doldurulur (opsiyonel)
+            timeout: Tedarikçi başına süre sınırı (saniye) - tedarikçiler paralel aranır
             
         Returns:
             Tedarikçi bazında sonuçlar
         """
-        all_results = {}
-        
-        for domain, vendor_info in self.shopify_vendors.items():
-            try:
-                logger.info(f"Searching {vendor_info['name']} ({domain}) for: {query}")
-                results = self.search_vendor(domain, query, canonical_specs)
-                all_results[vendor_info['name']] = results
-                logger.info(f"Found {len(results)} products from {vendor_info['name']}")
-            except Exception as e:
-                logger.error(f"Error searching {domain}: {e}")
-                all_results[vendor_info['name']] = []
-                
-        return all_results
+        tasks = {
+            vendor_info['name']: (lambda domain=domain: self.search_vendor(domain, query, canonical_specs))
+            for domain, vendor_info in self.shopify_vendors.items()
+        }
+        logger.info(f"Searching Shopify vendors for: {query}")
+        return run_vendor_searches(tasks, self.failures, status, timeout)
 
 
 # Test ve örnek kullanım
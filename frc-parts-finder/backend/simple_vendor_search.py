@@ -5,18 +5,25 @@ Gerçek ürün linklerini bulmak için sitemap ve HTML parsing
 
 import requests
 import re
-import json
-import time
-from urllib.parse import urljoin, urlparse, quote
-from typing import List, Dict, Optional
+from urllib.parse import urljoin, quote
+from typing import Iterable, List, Dict, Optional
 import logging
 
+from http_client import HttpClient, get_http_client
+from json_ld_extract import extract_product_json_ld
+from page_document import page_document
+from page_fetcher import get_page_fetcher
+from sitemap_index import get_sitemap_index
+from vendor_tasks import RequestFailureTracker, run_vendor_searches
+
 logger = logging.getLogger(__name__)
 
 class SimpleVendorSearch:
-    def __init__(self, rate_limit_delay: float = 1.0):
+    def __init__(self, rate_limit_delay: float = 1.0, http_client: Optional[HttpClient] = None):
         self.rate_limit_delay = rate_limit_delay
-        self.last_request_time = {}
+        self.failures = RequestFailureTracker()
+        self.http = http_client or get_http_client()
+        self.pages = get_page_fetcher()
         
         self.headers = {
             'User-Agent': (
@@ -30,61 +37,39 @@ class SimpleVendorSearch:
             'Connection': 'keep-alive',
         }
 
-    def _rate_limit(self, domain: str):
-        if domain in self.last_request_time:
-            elapsed = time.time() - self.last_request_time[domain]
-            if elapsed < self.rate_limit_delay:
-                time.sleep(self.rate_limit_delay - elapsed)
-        self.last_request_time[domain] = time.time()
-
-    def _make_request(self, url: str, timeout: int = 15) -> Optional[requests.Response]:
+    def _make_request(self, url: str, timeout: Optional[float] = None,
+                      params: Dict = None) -> Optional[requests.Response]:
         try:
-            domain = urlparse(url).netloc
-            self._rate_limit(domain)
-            
-            response = requests.get(
-                url, 
-                headers=self.headers, 
-                timeout=timeout,
-                allow_redirects=True
-            )
+            # Domain başına hız sınırı paylaşılan istemcide uygulanır
+            response = self.http.get(url, headers=self.headers, timeout=timeout, params=params,
+                                     rate=1.0 / self.rate_limit_delay if self.rate_limit_delay else None)
             response.raise_for_status()
             return response
         except Exception as e:
             logger.warning(f"Request failed for {url}: {e}")
+            self.failures.record()
             return None
 
     def search_wcp(self, query: str) -> List[Dict]:
         """WCP - Sitemap tabanlı arama"""
         try:
-            # WCP sitemap'ini çek
-            sitemap_url = "https://wcproducts.com/sitemap.xml"
-            response = self._make_request(sitemap_url)
-            if not response:
+            # WCP sitemap'i (ve alt sitemap'leri) önbellekte tutulur ve indekslenir
+            index = get_sitemap_index(
+                "https://wcproducts.com/sitemap.xml", r'^https://wcproducts\.com/products/',
+                child_pattern=r'products', headers=self.headers
+            )
+            if not index.ensure_loaded():
+                self.failures.record()
                 return []
             
-            # Sitemap'ten ürün URL'lerini çıkar
-            content = response.text
-            product_urls = re.findall(r'<loc>(https://wcproducts\.com/products/[^<]+)</loc>', content)
-            
-            # Query ile eşleşen URL'leri filtrele
-            query_words = [w.lower() for w in query.split()]
-            matching_urls = []
-            
-            for url in product_urls:
-                # URL'de query kelimelerini ara
-                url_lower = url.lower()
-                if any(word in url_lower for word in query_words):
-                    matching_urls.append(url)
-            
-            # İlk 10 eşleşen ürünü işle
-            results = []
-            for url in matching_urls[:10]:
-                product_info = self._extract_product_info(url, 'WCP (West Coast Products)')
-                if product_info:
-                    results.append(product_info)
+            # Query kelimelerinden herhangi birini URL'de içerenler (indeks araması)
+            matching_urls = index.lookup(query, match_all=False, limit=10)
             
-            return results
+            # İlk 10 eşleşen ürünü işle (host başına sınırlı paralel, sıra korunur)
+            products = self.pages.map(
+                lambda url: self._extract_product_info(url, 'WCP (West Coast Products)'), matching_urls[:10]
+            )
+            return [product for product in products if product]
             
         except Exception as e:
             logger.error(f"WCP search failed: {e}")
@@ -121,14 +106,11 @@ class SimpleVendorSearch:
                 if keyword in query_lower:
                     matching_urls.extend(urls)
             
-            # Eşleşen URL'leri işle
-            results = []
-            for url in matching_urls[:8]:
-                product_info = self._extract_product_info(url, 'REV Robotics')
-                if product_info:
-                    results.append(product_info)
-            
-            return results
+            # Eşleşen URL'leri işle (host başına sınırlı paralel, sıra korunur)
+            products = self.pages.map(
+                lambda url: self._extract_product_info(url, 'REV Robotics'), matching_urls[:8]
+            )
+            return [product for product in products if product]
             
         except Exception as e:
             logger.error(f"REV search failed: {e}")
@@ -153,18 +135,12 @@ class SimpleVendorSearch:
             
             all_links = product_links + absolute_links
             
-            results = []
-            for link in all_links[:10]:
-                if link.startswith('http'):
-                    full_url = link
-                else:
-                    full_url = urljoin('https://andymark.com', link)
-                
-                product_info = self._extract_product_info(full_url, 'AndyMark')
-                if product_info:
-                    results.append(product_info)
-            
-            return results
+            product_urls = [
+                link if link.startswith('http') else urljoin('https://andymark.com', link)
+                for link in all_links[:10]
+            ]
+            products = self.pages.map(lambda url: self._extract_product_info(url, 'AndyMark'), product_urls)
+            return [product for product in products if product]
             
         except Exception as e:
             logger.error(f"AndyMark search failed: {e}")
@@ -198,14 +174,11 @@ class SimpleVendorSearch:
                 if keyword in query_lower:
                     matching_urls.extend(urls)
             
-            # Eşleşen URL'leri işle
-            results = []
-            for url in matching_urls[:8]:
-                product_info = self._extract_product_info(url, 'CTRE')
-                if product_info:
-                    results.append(product_info)
-            
-            return results
+            # Eşleşen URL'leri işle (host başına sınırlı paralel, sıra korunur)
+            products = self.pages.map(
+                lambda url: self._extract_product_info(url, 'CTRE'), matching_urls[:8]
+            )
+            return [product for product in products if product]
             
         except Exception as e:
             logger.error(f"CTRE search failed: {e}")
@@ -221,7 +194,7 @@ class SimpleVendorSearch:
             html = response.text
             
             # JSON-LD Product verisi ara
-            json_ld = self._extract_json_ld(html)
+            json_ld = page_document(url, html).json_ld
             if json_ld:
                 return self._parse_json_ld_product(json_ld, url, vendor)
             
@@ -234,28 +207,7 @@ class SimpleVendorSearch:
 
     def _extract_json_ld(self, html: str) -> Optional[Dict]:
         """HTML'den JSON-LD Product verilerini çıkar"""
-        try:
-            pattern = r'<script[^>]+type="application/ld\+json"[^>]*>(.*?)</script>'
-            matches = re.findall(pattern, html, re.DOTALL | re.IGNORECASE)
-            
-            for match in matches:
-                try:
-                    data = json.loads(match.strip())
-                    
-                    if isinstance(data, list):
-                        for item in data:
-                            if item.get('@type') == 'Product':
-                                return item
-                    elif isinstance(data, dict) and data.get('@type') == 'Product':
-                        return data
-                        
-                except json.JSONDecodeError:
-                    continue
-                    
-        except Exception as e:
-            logger.warning(f"Failed to extract JSON-LD: {e}")
-            
-        return None
+        return extract_product_json_ld(html)
 
     def _parse_json_ld_product(self, json_ld: Dict, url: str, vendor: str) -> Dict:
         """JSON-LD Product verisini parse et"""
@@ -385,51 +337,32 @@ class SimpleVendorSearch:
             logger.warning(f"Failed to parse HTML product: {e}")
             return None
 
-    def search_all_vendors(self, query: str) -> Dict[str, List[Dict]]:
-        """Tüm tedarikçilerde arama yap"""
-        all_results = {}
-        
-        # WCP arama
-        try:
-            logger.info(f"Searching WCP for: {query}")
-            wcp_results = self.search_wcp(query)
-            all_results['WCP (West Coast Products)'] = wcp_results
-            logger.info(f"Found {len(wcp_results)} products from WCP")
-        except Exception as e:
-            logger.error(f"Error searching WCP: {e}")
-            all_results['WCP (West Coast Products)'] = []
-        
-        # REV arama
-        try:
-            logger.info(f"Searching REV for: {query}")
-            rev_results = self.search_rev(query)
-            all_results['REV Robotics'] = rev_results
-            logger.info(f"Found {len(rev_results)} products from REV")
-        except Exception as e:
-            logger.error(f"Error searching REV: {e}")
-            all_results['REV Robotics'] = []
-        
-        # AndyMark arama
-        try:
-            logger.info(f"Searching AndyMark for: {query}")
-            andymark_results = self.search_andymark(query)
-            all_results['AndyMark'] = andymark_results
-            logger.info(f"Found {len(andymark_results)} products from AndyMark")
-        except Exception as e:
-            logger.error(f"Error searching AndyMark: {e}")
-            all_results['AndyMark'] = []
-        
-        # CTRE arama
-        try:
-            logger.info(f"Searching CTRE for: {query}")
-            ctre_results = self.search_ctre(query)
-            all_results['CTRE'] = ctre_results
-            logger.info(f"Found {len(ctre_results)} products from CTRE")
-        except Exception as e:
-            logger.error(f"Error searching CTRE: {e}")
-            all_results['CTRE'] = []
-        
-        return all_results
+    def search_all_vendors(self, query: str,
+                           status: Optional[Dict[str, str]] = None,
+                           timeout: Optional[float] = None,
+                           skip: Iterable[str] = ()) -> Dict[str, List[Dict]]:
+        """
+        Tüm tedarikçilerde arama yap
+
+        Args:
+            query: Arama terimi
+            status: Tedarikçi adı -> 'ok' / 'empty' / 'error' / 'timeout' ile doldurulur (opsiyonel)
+            timeout: Tedarikçi başına süre sınırı (saniye) - tedarikçiler paralel aranır
+            skip: Aranmayacak tedarikçi adları (ör. yerel katalogdan sunulanlar)
+
+        Returns:
+            Tedarikçi bazında sonuçlar
+        """
+        tasks = {
+            'WCP (West Coast Products)': lambda: self.search_wcp(query),
+            'REV Robotics': lambda: self.search_rev(query),
+            'AndyMark': lambda: self.search_andymark(query),
+            'CTRE': lambda: self.search_ctre(query),
+        }
+        for vendor_name in skip:
+            tasks.pop(vendor_name, None)
+        logger.info(f"Searching {len(tasks)} vendors for: {query}")
+        return run_vendor_searches(tasks, self.failures, status, timeout)
 
 
 # Test
@@ -0,0 +1,93 @@
+"""
+Eşzamanlı özdeş istekleri birleştirme (single-flight)
+Aynı anahtar için yalnızca bir thread işi yapar, diğerleri onun sonucunu bekler
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """Devam eden tek bir çağrının durumu"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """
+    Anahtar bazında istek birleştirici
+
+    Bir anahtar için çağrı sürerken gelen özdeş çağrılar (follower) işi
+    tekrar yapmaz; lider thread'in sonucunu (veya hatasını) paylaşır.
+    Çağrı bittiğinde anahtar serbest kalır, sonuç burada önbelleğe alınmaz.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+        self.leaders = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        fn'i anahtar başına tek seferde çalıştır
+
+        Args:
+            key: İstek anahtarı (ör. ('search', 'shopify', 'kraken'))
+            fn: İşi yapan fonksiyon
+
+        Returns:
+            fn'in sonucu (follower'lar liderin sonucunu alır)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                self.leaders += 1
+                leader = True
+            else:
+                call.followers += 1
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            if call.followers:
+                logger.debug(f"Coalesced {call.followers} duplicate calls for {key}")
+            call.done.set()
+
+    def in_flight(self) -> int:
+        """Devam eden çağrı sayısı"""
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> Dict:
+        """Birleştirme istatistikleri"""
+        with self._lock:
+            return {
+                'in_flight': len(self._calls),
+                'leaders': self.leaders,
+                'coalesced': self.coalesced
+            }
@@ -0,0 +1,365 @@
+"""
+Tedarikçi sitemap servisi
+Sitemap ve sitemap index'leri akış halinde ayrıştırır, URL kümesini önbelleğe alıp token -> URL ters indeksi kurar
+"""
+
+import contextvars
+import re
+import threading
+import time
+import zlib
+import xml.etree.ElementTree as ET
+from contextlib import closing
+from typing import Dict, FrozenSet, List, Optional, Pattern, Set, Tuple
+import logging
+
+from deadline import clamp_timeout
+from http_client import HttpClient, get_http_client
+
+logger = logging.getLogger(__name__)
+
+# URL kümesinin yenilenme aralığı (saniye) - ürün sitemap'leri nadiren değişir
+SITEMAP_REFRESH_INTERVAL = 6 * 3600
+
+# Başarısız yüklemeden sonra bu süre (saniye) yeniden denenmez
+SITEMAP_FAILURE_BACKOFF = 60
+
+# Sitemap index'lerde izlenecek en fazla alt sitemap ve derinlik
+MAX_CHILD_SITEMAPS = 50
+MAX_SITEMAP_DEPTH = 2
+
+# Akış halinde okunan parça boyutu
+CHUNK_SIZE = 64 * 1024
+
+# İndeks token'ı olarak kullanılan n-gram uzunluğu
+NGRAM_SIZE = 3
+
+# Sitemap girdisi: (URL, lastmod)
+SitemapEntry = Tuple[str, Optional[str]]
+
+_NO_IDS: FrozenSet[int] = frozenset()
+
+
+def ngrams(text: str) -> Set[str]:
+    """Metnin tüm NGRAM_SIZE uzunluklu parçaları"""
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+def _local_name(tag: str) -> str:
+    """'{namespace}loc' -> 'loc'"""
+    return tag.rsplit('}', 1)[-1]
+
+
+class SitemapIndex:
+    """
+    Bir tedarikçinin sitemap'indeki ürün URL'leri ve token indeksi
+
+    Sitemap ilk kullanımda indirilir; yenileme aralığı dolduğunda eski küme
+    sunulmaya devam ederken arka planda yeniden indirilir. Başarısız
+    yüklemeden sonra SITEMAP_FAILURE_BACKOFF boyunca yeniden denenmez. URL'ler 3-gram
+    token'larına göre indekslenir; aday URL araması tüm listeyi taramak
+    yerine sözlük kesişimi ile yapılır. Kesişimden gelen adaylar alt dize
+    kontrolünden geçer, yani eşleşme eski "kelime URL'de geçiyor mu"
+    davranışıyla aynıdır ("spark max" -> ".../sparkmax-controller").
+    """
+
+    def __init__(self, sitemap_url: str, url_pattern: Optional[str] = None,
+                 refresh_interval: float = SITEMAP_REFRESH_INTERVAL,
+                 child_pattern: Optional[str] = None,
+                 headers: Optional[Dict[str, str]] = None,
+                 http_client: Optional[HttpClient] = None):
+        """
+        Args:
+            sitemap_url: Kök sitemap (veya sitemap index) URL'si
+            url_pattern: Yalnızca bu regex'e uyan URL'ler tutulur (örn. ürün sayfaları)
+            refresh_interval: Yenileme aralığı (saniye)
+            child_pattern: Sitemap index'te yalnızca bu regex'e uyan alt sitemap'ler izlenir
+            headers: HTTP başlıkları
+            http_client: Paylaşılan HTTP istemcisi (verilmezse ortak istemci)
+        """
+        self.sitemap_url = sitemap_url
+        self.url_pattern: Optional[Pattern] = re.compile(url_pattern, re.IGNORECASE) if url_pattern else None
+        self.child_pattern: Optional[Pattern] = re.compile(child_pattern, re.IGNORECASE) if child_pattern else None
+        self.refresh_interval = refresh_interval
+        self.headers = headers or {}
+        self.http = http_client or get_http_client()
+
+        self._urls: List[str] = []
+        self._keys: List[str] = []  # küçük harfli URL'ler (alt dize kontrolü için)
+        self._lastmod: Dict[str, Optional[str]] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self.loaded_at: Optional[float] = None
+        self.failed_at: Optional[float] = None
+        self.complete = False  # yüklü küme tüm alt sitemap'leri içeriyor mu
+
+        self._lock = threading.Lock()
+        self._loading: Optional[threading.Event] = None
+
+    # --- yükleme ---
+
+    def ensure_loaded(self) -> bool:
+        """
+        URL kümesinin hazır olmasını sağla
+
+        Returns:
+            Sorgulanabilir URL kümesi varsa True
+        """
+        with self._lock:
+            loaded_at, failed_at, complete = self.loaded_at, self.failed_at, self.complete
+        if failed_at is not None and time.time() - failed_at < SITEMAP_FAILURE_BACKOFF:
+            # Yakın zamanda başarısız oldu - her arama indirmeyi yeniden denemesin
+            return loaded_at is not None
+        if loaded_at is None:
+            # İlk yükleme: eşzamanlı çağrılar tek indirmeyi paylaşır ve en fazla
+            # arama deadline'ı kadar bekler. İndirme arka planda sürer; deadline
+            # dolsa da indeks yarım kalmaz, tamamlanınca sonraki aramalar kullanır.
+            self._refresh_in_background().wait(clamp_timeout(None))
+            return self.loaded_at is not None
+        if time.time() - loaded_at >= self.refresh_interval or not complete:
+            self._refresh_in_background()
+        return True
+
+    def refresh(self) -> bool:
+        """
+        Sitemap'i yeniden indir ve indeksi değiştir
+
+        Bir alt sitemap alınamazsa yükleme eksik sayılır: daha önce yüklenmiş
+        küme varsa korunur, yoksa eksik küme aramalar için kullanılır
+        (complete=False) ve geri alma süresi dolunca yeniden denenir.
+
+        Returns:
+            Sitemap'in tamamı yüklendiyse True (başarısızsa eski küme korunur)
+        """
+        failed_children: List[str] = []
+        try:
+            entries = self._collect(self.sitemap_url, 0, failed_children)
+        except Exception as e:
+            logger.warning(f"Failed to load sitemap {self.sitemap_url}: {e}")
+            with self._lock:
+                self.failed_at = time.time()
+            return False
+
+        complete = not failed_children
+        if not complete:
+            logger.warning(f"Sitemap {self.sitemap_url} loaded incompletely: "
+                           f"{len(failed_children)} child sitemaps failed")
+            with self._lock:
+                self.failed_at = time.time()
+                if self.loaded_at is not None:
+                    return False
+
+        urls, keys, lastmod, postings = [], [], {}, {}
+        for url, modified in entries:
+            if url in lastmod:
+                continue
+            lastmod[url] = modified
+            url_id = len(urls)
+            urls.append(url)
+            key = url.lower()
+            keys.append(key)
+            for gram in ngrams(key):
+                postings.setdefault(gram, set()).add(url_id)
+
+        with self._lock:
+            self._urls = urls
+            self._keys = keys
+            self._lastmod = lastmod
+            self._postings = postings
+            self.loaded_at = time.time()
+            self.complete = complete
+            if complete:
+                self.failed_at = None
+        logger.info(f"Loaded {len(urls)} URLs from sitemap {self.sitemap_url}")
+        return complete
+
+    def _refresh_in_background(self) -> threading.Event:
+        """Tek bir arka plan yenilemesi başlat (sürüyorsa ona katıl), bitince set edilen olayı döndür"""
+        with self._lock:
+            if self._loading is not None:
+                return self._loading
+            loading = self._loading = threading.Event()
+
+        def run():
+            try:
+                # Boş bağlamda çalışır: arama deadline'ı indirmeyi kesmez
+                contextvars.Context().run(self.refresh)
+            finally:
+                with self._lock:
+                    self._loading = None
+                loading.set()
+
+        threading.Thread(target=run, name='sitemap-refresh', daemon=True).start()
+        return loading
+
+    def _collect(self, sitemap_url: str, depth: int, failed_children: List[str]) -> List[SitemapEntry]:
+        """
+        Sitemap'i (ve index ise alt sitemap'leri) akış halinde ayrıştır
+
+        Alınamayan alt sitemap'ler atlanır ve failed_children'a eklenir.
+        """
+        entries, children = self._parse(sitemap_url)
+        if children and depth < MAX_SITEMAP_DEPTH:
+            if self.child_pattern:
+                children = [child for child in children if self.child_pattern.search(child)]
+            for child in children[:MAX_CHILD_SITEMAPS]:
+                try:
+                    entries.extend(self._collect(child, depth + 1, failed_children))
+                except Exception as e:
+                    logger.warning(f"Failed to load child sitemap {child}: {e}")
+                    failed_children.append(child)
+        return entries
+
+    def _parse(self, sitemap_url: str) -> Tuple[List[SitemapEntry], List[str]]:
+        """
+        Tek sitemap dosyasını indirirken ayrıştır
+
+        Returns:
+            (URL girdileri, alt sitemap URL'leri)
+        """
+        entries: List[SitemapEntry] = []
+        children: List[str] = []
+        parser = ET.XMLPullParser(events=('end',))
+        # .xml.gz dosyaları Content-Encoding olmadan sıkıştırılmış gelir
+        gunzip = zlib.decompressobj(16 + zlib.MAX_WBITS) if sitemap_url.endswith('.gz') else None
+
+        response = self.http.get(sitemap_url, headers=self.headers, stream=True)
+        with closing(response):
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                parser.feed(gunzip.decompress(chunk) if gunzip else chunk)
+                self._read_events(parser, entries, children)
+        parser.close()
+        self._read_events(parser, entries, children)
+        return entries, children
+
+    def _read_events(self, parser: ET.XMLPullParser, entries: List[SitemapEntry], children: List[str]):
+        for _, element in parser.read_events():
+            name = _local_name(element.tag)
+            if name not in ('url', 'sitemap'):
+                continue
+            loc, modified = None, None
+            for child in element:
+                child_name = _local_name(child.tag)
+                if child_name == 'loc':
+                    loc = (child.text or '').strip()
+                elif child_name == 'lastmod':
+                    modified = (child.text or '').strip() or None
+            # İşlenen elemanı bırak - büyük sitemap'lerde bellek sabit kalır
+            element.clear()
+            if not loc:
+                continue
+            if name == 'sitemap':
+                children.append(loc)
+            elif self.url_pattern is None or self.url_pattern.search(loc):
+                entries.append((loc, modified))
+
+    # --- sorgu ---
+
+    def urls(self) -> List[str]:
+        """Tüm URL'ler (sitemap sırasıyla)"""
+        with self._lock:
+            return list(self._urls)
+
+    def lastmod(self, url: str) -> Optional[str]:
+        """URL'nin sitemap'teki <lastmod> değeri"""
+        with self._lock:
+            return self._lastmod.get(url)
+
+    def entries(self) -> List[SitemapEntry]:
+        """(URL, lastmod) çiftleri (sitemap sırasıyla)"""
+        with self._lock:
+            return [(url, self._lastmod.get(url)) for url in self._urls]
+
+    def lookup(self, query: str, match_all: bool = True, limit: Optional[int] = None) -> List[str]:
+        """
+        Sorgu kelimelerini içeren URL'leri bul
+
+        Args:
+            query: Arama terimi
+            match_all: True ise tüm kelimeler, False ise herhangi biri eşleşmeli
+            limit: En fazla sonuç sayısı
+
+        Returns:
+            Eşleşen URL'ler (sitemap sırasıyla)
+        """
+        words = query.lower().split()
+        if not words:
+            return []
+
+        with self._lock:
+            indexed, short = [], []
+            for word in words:
+                ids = self._word_ids(word)
+                if ids is None:
+                    short.append(word)
+                else:
+                    indexed.append(ids)
+
+            # N-gram'dan kısa kelimeler indekslenemez; aday kümesine filtre olarak uygulanır
+            if match_all:
+                if indexed:
+                    matched = set.intersection(*sorted(indexed, key=len))
+                else:
+                    matched = set(range(len(self._keys)))
+                if short:
+                    matched = {i for i in matched if all(word in self._keys[i] for word in short)}
+            else:
+                matched = set().union(*indexed)
+                if short:
+                    matched |= {i for i, key in enumerate(self._keys) if any(word in key for word in short)}
+
+            result = [self._urls[url_id] for url_id in sorted(matched)]
+
+        return result[:limit] if limit is not None else result
+
+    def _word_ids(self, word: str) -> Optional[Set[int]]:
+        """Kelimeyi içeren URL'ler (kelime n-gram'dan kısaysa None)"""
+        grams = ngrams(word)
+        if not grams:
+            return None
+        postings = sorted((self._postings.get(gram, _NO_IDS) for gram in grams), key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        return {i for i in candidates if word in self._keys[i]}
+
+    def stats(self) -> Dict:
+        """İndeks istatistikleri"""
+        with self._lock:
+            return {
+                'sitemap': self.sitemap_url,
+                'urls': len(self._urls),
+                'ngrams': len(self._postings),
+                'complete': self.complete,
+                'age_seconds': int(time.time() - self.loaded_at) if self.loaded_at else None
+            }
+
+
+_indexes: Dict[Tuple[str, Optional[str]], SitemapIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_sitemap_index(sitemap_url: str, url_pattern: Optional[str] = None, **kwargs) -> SitemapIndex:
+    """
+    Süreç genelinde paylaşılan sitemap indeksi (sitemap URL'si ve filtre başına bir tane)
+
+    Args:
+        sitemap_url: Kök sitemap URL'si
+        url_pattern: URL filtresi (regex)
+        **kwargs: İlk oluşturmada SitemapIndex'e verilecek diğer ayarlar
+
+    Returns:
+        SitemapIndex
+    """
+    key = (sitemap_url, url_pattern)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = SitemapIndex(sitemap_url, url_pattern, **kwargs)
+            _indexes[key] = index
+        return index
+
+
+def sitemap_stats() -> List[Dict]:
+    """Yüklü tüm sitemap indekslerinin istatistikleri"""
+    with _indexes_lock:
+        indexes = list(_indexes.values())
+    return [index.stats() for index in indexes]
@@ -0,0 +1,234 @@
+"""
+Parça numarası (SKU/MPN/GTIN) ile tam eşleşme indeksi
+"REV-21-1650", "217-8080", "am-4567" gibi sorgular tek sözlük aramasıyla veritabanı, katalog ve doğrulanmış ürünlerden yanıtlanır
+"""
+
+import re
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+import logging
+
+from entity_resolution import canonical_url, normalize_identifier
+from expiry_index import ExpiryIndex
+
+logger = logging.getLogger(__name__)
+
+# Tedarikçi parça numarası biçimleri - ürün adı ve URL'lerinden de çıkarılır (ayraç '-' veya boşluk)
+PART_NUMBER_PATTERNS = {
+    'REV Robotics': re.compile(r'\brev[-\s]?\d{2}[-\s]?\d{4}\b', re.IGNORECASE),
+    'WCP': re.compile(r'\bwcp[-\s]?\d{4}\b', re.IGNORECASE),
+    'VEXpro / WCP': re.compile(r'\b217[-\s]\d{4}\b'),
+    'AndyMark': re.compile(r'\bam[-\s]?\d{3,5}[a-z]?\b', re.IGNORECASE),
+    'CTRE': re.compile(r'\b\d{2}-\d{6}\b')
+}
+
+# Bilinen bir biçime uymayan tek kelimelik sorgular da rakam içeriyorsa indekste aranır
+_GENERIC_PART_NUMBER_RE = re.compile(r'^(?=.*\d)[A-Za-z0-9][A-Za-z0-9._/-]*$')
+
+# Sayfalardan doğrulanan ürünlerin indekste kalma süresi (ürün önbelleği TTL'i)
+PAGE_PRODUCT_TTL = 24 * 3600
+
+
+def looks_like_part_number(query: str) -> bool:
+    """
+    Sorgu parça numarası gibi mi görünüyor
+
+    Bilinen tedarikçi biçimleri ('REV-21-1650', 'am-4567') veya rakam
+    içeren, boşluksuz ve normalize hali en az MIN_IDENTIFIER_LENGTH
+    karakter olan tek kelime ('WCP0384', '14-802004').
+    """
+    text = query.strip()
+    if not text or normalize_identifier(text) is None:
+        return False
+    if any(pattern.fullmatch(text) for pattern in PART_NUMBER_PATTERNS.values()):
+        return True
+    return bool(_GENERIC_PART_NUMBER_RE.match(text))
+
+
+def product_identifiers(product: Dict) -> List[str]:
+    """
+    Ürünün normalize parça numaraları
+
+    SKU/MPN/GTIN alanları ve ürün adı ile URL'de geçen tedarikçi
+    parça numaraları ('.../rev-21-1650/' -> 'REV211650').
+    """
+    values = [product.get('sku'), product.get('mpn'), product.get('gtin')]
+    values.extend(product.get('skus') or [])
+    text = f"{product.get('name') or ''} {product.get('url') or ''}"
+    for pattern in PART_NUMBER_PATTERNS.values():
+        values.extend(pattern.findall(text))
+
+    identifiers = []
+    for value in values:
+        identifier = normalize_identifier(value)
+        if identifier and identifier not in identifiers:
+            identifiers.append(identifier)
+    return identifiers
+
+
+class SkuIndex:
+    """
+    Normalize parça numarası -> ürünler hash indeksi
+
+    Üç kaynak ayrı sözlüklerde tutulur ve arama bu sırayla birleştirilir:
+    parça veritabanı (kurulumda bir kez), senkronize katalog (katalog her
+    değiştiğinde tümüyle yeniden kurulup atomik olarak değiştirilir) ve
+    sayfalardan doğrulanan ürünler (ürün önbelleğine yazılırken eklenir,
+    TTL dolunca eşleşmez). Her kaynakta bir ürün kanonik URL'siyle bir kez
+    tutulur. Süresi dolan sayfa ürünleri her ekleme ve aramada
+    ExpiryIndex ile silinir; iş yalnızca süresi dolan kayıtlar kadardır.
+    """
+
+    def __init__(self, parts_index=None):
+        """
+        Args:
+            parts_index: PartsIndex (veritabanı ürünleri, opsiyonel)
+        """
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._database: Dict[str, Dict[str, Dict]] = {}
+        self._catalog: Dict[str, Dict[str, Dict]] = {}
+        self._pages: Dict[str, Dict[str, Dict]] = {}
+        self._page_expiry: Dict[str, float] = {}
+        self._page_identifiers: Dict[str, List[str]] = {}
+        self._expiry = ExpiryIndex()
+        self._catalog_synced_at: Optional[float] = None
+        if parts_index is not None:
+            products = []
+            for key in parts_index.part_keys:
+                products.extend({**product, 'source': 'database'} for product in parts_index.get(key))
+            self._database = self._build(products)
+
+    @staticmethod
+    def _build(products: Iterable[Dict]) -> Dict[str, Dict[str, Dict]]:
+        """Ürünlerden parça numarası -> {kanonik URL -> ürün} sözlüğü"""
+        index: Dict[str, Dict[str, Dict]] = {}
+        for product in products:
+            url = canonical_url(product.get('url')) or product.get('name')
+            for identifier in product_identifiers(product):
+                index.setdefault(identifier, {}).setdefault(url, product)
+        return index
+
+    def lookup(self, query: str) -> List[Dict]:
+        """
+        Parça numarasıyla tam eşleşen ürünler
+
+        Args:
+            query: Parça numarası ('REV-21-1650', 'rev 21 1650', 'REV211650' aynıdır)
+
+        Returns:
+            Ürünlerin kopyaları (veritabanı, katalog, sayfa sırasıyla; aynı URL bir kez)
+        """
+        identifier = normalize_identifier(query)
+        if identifier is None:
+            return []
+        now = time.time()
+        results, seen = [], set()
+        with self._lock:
+            self._purge_expired(now)
+            sources = [(self._database, False), (self._catalog, False), (self._pages, True)]
+            for index, expires in sources:
+                for url, product in index.get(identifier, {}).items():
+                    if url in seen or (expires and self._page_expiry.get(url, 0) <= now):
+                        continue
+                    seen.add(url)
+                    results.append(dict(product))
+        return results
+
+    def refresh_catalog(self, catalog_store) -> bool:
+        """
+        Katalog kısmını CatalogStore değiştiyse yeniden kur
+
+        Args:
+            catalog_store: CatalogStore
+
+        Returns:
+            Yeniden kurulduysa True
+        """
+        with self._refresh_lock:
+            last_synced = catalog_store.last_synced_at()
+            if last_synced is None or last_synced == self._catalog_synced_at:
+                return False
+            products = [
+                {**product, 'vendor': vendor, 'source': 'catalog'}
+                for vendor, product in catalog_store.products()
+            ]
+            catalog = self._build(products)
+            with self._lock:
+                self._catalog = catalog
+                self._catalog_synced_at = last_synced
+        logger.info(f"SKU index rebuilt from catalog: {len(products)} products, {len(catalog)} part numbers")
+        return True
+
+    def add_page_product(self, product: Dict, ttl: int = PAGE_PRODUCT_TTL):
+        """
+        Sayfadan doğrulanan ürünü ekle (ürün önbelleğine yazılırken)
+
+        Args:
+            product: Ürün
+            ttl: İndekste kalma süresi (saniye)
+        """
+        url = canonical_url(product.get('url'))
+        identifiers = product_identifiers(product)
+        if not url or not identifiers:
+            return
+        now = time.time()
+        with self._lock:
+            self._purge_expired(now)
+            self._remove_page(url)
+            for identifier in identifiers:
+                self._pages.setdefault(identifier, {})[url] = product
+            self._page_identifiers[url] = identifiers
+            self._page_expiry[url] = now + ttl
+            self._expiry.schedule('pages', url, now + ttl)
+
+    def _remove_page(self, url: str):
+        """Sayfa ürününü indeksten çıkar (kilit tutulurken çağrılır)"""
+        for identifier in self._page_identifiers.pop(url, ()):
+            products = self._pages.get(identifier)
+            if products is not None:
+                products.pop(url, None)
+                if not products:
+                    del self._pages[identifier]
+        self._page_expiry.pop(url, None)
+
+    def _purge_expired(self, now: float) -> int:
+        """Süresi dolmuş sayfa ürünlerini sil (kilit tutulurken çağrılır)"""
+        expired = self._expiry.pop_expired(now)
+        for _, url in expired:
+            self._remove_page(url)
+        return len(expired)
+
+    def purge_expired(self) -> int:
+        """Süresi dolmuş sayfa ürünlerini sil"""
+        with self._lock:
+            return self._purge_expired(time.time())
+
+    def clear_pages(self):
+        """Sayfa ürünlerini sil (ürün önbelleği temizlenirken)"""
+        with self._lock:
+            self._pages.clear()
+            self._page_expiry.clear()
+            self._page_identifiers.clear()
+            self._expiry.clear('pages')
+
+    def stats(self) -> Dict:
+        """İndeks istatistikleri (kaynak başına parça numarası sayısı)"""
+        with self._lock:
+            return {
+                'database': len(self._database),
+                'catalog': len(self._catalog),
+                'pages': len(self._pages)
+            }
+
+
+if __name__ == "__main__":
+    from parts_index import PARTS_INDEX
+
+    index = SkuIndex(PARTS_INDEX)
+    print(index.stats())
+    for sample in ['REV-21-1650', 'rev 21 1651', 'am-4567', 'neo 550', 'WCP0384']:
+        hits = index.lookup(sample) if looks_like_part_number(sample) else None
+        print(f"{sample!r:15} part number={looks_like_part_number(sample)!s:5} -> "
+              f"{[(hit['vendor'], hit['name']) for hit in hits] if hits else hits}")
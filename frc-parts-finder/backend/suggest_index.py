@@ -0,0 +1,303 @@
+"""
+Arama kutusu için otomatik tamamlama
+Veritabanı anahtarları, takma adlar, katalog başlıkları ve SKU'lar önek ağacında tutulur; her düğüm en popüler tamamlamaları önceden saklar
+"""
+
+import math
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, FrozenSet, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Varsayılan ve en fazla öneri sayısı
+SUGGEST_LIMIT = 8
+SUGGEST_MAX_LIMIT = 20
+
+# Düğüm başına saklanan en iyi girdiler (aynı metnin tekrarları elenebilsin diye limitin iki katı)
+TOP_PER_NODE = 2 * SUGGEST_MAX_LIMIT
+
+# Ağacın derinliği: daha uzun önekler bu derinlikteki düğümün girdileri süzülerek yanıtlanır.
+# Başlık ortasındaki kelimeler daha sığ eklenir (bellek: binlerce katalog başlığı)
+MAX_PREFIX_LENGTH = 24
+MAX_WORD_PREFIX_LENGTH = 12
+
+# Ağaç bu aralıkla (saniye) arka planda yeniden kurulur: yeni katalog ürünleri ve popülerlik
+SUGGEST_REBUILD_INTERVAL = 300
+
+# Girdi türlerinin temel puanı - popülerlik log ölçeğinde eklenir
+KIND_WEIGHTS = {'part': 3.0, 'alias': 2.0, 'catalog': 1.0, 'sku': 0.5}
+POPULARITY_WEIGHT = 1.0
+
+
+def normalize_prefix(text: str) -> str:
+    """Küçük harf, tekil boşluk"""
+    return ' '.join(text.lower().split())
+
+
+class _Node:
+    __slots__ = ('children', 'top')
+
+    def __init__(self):
+        self.children: Dict[str, '_Node'] = {}
+        self.top: List[int] = []
+
+
+class SuggestTrie:
+    """
+    Değişmez önek ağacı (trie)
+
+    Girdiler puana göre sıralanıp sırayla eklenir; böylece her düğümün
+    'top' listesi, altındaki en iyi TOP_PER_NODE girdiyi sıralı tutar ve
+    sorgu yalnızca önek uzunluğu kadar sözlük araması yapar. Çok kelimeli
+    metinler her kelime başından da eklenir ("x60" -> "Kraken X60 ...").
+    """
+
+    def __init__(self, entries: List[Dict], popularity: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            entries: {'text', 'kind', 'query', ...} girdileri
+            popularity: Normalize sorgu/parça anahtarı -> arama sayısı
+        """
+        popularity = popularity or {}
+        scored = []
+        for entry in entries:
+            count = popularity.get(normalize_prefix(entry['query']), 0)
+            if entry.get('key') and entry['key'] != entry['query']:
+                count += popularity.get(entry['key'], 0)
+            score = KIND_WEIGHTS.get(entry['kind'], 0) + POPULARITY_WEIGHT * math.log1p(count)
+            scored.append((-score, len(entry['text']), entry['text'].lower(), entry))
+        scored.sort(key=lambda item: item[:3])
+        self.entries: List[Dict] = [
+            {**entry, 'score': round(-negative_score, 3)} for negative_score, _, _, entry in scored
+        ]
+        # Popülerliği sayılabilecek sorgular (girdilerin sorguları ve parça anahtarları)
+        self.queries: FrozenSet[str] = frozenset(
+            [normalize_prefix(entry['query']) for entry in self.entries]
+            + [entry['key'] for entry in self.entries if entry.get('key')]
+        )
+
+        self._root = _Node()
+        self.node_count = 1
+        for entry_id, entry in enumerate(self.entries):
+            text = normalize_prefix(entry['text'])
+            self._insert(text, entry_id, MAX_PREFIX_LENGTH)
+            for position, char in enumerate(text):
+                if char == ' ':
+                    self._insert(text[position + 1:], entry_id, MAX_WORD_PREFIX_LENGTH)
+
+    def _insert(self, text: str, entry_id: int, depth: int):
+        node = self._root
+        for char in text[:depth]:
+            child = node.children.get(char)
+            if child is None:
+                child = _Node()
+                node.children[char] = child
+                self.node_count += 1
+            node = child
+            # Girdiler puan sırasıyla eklendiği için liste sıralı kalır
+            if len(node.top) < TOP_PER_NODE and (not node.top or node.top[-1] != entry_id):
+                node.top.append(entry_id)
+
+    def complete(self, prefix: str, limit: int = SUGGEST_LIMIT) -> List[Dict]:
+        """
+        Öneki tamamlayan en iyi girdiler
+
+        Args:
+            prefix: Kullanıcının yazdığı metin
+            limit: En fazla öneri
+
+        Returns:
+            Girdiler (aynı metin bir kez, puana göre sıralı)
+        """
+        prefix = normalize_prefix(prefix)
+        if not prefix:
+            return []
+        node = self._root
+        depth = 0
+        for char in prefix[:MAX_PREFIX_LENGTH]:
+            child = node.children.get(char)
+            if child is None:
+                break
+            node, depth = child, depth + 1
+        # Ağaç önekin tamamını kapsamıyorsa sığ eklenen kelime başlarından süzülür
+        if depth < len(prefix) and depth < MAX_WORD_PREFIX_LENGTH:
+            return []
+
+        results, seen = [], set()
+        for entry_id in node.top:
+            entry = self.entries[entry_id]
+            text = entry['text'].lower()
+            if text in seen:
+                continue
+            if depth < len(prefix) and not self._has_word_prefix(text, prefix):
+                continue
+            seen.add(text)
+            results.append(entry)
+            if len(results) >= limit:
+                break
+        return results
+
+    @staticmethod
+    def _has_word_prefix(text: str, prefix: str) -> bool:
+        text = normalize_prefix(text)
+        return text.startswith(prefix) or f" {prefix}" in text
+
+
+def collect_entries(parts_index, catalog_store=None) -> List[Dict]:
+    """
+    Öneri girdilerini topla
+
+    Args:
+        parts_index: PartsIndex (anahtarlar ve takma adlar)
+        catalog_store: CatalogStore (ürün başlıkları ve SKU'lar, opsiyonel)
+
+    Returns:
+        Girdi listesi
+    """
+    entries = []
+    for key, part_key in parts_index.key_map.items():
+        entries.append({'text': key, 'kind': 'part' if key == part_key else 'alias', 'query': key, 'key': part_key})
+
+    if catalog_store is not None:
+        try:
+            products = catalog_store.products()
+        except Exception as e:
+            logger.warning(f"Failed to read catalog for suggestions: {e}")
+            products = []
+        for vendor, product in products:
+            if not product.get('name'):
+                continue
+            entries.append({'text': product['name'], 'kind': 'catalog', 'query': product['name'],
+                            'vendor': vendor, 'url': product.get('url')})
+            for sku in product.get('skus') or []:
+                entries.append({'text': sku, 'kind': 'sku', 'query': sku, 'vendor': vendor,
+                                'url': product.get('url'), 'name': product['name']})
+    return entries
+
+
+class SuggestService:
+    """
+    Otomatik tamamlama servisi
+
+    Ağaç ilk öneri isteğinde veya ilk kaydedilen aramada kurulur;
+    SUGGEST_REBUILD_INTERVAL dolunca eski ağaç sunulmaya devam ederken
+    arka planda yeniden kurulur. Aramalar
+    popülerlik sayacını artırır, sayaç bir sonraki kurulumda sıralamaya
+    yansır. Yalnızca ağaçtaki bir girdiye veya parça anahtarına karşılık
+    gelen sorgular sayılır; böylece sayaç serbest metin sorgularıyla
+    sınırsız büyümez.
+    """
+
+    def __init__(self, collect: Callable[[], List[Dict]], rebuild_interval: float = SUGGEST_REBUILD_INTERVAL):
+        """
+        Args:
+            collect: Girdileri döndüren fonksiyon (ör. collect_entries ile)
+            rebuild_interval: Yeniden kurulum aralığı (saniye)
+        """
+        self.collect = collect
+        self.rebuild_interval = rebuild_interval
+        self.popularity: Counter = Counter()
+        self._trie: Optional[SuggestTrie] = None
+        self.built_at: Optional[float] = None
+        self.build_seconds: Optional[float] = None
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._rebuilding = False
+
+    def record(self, query: str, part_key: Optional[str] = None):
+        """
+        Aramayı popülerliğe ekle
+
+        Args:
+            query: Arama terimi
+            part_key: Sorgunun eşleştiği parça anahtarı (varsa)
+        """
+        query = normalize_prefix(query)
+        # Ağaç henüz kurulmadıysa burada kurulur; aksi halde ilk aramalar sayılmazdı
+        trie = self._current()
+        with self._lock:
+            # Ağaçta karşılığı olmayan sorgu sıralamayı etkilemez, tutulmaz
+            if query in trie.queries:
+                self.popularity[query] += 1
+            if part_key and part_key != query:
+                self.popularity[part_key] += 1
+
+    def suggest(self, prefix: str, limit: int = SUGGEST_LIMIT) -> List[Dict]:
+        """
+        Öneki tamamlayan öneriler
+
+        Args:
+            prefix: Kullanıcının yazdığı metin
+            limit: En fazla öneri (1..SUGGEST_MAX_LIMIT)
+
+        Returns:
+            Öneriler (puana göre sıralı)
+        """
+        limit = max(1, min(SUGGEST_MAX_LIMIT, limit))
+        return self._current().complete(prefix, limit)
+
+    def rebuild(self) -> SuggestTrie:
+        """Ağacı güncel girdiler ve popülerlikle yeniden kur"""
+        with self._build_lock:
+            started = time.time()
+            with self._lock:
+                popularity = dict(self.popularity)
+            trie = SuggestTrie(self.collect(), popularity)
+            with self._lock:
+                self._trie = trie
+                self.built_at = time.time()
+                self.build_seconds = round(self.built_at - started, 3)
+            logger.info(f"Built suggest trie: {len(trie.entries)} entries, {trie.node_count} nodes "
+                        f"in {self.build_seconds}s")
+            return trie
+
+    def _current(self) -> SuggestTrie:
+        with self._lock:
+            trie, built_at = self._trie, self.built_at
+        if trie is None:
+            return self.rebuild()
+        if time.time() - built_at >= self.rebuild_interval:
+            self._rebuild_in_background()
+        return trie
+
+    def _rebuild_in_background(self):
+        with self._lock:
+            if self._rebuilding:
+                return
+            self._rebuilding = True
+
+        def run():
+            try:
+                self.rebuild()
+            except Exception as e:
+                logger.warning(f"Suggest trie rebuild failed: {e}")
+            finally:
+                with self._lock:
+                    self._rebuilding = False
+
+        threading.Thread(target=run, name='suggest-rebuild', daemon=True).start()
+
+    def stats(self) -> Dict:
+        """Ağaç istatistikleri"""
+        with self._lock:
+            trie = self._trie
+            return {
+                'entries': len(trie.entries) if trie else 0,
+                'nodes': trie.node_count if trie else 0,
+                'build_seconds': self.build_seconds,
+                'age_seconds': int(time.time() - self.built_at) if self.built_at else None,
+                'tracked_queries': len(self.popularity)
+            }
+
+
+if __name__ == "__main__":
+    from parts_index import PARTS_INDEX
+
+    service = SuggestService(lambda: collect_entries(PARTS_INDEX))
+    service.record('kraken x60', 'kraken')
+    for sample in ['n', 'neo', 'sp', 'kr', 'tal', 'x6']:
+        print(f"{sample!r:6} -> {[entry['text'] for entry in service.suggest(sample, 5)]}")
+    print(service.stats())
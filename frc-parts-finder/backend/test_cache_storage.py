@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Önbellek depolama katmanı testleri
+SQLite ve JSON depoları, JSON'dan tek seferlik aktarım ve write-behind günlüğü
+"""
+
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from cache_storage import CacheStorage, JSONFileStorage, SQLiteCacheStorage, WriteBehindStorage
+
+
+def _entry(value, timestamp=100.0, ttl=60):
+    return {'data': value, 'timestamp': timestamp, 'ttl': ttl}
+
+
+def _check_roundtrip(storage):
+    """Tüm depoların ortak davranışı"""
+    storage.set('url', 'a', _entry(1))
+    storage.set_many('url', {'b': _entry(2), 'c': _entry(3, ttl=None)})
+    storage.set('search', 'a', _entry('other namespace'))
+    assert storage.get('url', 'a') == _entry(1)
+    assert storage.get('url', 'missing') is None
+    assert storage.count('url') == 3
+    assert sorted(storage.expiry_items('url')) == [('a', 100.0, 60), ('b', 100.0, 60), ('c', 100.0, None)]
+
+    storage.delete('url', 'a')
+    storage.delete_many('url', ['b', 'missing'])
+    assert list(storage.load('url')) == ['c']
+    storage.clear('url')
+    assert storage.count('url') == 0
+    assert storage.get('search', 'a') == _entry('other namespace')
+
+
+def test_storage_is_abstract():
+    """CacheStorage arayüzü doğrudan örneklenemez"""
+    try:
+        CacheStorage()
+    except TypeError:
+        return
+    raise AssertionError("CacheStorage should be abstract")
+
+
+def test_sqlite_storage():
+    """SQLite deposu kayıtları satır bazında saklar ve yeniden açılınca korur"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'cache.db')
+        storage = SQLiteCacheStorage(path)
+        _check_roundtrip(storage)
+        storage.set('product', 'p', _entry({'name': 'NEO'}))
+        storage.close()
+
+        reopened = SQLiteCacheStorage(path)
+        assert reopened.get('product', 'p') == _entry({'name': 'NEO'})
+        reopened.close()
+
+
+def test_json_storage():
+    """JSON deposu namespace başına dosyaya yazar"""
+    with tempfile.TemporaryDirectory() as directory:
+        files = {namespace: os.path.join(directory, f'{namespace}.json') for namespace in ('url', 'search')}
+        storage = JSONFileStorage(files)
+        _check_roundtrip(storage)
+        storage.set('url', 'x', _entry(5))
+        with open(files['url'], encoding='utf-8') as f:
+            assert json.load(f) == {'x': _entry(5)}
+
+
+def test_json_migration_runs_once_and_keeps_newer_rows():
+    """JSON kayıtları bir kez aktarılır, mevcut satırların üzerine yazılmaz"""
+    with tempfile.TemporaryDirectory() as directory:
+        url_file = os.path.join(directory, 'url.json')
+        with open(url_file, 'w', encoding='utf-8') as f:
+            json.dump({'a': _entry('old'), 'b': _entry('json'), 'broken': 'not a dict'}, f)
+        storage = SQLiteCacheStorage(os.path.join(directory, 'cache.db'))
+        storage.set('url', 'a', _entry('new'))
+        assert storage.migrate_from_json({'url': url_file, 'search': os.path.join(directory, 'none.json')}) == 2
+        assert storage.migrate_from_json({'url': url_file}) == 0
+        assert storage.get('url', 'a') == _entry('new')
+        assert storage.get('url', 'b') == _entry('json')
+        assert storage.count('url') == 2
+        storage.close()
+
+
+def test_write_behind_reads_journal_and_flushes():
+    """Yazımlar hemen okunur, flush'a kadar alttaki depoya gitmez"""
+    with tempfile.TemporaryDirectory() as directory:
+        inner = SQLiteCacheStorage(os.path.join(directory, 'cache.db'))
+        inner.set('url', 'old', _entry('persisted'))
+        storage = WriteBehindStorage(inner, flush_interval=60, flush_threshold=1000)
+        try:
+            storage.set('url', 'a', _entry(1))
+            storage.delete('url', 'old')
+            assert storage.get('url', 'a') == _entry(1)
+            assert storage.get('url', 'old') is None
+            assert inner.get('url', 'a') is None
+            assert storage.pending_count() == 2
+
+            storage.clear('url')
+            storage.set('url', 'b', _entry(2))
+            assert storage.get('url', 'a') is None
+            assert storage.get('url', 'b') == _entry(2)
+
+            storage.flush()
+            assert storage.pending_count() == 0
+            assert inner.load('url') == {'b': _entry(2)}
+            storage.set('url', 'c', _entry(3))
+        finally:
+            storage.close()
+
+        reopened = SQLiteCacheStorage(os.path.join(directory, 'cache.db'))
+        assert sorted(reopened.load('url')) == ['b', 'c']
+        reopened.close()
+
+
+if __name__ == "__main__":
+    for test in [test_storage_is_abstract, test_sqlite_storage, test_json_storage,
+                 test_json_migration_runs_once_and_keeps_newer_rows, test_write_behind_reads_journal_and_flushes]:
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Listeleme gruplama testleri
+Kanonik URL, tanımlayıcı normalizasyonu, birleşim-bul gruplaması ve teklifler
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from entity_resolution import attach_offers, canonical_url, normalize_identifier, resolve_listings
+
+
+def test_canonical_url():
+    """Şema, www, parametreler, sondaki '/' ve Shopify koleksiyon yolu atılır"""
+    assert canonical_url('https://www.RevRobotics.com/rev-21-1650/?ref=x#top') == 'revrobotics.com/rev-21-1650'
+    assert canonical_url('http://wcproducts.com/collections/gears/products/gear-1') == 'wcproducts.com/products/gear-1'
+    assert canonical_url('') is None
+    assert canonical_url('not a url') is None
+
+
+def test_normalize_identifier():
+    """Büyük harf ve alfanümerik; GTIN'ler 14 haneye tamamlanır; kısa değerler None"""
+    assert normalize_identifier('am-4213') == 'AM4213'
+    assert normalize_identifier('REV 21-1650') == 'REV211650'
+    assert normalize_identifier('012345678905') == normalize_identifier('0012345678905') == '00012345678905'
+    assert normalize_identifier('a-1') is None
+    assert normalize_identifier(None) is None
+
+
+def test_transitive_grouping():
+    """URL ile eşleşen ve SKU ile eşleşen listelemeler geçişli olarak tek grupta toplanır"""
+    listings = [
+        {'name': 'A', 'url': 'https://www.revrobotics.com/rev-21-2800/', 'sku': 'REV-21-2800', 'source': 'shopify'},
+        {'name': 'B', 'url': 'https://example.com/other', 'source': 'woocommerce'},
+        {'name': 'C', 'url': 'https://revrobotics.com/rev-21-2800', 'source': 'real_vendors'},
+        {'name': 'D', 'url': 'https://reseller.com/maxspline', 'sku': 'rev 21 2800', 'source': 'woocommerce'},
+        {'name': 'E', 'url': 'https://reseller.com/other', 'sku': 'a-1', 'source': 'woocommerce'},
+        {'name': 'F', 'url': 'https://reseller.com/other2', 'sku': 'a-1', 'source': 'woocommerce'},
+    ]
+    groups = resolve_listings(listings)
+    assert [[listing['name'] for listing in group.listings] for group in groups] == [
+        ['A', 'C', 'D'], ['B'], ['E'], ['F']
+    ]
+    # Temsilci kaynak önceliğine göre seçilir
+    assert groups[0].representative['name'] == 'C'
+
+
+def test_offers_skip_rejected_and_sort_by_price():
+    """Teklifler fiyata göre sıralı, aynı tedarikçi+URL bir kez, reddedilenler yok"""
+    listings = [
+        {'vendor': 'REV', 'url': 'https://revrobotics.com/p', 'sku': 'REV-21-2800', 'price': 9.0},
+        {'vendor': 'REV', 'url': 'https://www.revrobotics.com/p/', 'sku': 'REV-21-2800', 'price': 9.0},
+        {'vendor': 'Reseller', 'url': 'https://reseller.com/p', 'sku': 'REV-21-2800', 'price': None},
+        {'vendor': 'Cheap', 'url': 'https://cheap.com/p', 'sku': 'REV-21-2800', 'price': 5.0},
+    ]
+    group = resolve_listings(listings)[0]
+    product = attach_offers({}, group, rejected=[listings[3]])
+    assert [offer['vendor'] for offer in product['offers']] == ['REV', 'Reseller']
+    assert product['vendor_count'] == 2
+
+
+if __name__ == "__main__":
+    for test in [test_canonical_url, test_normalize_identifier, test_transitive_grouping,
+                 test_offers_skip_rejected_and_sort_by_price]:
+        test()
+        print(f"✅ {test.__name__}")
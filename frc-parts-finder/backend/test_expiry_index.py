@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Son kullanma indeksi testleri
+Lazy deletion, sayaçlar, heap sıkıştırma ve süre dolumu sırasında yenilenen önbellek kayıtları
+"""
+
+import sys
+import os
+import tempfile
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from cache_manager import CacheManager
+from cache_storage import SQLiteCacheStorage
+from expiry_index import ExpiryIndex
+
+
+def test_pop_expired_returns_only_due_keys():
+    """Yalnızca süresi dolmuş kayıtlar döner ve indeksten çıkar"""
+    index = ExpiryIndex()
+    index.schedule('url', 'a', 10.0)
+    index.schedule('url', 'b', 20.0)
+    index.schedule('search', 'c', 5.0)
+    assert sorted(index.pop_expired(15.0)) == [('search', 'c'), ('url', 'a')]
+    assert index.pop_expired(15.0) == []
+    assert index.count('url') == 1
+    assert index.count('search') == 0
+
+
+def test_rescheduled_key_skips_stale_heap_entry():
+    """Güncellenen kaydın eski heap girdisi geçersiz sayılır (lazy deletion)"""
+    index = ExpiryIndex()
+    index.schedule('url', 'a', 10.0)
+    index.schedule('url', 'a', 30.0)
+    assert index.count('url') == 1
+    assert index.pop_expired(20.0) == []
+    assert index.pop_expired(40.0) == [('url', 'a')]
+
+
+def test_discard_and_clear():
+    """Silinen ve temizlenen kayıtlar bir daha dönmez"""
+    index = ExpiryIndex()
+    index.schedule('url', 'a', 10.0)
+    index.schedule('product', 'b', 10.0)
+    index.discard('url', 'a')
+    index.discard('url', 'a')
+    assert index.count('url') == 0
+    index.clear('product')
+    assert index.pop_expired(100.0) == []
+
+
+def test_compaction_keeps_live_entries():
+    """Çok sayıda güncelleme heap'i sıkıştırır, canlı kayıtlar korunur"""
+    index = ExpiryIndex()
+    for step in range(500):
+        index.schedule('url', 'a', float(step))
+    index.schedule('url', 'b', 1000.0)
+    assert len(index._heap) < 500
+    assert index.pop_expired(600.0) == [('url', 'a')]
+    assert index.count('url') == 1
+
+
+class _RefreshingStorage(SQLiteCacheStorage):
+    """İlk delete_many sırasında aynı kaydı başka thread'den yenileyen depo"""
+
+    def __init__(self, db_path):
+        super().__init__(db_path)
+        self.cache = None
+        self.writer = None
+
+    def delete_many(self, namespace, keys):
+        if self.writer is None:
+            self.writer = threading.Thread(target=lambda: self.cache.set_product_info(
+                'https://example.com/p', {'name': 'fresh'}, ttl=600))
+            self.writer.start()
+            # Düzeltme yoksa yazı bu sürede tamamlanır ve ardından silinirdi
+            self.writer.join(0.2)
+        super().delete_many(namespace, keys)
+
+
+def test_refresh_during_expiry_is_not_deleted():
+    """Süresi dolan kayıt silinirken yapılan yenileme yazısı silinmez"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        storage = _RefreshingStorage(os.path.join(cache_dir, 'cache.db'))
+        cache = CacheManager(cache_dir=cache_dir, storage=storage)
+        storage.cache = cache
+        try:
+            cache.set_product_info('https://example.com/p', {'name': 'stale'}, ttl=-1)
+            storage.writer.join()
+            assert cache.get_product_info('https://example.com/p') == {'name': 'fresh'}
+            assert storage.get('product', cache._generate_key('product', 'https://example.com/p')) is not None
+        finally:
+            cache.close()
+
+
+if __name__ == "__main__":
+    for test in [test_pop_expired_returns_only_due_keys, test_rescheduled_key_skips_stale_heap_entry,
+                 test_discard_and_clear, test_compaction_keeps_live_entries,
+                 test_refresh_during_expiry_is_not_deleted]:
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Tam metin arama indeksi testleri
+MATCH ifadesi, BM25 sıralaması, sayfa ürünlerinin süresi ve katalogla uzlaştırma
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fulltext_index import FullTextIndex, match_expression
+
+
+class _FakeCatalogStore:
+    """refresh_catalog'un kullandığı CatalogStore arayüzü"""
+
+    def __init__(self):
+        self.rows = {}
+        self.synced_at = None
+
+    def put(self, product_id, product, synced_at):
+        self.rows[product_id] = (product, synced_at)
+        self.synced_at = synced_at
+
+    def last_synced_at(self):
+        return self.synced_at
+
+    def rows_since(self, synced_after):
+        return [('wcproducts.com', 'WCP', product_id, product)
+                for product_id, (product, synced_at) in self.rows.items() if synced_at > synced_after]
+
+    def product_ids(self):
+        return [('wcproducts.com', product_id) for product_id in self.rows]
+
+
+def _names(results):
+    return [product['name'] for product in results]
+
+
+def test_match_expression_quotes_tokens():
+    """Kelimeler tırnaklanır, FTS5 operatörleri ve noktalama etkisizleşir"""
+    assert match_expression('1/2 Hex Bearing') == '"1" "2" "hex" "bearing"'
+    assert match_expression('NOT OR*') == '"not" "or"'
+    assert match_expression('  -- ') is None
+
+
+def test_name_match_outranks_description_match():
+    """Adda geçen kelime açıklamada geçenden daha alakalıdır"""
+    with tempfile.TemporaryDirectory() as directory:
+        index = FullTextIndex(os.path.join(directory, 'fulltext.db'))
+        try:
+            # IDF'nin pozitif olması için 'bearing' geçmeyen ürünler de gerekir
+            for number, name in enumerate(['Hex Shaft', 'Gear', 'Pulley', 'Sprocket']):
+                index.add_page_product({'name': name, 'url': f'https://a.com/filler/{number}'})
+            index.add_page_product({'name': 'Shaft Collar', 'url': 'https://a.com/1',
+                                    'description': 'Fits any bearing bore'})
+            index.add_page_product({'name': 'Flanged Bearing', 'url': 'https://a.com/2',
+                                    'description': '1/2 hex bore'})
+            results = index.search('bearing')
+            assert _names(results) == ['Flanged Bearing', 'Shaft Collar']
+            assert results[0]['relevance'] > results[1]['relevance']
+            assert '«' in results[0]['snippet']
+            assert index.search('hex bearing collar') == []
+        finally:
+            index.close()
+
+
+def test_expired_page_products_are_hidden_and_purged():
+    """Süresi dolan sayfa ürünleri aramada görünmez ve purge ile silinir"""
+    with tempfile.TemporaryDirectory() as directory:
+        index = FullTextIndex(os.path.join(directory, 'fulltext.db'))
+        try:
+            index.add_page_product({'name': 'Old Gearbox', 'url': 'https://a.com/old'}, ttl=-1)
+            index.add_page_product({'name': 'New Gearbox', 'url': 'https://a.com/new'}, ttl=600)
+            assert _names(index.search('gearbox')) == ['New Gearbox']
+            assert index.purge_expired() == 1
+            assert index.stats()['documents'] == {'page': 1}
+        finally:
+            index.close()
+
+
+def test_catalog_refresh_is_incremental():
+    """Yalnızca son uzlaştırmadan sonra değişen ürünler yazılır, kaldırılanlar silinir"""
+    store = _FakeCatalogStore()
+    store.put('1', {'name': 'Versaplanetary Gearbox', 'url': 'https://wcproducts.com/1'}, 10.0)
+    store.put('2', {'name': 'Hex Shaft', 'url': 'https://wcproducts.com/2'}, 10.0)
+    with tempfile.TemporaryDirectory() as directory:
+        index = FullTextIndex(os.path.join(directory, 'fulltext.db'))
+        try:
+            assert index.refresh_catalog(store) == {'indexed': 2, 'removed': 0}
+            assert index.refresh_catalog(store) == {'indexed': 0, 'removed': 0}
+            assert index.search('gearbox')[0]['vendor'] == 'WCP'
+
+            del store.rows['2']
+            store.put('1', {'name': 'Single Stage Gearbox', 'url': 'https://wcproducts.com/1'}, 20.0)
+            assert index.refresh_catalog(store) == {'indexed': 1, 'removed': 1}
+            assert _names(index.search('gearbox')) == ['Single Stage Gearbox']
+            assert index.search('hex shaft') == []
+        finally:
+            index.close()
+
+
+if __name__ == "__main__":
+    for test in [test_match_expression_quotes_tokens, test_name_match_outranks_description_match,
+                 test_expired_page_products_are_hidden_and_purged, test_catalog_refresh_is_incremental]:
+        test()
+        print(f"✅ {test.__name__}")
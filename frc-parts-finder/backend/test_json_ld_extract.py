@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+JSON-LD Product çıkarıcı testleri
+Düz script gövdesinde geçen "ld+json" metni gerçek bloğu gölgelememeli
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from json_ld_extract import JsonLdScanner, extract_product_json_ld
+
+PRODUCT_BLOCK = (
+    '<script type="application/ld+json">'
+    '{"@context": "https://schema.org", "@type": "Product", "name": "NEO Brushless Motor", "sku": "REV-21-1650"}'
+    '</script>'
+)
+
+PAGE_WITH_JS_MARKER = (
+    '<html><head>'
+    '<script>var selector = \'script[type="application/ld+json"]\'; window.ldType = "ld+json";</script>'
+    + PRODUCT_BLOCK +
+    '</head><body>NEO</body></html>'
+)
+
+
+def test_marker_in_plain_script_body():
+    """Önceki düz script'teki işaret yanlış etiketle eşleşmemeli"""
+    product = extract_product_json_ld(PAGE_WITH_JS_MARKER)
+    assert product is not None
+    assert product['name'] == 'NEO Brushless Motor'
+
+
+def test_marker_in_plain_script_body_streamed():
+    """Aynı sayfa küçük parçalar halinde verildiğinde de Product bulunmalı"""
+    scanner = JsonLdScanner()
+    for position in range(0, len(PAGE_WITH_JS_MARKER), 7):
+        scanner.feed(PAGE_WITH_JS_MARKER[position:position + 7])
+    product = scanner.finish()
+    assert product is not None
+    assert product['sku'] == 'REV-21-1650'
+
+
+def test_uppercase_type():
+    """Büyük harfli type yazımı da bulunmalı"""
+    html = PRODUCT_BLOCK.replace('application/ld+json', 'application/LD+JSON')
+    assert extract_product_json_ld(html)['name'] == 'NEO Brushless Motor'
+
+
+if __name__ == "__main__":
+    for test in [test_marker_in_plain_script_body, test_marker_in_plain_script_body_streamed, test_uppercase_type]:
+        test()
+        print(f"✅ {test.__name__}")
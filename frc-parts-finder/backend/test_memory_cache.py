@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Bellek önbellek katmanı testleri
+TinyLFU kabul kararı, LRU tahliyesi, bayt sınırı ve count-min sketch yaşlandırması
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from memory_cache import BoundedMemoryCache, FrequencySketch
+
+
+def _touch(cache, key, times):
+    for _ in range(times):
+        cache.get(key)
+
+
+def test_lru_eviction_without_admission():
+    """Kabul politikası kapalıyken en uzun süredir kullanılmayan kayıt atılır"""
+    cache = BoundedMemoryCache(max_entries=2, admission=False)
+    cache.put('a', {'v': 1})
+    cache.put('b', {'v': 2})
+    cache.get('a')
+    assert cache.put('c', {'v': 3})
+    assert 'a' in cache and 'c' in cache and 'b' not in cache
+    assert cache.stats()['evictions'] == 1
+
+
+def test_cold_candidate_is_rejected():
+    """Kurbandan daha sık erişilmeyen aday alınmaz, sık kullanılan kayıt kalır"""
+    cache = BoundedMemoryCache(max_entries=2)
+    cache.put('neo', {'v': 1})
+    cache.put('spark max', {'v': 2})
+    _touch(cache, 'neo', 3)
+    _touch(cache, 'spark max', 3)
+    assert not cache.put('one-off query', {'v': 3})
+    assert 'neo' in cache and 'spark max' in cache
+    assert cache.stats()['rejections'] == 1
+
+
+def test_hot_candidate_evicts_lru_victim():
+    """Kurbandan sık erişilen aday LRU kurbanının yerini alır"""
+    cache = BoundedMemoryCache(max_entries=2)
+    cache.put('a', {'v': 1})
+    cache.put('b', {'v': 2})
+    _touch(cache, 'c', 3)
+    assert cache.put('c', {'v': 3})
+    assert 'a' not in cache and 'b' in cache and 'c' in cache
+
+
+def test_rejected_candidate_evicts_nothing():
+    """Birden çok kurban gerekiyorsa aday toplam sıklıkla karşılaştırılır; reddedilirse kimse atılmaz"""
+    small = {'v': 'x' * 40}
+    cache = BoundedMemoryCache(max_entries=100, max_bytes=3 * len(str(small)) + 30)
+    for key in ['a', 'b', 'c']:
+        cache.put(key, small)
+        _touch(cache, key, 2)
+    # Aday her kurbandan tek tek daha sık, ama yer açmak için gereken iki kurbanın toplamından değil
+    _touch(cache, 'big', 3)
+    assert not cache.put('big', {'v': 'x' * 80})
+    assert len(cache) == 3
+    assert cache.stats()['evictions'] == 0
+
+    _touch(cache, 'big', 5)
+    assert cache.put('big', {'v': 'x' * 80})
+    assert 'a' not in cache and 'b' not in cache and 'c' in cache
+    assert cache.stats()['evictions'] == 2
+
+
+def test_oversized_entry_is_rejected():
+    """max_bytes'tan büyük kayıt belleğe alınmaz"""
+    cache = BoundedMemoryCache(max_entries=10, max_bytes=50)
+    assert not cache.put('big', {'v': 'x' * 100})
+    assert len(cache) == 0
+
+
+def test_sketch_saturates_and_ages():
+    """Sayaçlar MAX_COUNT'ta doyar, sample_size dolunca yarıya iner"""
+    sketch = FrequencySketch(width=64, sample_size=1000)
+    for _ in range(40):
+        sketch.increment('neo')
+    assert sketch.frequency('neo') == FrequencySketch.MAX_COUNT
+    sketch._reset()
+    assert sketch.frequency('neo') == FrequencySketch.MAX_COUNT // 2
+
+
+if __name__ == "__main__":
+    for test in [test_lru_eviction_without_admission, test_cold_candidate_is_rejected,
+                 test_hot_candidate_evicts_lru_victim, test_rejected_candidate_evicts_nothing,
+                 test_oversized_entry_is_rejected, test_sketch_saturates_and_ages]:
+        test()
+        print(f"✅ {test.__name__}")
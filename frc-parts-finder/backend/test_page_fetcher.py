@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Sayfa çekme havuzu testleri
+Sonuç sırası, host başına eşzamanlılık sınırı, yoğun host'un havuzu tüketmemesi ve deadline
+"""
+
+import sys
+import os
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from deadline import deadline_scope
+from page_fetcher import PageFetcher
+
+
+def test_results_keep_url_order_and_errors_become_none():
+    """Sonuçlar URL sırasıyla döner, hata veren sayfa None olur"""
+    fetcher = PageFetcher(max_workers=4)
+
+    def fetch(url):
+        if url.endswith('/bad'):
+            raise ValueError('parse error')
+        time.sleep(0.01 if url.endswith('/1') else 0)
+        return url[-1]
+
+    urls = ['https://a.com/1', 'https://b.com/2', 'https://a.com/bad', 'https://c.com/3']
+    assert fetcher.map(fetch, urls) == ['1', '2', None, '3']
+
+
+def test_host_limit_is_respected():
+    """Aynı host'a aynı anda sınırdan fazla iş çalışmaz"""
+    fetcher = PageFetcher(max_workers=8, host_limits={'a.com': 2})
+    lock = threading.Lock()
+    active = {'now': 0, 'max': 0}
+
+    def fetch(url):
+        with lock:
+            active['now'] += 1
+            active['max'] = max(active['max'], active['now'])
+        time.sleep(0.02)
+        with lock:
+            active['now'] -= 1
+        return url
+
+    urls = [f'https://a.com/{number}' for number in range(8)]
+    assert fetcher.map(fetch, urls) == urls
+    assert active['max'] == 2
+
+
+def test_busy_host_does_not_block_pool_threads():
+    """Sınırı dolu host'un sıradaki işleri havuz thread'i tutmaz, diğer host'lar hemen çalışır"""
+    fetcher = PageFetcher(max_workers=2, host_limits={'slow.com': 1, 'fast.com': 1})
+    release = threading.Event()
+
+    def slow(url):
+        release.wait(5)
+        return url
+
+    slow_thread = threading.Thread(target=fetcher.map, args=(slow, [f'https://slow.com/{n}' for n in range(5)]))
+    slow_thread.start()
+    started = time.time()
+    assert fetcher.map(lambda url: 'ok', ['https://fast.com/1']) == ['ok']
+    assert time.time() - started < 1.0
+    release.set()
+    slow_thread.join()
+
+
+def test_deadline_returns_none_for_unfinished_pages():
+    """Deadline dolunca bitmemiş ve sırada bekleyen sayfalar None döner, bekleyenler çalıştırılmaz"""
+    fetcher = PageFetcher(max_workers=4, host_limits={'a.com': 1})
+    ran = []
+
+    def fetch(url):
+        ran.append(url)
+        time.sleep(0.3)
+        return url
+
+    with deadline_scope(0.1):
+        results = fetcher.map(fetch, ['https://a.com/1', 'https://a.com/2', 'https://a.com/3'])
+    assert results == [None, None, None]
+    time.sleep(0.4)
+    assert ran == ['https://a.com/1']
+
+
+if __name__ == "__main__":
+    for test in [test_results_keep_url_order_and_errors_become_none, test_host_limit_is_respected,
+                 test_busy_host_does_not_block_pool_threads, test_deadline_returns_none_for_unfinished_pages]:
+        test()
+        print(f"✅ {test.__name__}")
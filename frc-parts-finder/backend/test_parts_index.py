@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Parça veritabanı indeksi testleri
+Kısmi eşleşme, takma adlar, yazım hataları ve parça numarası gibi sorguların yanlış parçaya düşmemesi
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from parts_index import PARTS_INDEX, PartsIndex, PartsIndexError
+
+
+def _key(query):
+    match = PARTS_INDEX.lookup(query)
+    return match.key if match else None
+
+
+def test_exact_and_alias_keys():
+    """Anahtar ve takma ad doğrudan çözülür"""
+    assert _key('neo 550') == 'neo 550'
+    assert _key('pigeon 2') == 'pigeon'
+    assert _key('talonsrx') == 'talon srx'
+
+
+def test_partial_word_matches():
+    """Anahtar kelimesi sorgu kelimesinin içinde veya tersi"""
+    assert _key('spark') == 'spark max'
+    assert _key('neo550') == 'neo'
+    assert _key('x60') == 'kraken'
+
+
+def test_part_numbers_do_not_match_short_alias_words():
+    """Parça numaralarındaki '2' gibi parçalar 'pigeon 2' takma adına düşmemeli"""
+    for query in ['rev-21-1650', '217-8080', '2', '12345678901234567890abc']:
+        assert PARTS_INDEX.lookup(query) is None, query
+
+
+def test_typos_resolve_with_lower_confidence():
+    """Yazım hataları düzeltilir, eşleşme fuzzy ve güveni 1'in altında"""
+    for query, expected in [('krakn x60', 'kraken'), ('falkon 500', 'falcon 500'),
+                            ('canoder', 'cancoder'), ('sprak max', 'spark max')]:
+        match = PARTS_INDEX.lookup(query)
+        assert match is not None and match.key == expected, query
+        assert match.fuzzy and 0.8 <= match.confidence < 1.0, query
+    assert PARTS_INDEX.lookup('krakn x60', fuzzy=False) is None
+
+
+def test_typos_do_not_change_model_numbers():
+    """Farklı model numarası veya kısa ortak kelime yazım hatası sayılmaz"""
+    for query in ['falcon 600', 'kraken x44', 'pigeon 3', 'bolt', 'cube']:
+        assert PARTS_INDEX.lookup(query) is None, query
+
+
+def test_long_query_word_is_cheap():
+    """Çok uzun tek kelime alt dize patlamasına yol açmamalı"""
+    assert PARTS_INDEX.lookup('a' * 1600 + 'x', fuzzy=False) is None
+
+
+def test_alias_errors():
+    """Olmayan anahtarı veya kendini gösteren takma adlar derlenmez"""
+    for database in [{'a': 'missing'}, {'a': 'b', 'b': 'a'}]:
+        try:
+            PartsIndex(database)
+        except PartsIndexError:
+            continue
+        raise AssertionError(f"{database} should not compile")
+
+
+if __name__ == "__main__":
+    for test in [test_exact_and_alias_keys, test_partial_word_matches, test_part_numbers_do_not_match_short_alias_words,
+                 test_typos_resolve_with_lower_confidence, test_typos_do_not_change_model_numbers,
+                 test_long_query_word_is_cheap, test_alias_errors]:
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Token-bucket hız sınırlayıcı testleri
+Deadline'a sığmayan istekler token ayırmamalı, bekleme süresi sınırsız büyümemeli
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from deadline import DeadlineExceeded, deadline_scope
+from http_client import HttpClient
+from rate_limiter import RateLimiter, TokenBucket
+
+
+def test_burst_then_wait():
+    """Burst kadar istek beklemeden geçer, sonrakiler hızla orantılı bekler"""
+    bucket = TokenBucket(rate=1.0, burst=2)
+    now = bucket.updated
+    assert bucket.reserve(now) == 0.0
+    assert bucket.reserve(now) == 0.0
+    assert bucket.reserve(now) == 1.0
+    assert bucket.reserve(now) == 2.0
+
+
+def test_rejected_reservation_leaves_no_debt():
+    """max_wait aşılınca None döner ve bucket değişmez"""
+    bucket = TokenBucket(rate=1.0, burst=1)
+    now = bucket.updated
+    assert bucket.reserve(now) == 0.0
+    for _ in range(50):
+        assert bucket.reserve(now, max_wait=0.5) is None
+    assert bucket.rejected == 50
+    # Reddedilen 50 istekten sonra da bekleme yalnızca bir token kadardır
+    assert bucket.reserve(now) == 1.0
+
+
+def test_refill_is_capped_at_burst():
+    """Uzun boşluktan sonra en fazla burst kadar token birikir"""
+    bucket = TokenBucket(rate=2.0, burst=2)
+    now = bucket.updated
+    bucket.reserve(now)
+    bucket.reserve(now)
+    assert bucket.reserve(now + 1000) == 0.0
+    assert bucket.reserve(now + 1000) == 0.0
+    assert bucket.reserve(now + 1000) == 0.5
+
+
+class _RejectingSession:
+    """Hiç istek atılmaması gereken testler için oturum"""
+
+    def request(self, *args, **kwargs):
+        raise AssertionError('request should have been rejected before sending')
+
+
+def test_deadline_rejections_keep_next_wait_bounded():
+    """Deadline'a sığmayan tekrar tekrar reddedilen istekler sonraki beklemeyi büyütmez"""
+    limiter = RateLimiter({'andymark.com': (1.0, 1)})
+    client = HttpClient(rate_limiter=limiter)
+    client.session = _RejectingSession()
+    limiter.reserve('andymark.com')
+
+    rejected = 0
+    for _ in range(24):
+        with deadline_scope(0.2):
+            try:
+                client.get('https://andymark.com/products/x')
+            except DeadlineExceeded:
+                rejected += 1
+    assert rejected == 24
+
+    wait = limiter.reserve('andymark.com')
+    assert wait is not None and wait <= 1.0
+    assert limiter.stats()['andymark.com']['rejected'] == 24
+
+
+if __name__ == "__main__":
+    for test in [test_burst_then_wait, test_rejected_reservation_leaves_no_debt, test_refill_is_capped_at_burst,
+                 test_deadline_rejections_keep_next_wait_bounded]:
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Single-flight istek birleştirme testleri
+Eşzamanlı özdeş çağrılar tek iş yapar, sonuç ve hata paylaşılır, anahtar sonra serbest kalır
+"""
+
+import sys
+import os
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from single_flight import SingleFlight
+
+
+def _run_concurrently(flight, key, fn, count):
+    """count thread'i aynı anahtarla başlatır; lider fn içinde bekletilir"""
+    results, errors = [], []
+
+    def worker():
+        try:
+            results.append(flight.do(key, fn))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def _wait_for_followers(flight, count):
+    while flight.stats()['coalesced'] < count:
+        time.sleep(0.001)
+
+
+def test_concurrent_calls_share_one_result():
+    """Lider çalışırken gelen çağrılar işi tekrar yapmaz"""
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return 'page'
+
+    threads, results, errors = _run_concurrently(flight, 'url', fetch, 5)
+    _wait_for_followers(flight, 4)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert results == ['page'] * 5 and not errors
+    assert len(calls) == 1
+    assert flight.stats() == {'in_flight': 0, 'leaders': 1, 'coalesced': 4}
+
+
+def test_error_is_shared_with_followers():
+    """Liderin hatası follower'lara da fırlatılır"""
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fail():
+        release.wait(5)
+        raise ValueError('boom')
+
+    threads, results, errors = _run_concurrently(flight, 'url', fail, 3)
+    _wait_for_followers(flight, 2)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert not results
+    assert [str(error) for error in errors] == ['boom'] * 3
+
+
+def test_result_is_not_cached_after_call():
+    """Çağrı bitince anahtar serbest kalır, sonraki çağrı işi yeniden yapar"""
+    flight = SingleFlight()
+    counter = iter(range(10))
+    assert flight.do('key', lambda: next(counter)) == 0
+    assert flight.do('key', lambda: next(counter)) == 1
+    assert flight.do('other', lambda: 'x') == 'x'
+    assert flight.in_flight() == 0
+
+
+if __name__ == "__main__":
+    for test in [test_concurrent_calls_share_one_result, test_error_is_shared_with_followers,
+                 test_result_is_not_cached_after_call]:
+        test()
+        print(f"✅ {test.__name__}")
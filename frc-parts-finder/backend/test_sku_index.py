@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Parça numarası indeksi testleri
+Normalizasyon, kaynak sırası, katalog yenileme, sayfa ürünlerinin süresi ve önbellekten doldurma
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from cache_manager import CacheManager
+from parts_index import PARTS_INDEX
+from sku_index import SkuIndex, looks_like_part_number, product_identifiers
+
+
+class _FakeCatalogStore:
+    """refresh_catalog'un kullandığı CatalogStore arayüzü"""
+
+    def __init__(self, products):
+        self._products = products
+        self.synced_at = 1.0
+
+    def last_synced_at(self):
+        return self.synced_at
+
+    def products(self):
+        return list(self._products)
+
+
+def test_part_number_detection():
+    """Tedarikçi biçimleri ve rakamlı tek kelimeler parça numarasıdır, ürün adları değildir"""
+    for query in ['REV-21-1650', 'rev 21 1650', 'am-4567', 'WCP0384', '217-8080', '14-802004']:
+        assert looks_like_part_number(query), query
+    for query in ['neo 550', 'falcon', '2', 'am-1']:
+        assert not looks_like_part_number(query), query
+
+
+def test_identifiers_from_fields_name_and_url():
+    """SKU alanları ve ad/URL içindeki parça numaraları normalize edilir"""
+    product = {'name': 'Spark MAX (REV-11-2158)', 'url': 'https://wcproducts.com/products/wcp-0384',
+               'sku': 'am-4213', 'gtin': '012345678905'}
+    identifiers = product_identifiers(product)
+    assert 'AM4213' in identifiers
+    assert 'REV112158' in identifiers
+    assert 'WCP0384' in identifiers
+    assert '00012345678905' in identifiers
+
+
+def test_database_lookup_ignores_separators():
+    """'REV-21-1650', 'rev 21 1650' ve 'REV211650' aynı ürünü bulur"""
+    index = SkuIndex(PARTS_INDEX)
+    expected = index.lookup('REV-21-1650')
+    assert expected and expected[0]['source'] == 'database'
+    assert index.lookup('rev 21 1650') == expected
+    assert index.lookup('REV211650') == expected
+    assert index.lookup('neo 550') == []
+
+
+def test_catalog_refresh_replaces_catalog_part():
+    """Katalog yalnızca senkronizasyon zamanı değişince yeniden kurulur"""
+    store = _FakeCatalogStore([('WCP', {'name': 'Gear', 'url': 'https://wcproducts.com/p/1', 'sku': 'WCP-0384'})])
+    index = SkuIndex()
+    assert index.refresh_catalog(store)
+    assert not index.refresh_catalog(store)
+    assert [hit['vendor'] for hit in index.lookup('wcp0384')] == ['WCP']
+
+    store._products = []
+    store.synced_at = 2.0
+    assert index.refresh_catalog(store)
+    assert index.lookup('wcp0384') == []
+
+
+def test_expired_page_products_are_purged():
+    """Süresi dolan sayfa ürünleri eşleşmez ve indeksten silinir"""
+    index = SkuIndex()
+    index.add_page_product({'name': 'Hub', 'url': 'https://andymark.com/products/am-4567'}, ttl=-1)
+    index.add_page_product({'name': 'Shaft', 'url': 'https://andymark.com/products/am-4213'}, ttl=60)
+    assert index.lookup('am-4567') == []
+    assert index.stats()['pages'] == 1
+    assert [hit['name'] for hit in index.lookup('AM 4213')] == ['Shaft']
+
+
+def test_seed_from_product_cache():
+    """Ürün önbelleğindeki süresi dolmamış kayıtlar kalan TTL'leriyle indekse yüklenebilir"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = CacheManager(cache_dir=cache_dir)
+        try:
+            cache.set_product_info('https://andymark.com/products/am-4213', {
+                'name': 'Shaft', 'url': 'https://andymark.com/products/am-4213', 'sku': 'am-4213'
+            }, ttl=600)
+            entries = cache.product_entries()
+        finally:
+            cache.close()
+
+    assert len(entries) == 1
+    product, ttl = entries[0]
+    assert 590 < ttl <= 600
+    index = SkuIndex()
+    for product, ttl in entries:
+        index.add_page_product(product, ttl=ttl)
+    assert [hit['name'] for hit in index.lookup('AM-4213')] == ['Shaft']
+
+
+if __name__ == "__main__":
+    for test in [test_part_number_detection, test_identifiers_from_fields_name_and_url,
+                 test_database_lookup_ignores_separators, test_catalog_refresh_replaces_catalog_part,
+                 test_expired_page_products_are_purged, test_seed_from_product_cache]:
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Otomatik tamamlama testleri
+Önek ve kelime başı eşleşmesi, popülerliğin sıralamaya yansıması ve ağaç kurulmadan kaydedilen aramalar
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from parts_index import PARTS_INDEX
+from suggest_index import SuggestService, SuggestTrie, collect_entries
+
+
+def _texts(entries):
+    return [entry['text'] for entry in entries]
+
+
+def test_prefix_and_word_start_completion():
+    """Önek baştan veya kelime başından tamamlanır, ortadan tamamlanmaz"""
+    trie = SuggestTrie([
+        {'text': 'Kraken X60 Motor', 'kind': 'catalog', 'query': 'Kraken X60 Motor'},
+        {'text': 'neo', 'kind': 'part', 'query': 'neo', 'key': 'neo'}
+    ])
+    assert _texts(trie.complete('kra')) == ['Kraken X60 Motor']
+    assert _texts(trie.complete('X6')) == ['Kraken X60 Motor']
+    assert trie.complete('aken') == []
+    assert trie.complete('   ') == []
+
+
+def test_popularity_changes_order():
+    """Aynı türdeki girdilerden çok aranan öne geçer"""
+    entries = [
+        {'text': 'spark max', 'kind': 'part', 'query': 'spark max', 'key': 'spark max'},
+        {'text': 'spark flex', 'kind': 'part', 'query': 'spark flex', 'key': 'spark flex'}
+    ]
+    assert _texts(SuggestTrie(entries).complete('spark')) == ['spark max', 'spark flex']
+    assert _texts(SuggestTrie(entries, {'spark flex': 5}).complete('spark')) == ['spark flex', 'spark max']
+
+
+def test_record_before_first_suggest_is_counted():
+    """Ağaç henüz kurulmamışken yapılan aramalar da popülerliğe eklenir"""
+    service = SuggestService(lambda: collect_entries(PARTS_INDEX))
+    service.record('Kraken X60', 'kraken')
+    assert service.popularity['kraken x60'] == 1
+    assert service.popularity['kraken'] == 1
+
+
+def test_free_text_queries_are_not_tracked():
+    """Ağaçta karşılığı olmayan sorgular sayaçta tutulmaz"""
+    service = SuggestService(lambda: collect_entries(PARTS_INDEX))
+    for index in range(50):
+        service.record(f'random query {index}')
+    assert service.stats()['tracked_queries'] == 0
+
+
+if __name__ == "__main__":
+    for test in [test_prefix_and_word_start_completion, test_popularity_changes_order,
+                 test_record_before_first_suggest_is_counted, test_free_text_queries_are_not_tracked]:
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,197 @@
+"""
+Tedarikçi bazlı arama görevlerini çalıştırma yardımcıları
+Tedarikçiler sınırlı bir thread havuzunda paralel aranır, her birinin durumu ayrı raporlanır
+"""
+
+import contextvars
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Tuple
+import logging
+
+from deadline import clamp_timeout, current_deadline, deadline_scope
+
+logger = logging.getLogger(__name__)
+
+# Tedarikçi arama durumları
+STATUS_OK = 'ok'            # sonuç bulundu
+STATUS_EMPTY = 'empty'      # arama yapıldı, sonuç yok
+STATUS_ERROR = 'error'      # tedarikçiye ulaşılamadı / arama hata verdi
+STATUS_TIMEOUT = 'timeout'  # süre sınırı içinde bitmedi, sonucu kullanılmadı
+
+# Tüm motorların tedarikçi aramalarının paylaştığı havuz boyutu
+VENDOR_POOL_SIZE = 8
+
+# Kuyrukta bekleyen görevin başlayıp başlamadığı bu aralıkla kontrol edilir (saniye)
+VENDOR_START_POLL = 0.05
+
+_vendor_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_vendor_executor() -> ThreadPoolExecutor:
+    """Tedarikçi aramaları için paylaşılan sınırlı thread havuzu"""
+    global _vendor_executor
+    with _executor_lock:
+        if _vendor_executor is None:
+            _vendor_executor = ThreadPoolExecutor(max_workers=VENDOR_POOL_SIZE,
+                                                  thread_name_prefix='vendor-search')
+        return _vendor_executor
+
+
+class _FailureCount:
+    """Bir tedarikçi araması boyunca paylaşılan sayaç"""
+
+    def __init__(self):
+        self.value = 0
+        self.lock = threading.Lock()
+
+
+class RequestFailureTracker:
+    """
+    Tedarikçi araması başına başarısız HTTP isteği sayacı
+
+    Arama motorlarının _make_request metodu hataları yutup None döndürür;
+    bu sayaç sayesinde "sonuç yok" ile "tedarikçi hata verdi" ayırt edilir.
+    Sayaç contextvars bağlamında tutulur; sayfa çekici gibi alt thread'lere
+    bağlam kopyalandığında aynı sayaç paylaşılır.
+    """
+
+    def __init__(self):
+        self._current = contextvars.ContextVar(f'request_failures_{id(self)}', default=None)
+
+    def record(self):
+        """Başarısız isteği kaydet"""
+        counter = self._current.get()
+        if counter is None:
+            counter = _FailureCount()
+            self._current.set(counter)
+        with counter.lock:
+            counter.value += 1
+
+    def reset(self):
+        """Sayacı sıfırla"""
+        self._current.set(_FailureCount())
+
+    @property
+    def count(self) -> int:
+        counter = self._current.get()
+        return counter.value if counter else 0
+
+
+def _run_vendor_search(vendor_name: str, search: Callable[[], List[Dict]],
+                       failures: Optional[RequestFailureTracker], timeout: Optional[float],
+                       started: Dict[str, float]) -> Tuple[List[Dict], str]:
+    """
+    Tek tedarikçi aramasını çalıştır (havuz thread'inde)
+
+    Tedarikçinin süresi görev başladığında işlemeye başlar ve kendi
+    deadline'ı olarak alt isteklere taşınır; süre dolunca HTTP istekleri
+    kısalır ve thread havuza döner.
+    """
+    request_deadline = current_deadline()
+    if request_deadline is not None and request_deadline.expired():
+        # Kuyrukta beklerken istek bütçesi doldu - hiç çalıştırmadan bırak
+        return [], STATUS_TIMEOUT
+    started[vendor_name] = time.monotonic()
+    budget = clamp_timeout(timeout)
+    if budget is None:
+        return _search_vendor(vendor_name, search, failures)
+    with deadline_scope(budget):
+        return _search_vendor(vendor_name, search, failures)
+
+
+def _search_vendor(vendor_name: str, search: Callable[[], List[Dict]],
+                   failures: Optional[RequestFailureTracker]) -> Tuple[List[Dict], str]:
+    if failures:
+        failures.reset()
+    try:
+        logger.info(f"Searching {vendor_name}")
+        results = search() or []
+        logger.info(f"Found {len(results)} products from {vendor_name}")
+        if results:
+            return results, STATUS_OK
+        # İstek bütçesi dolduğu için yarıda kalan arama hata değil, zaman aşımıdır
+        deadline = current_deadline()
+        if deadline is not None and deadline.expired():
+            return results, STATUS_TIMEOUT
+        if failures and failures.count:
+            return results, STATUS_ERROR
+        return results, STATUS_EMPTY
+    except Exception as e:
+        logger.error(f"Error searching {vendor_name}: {e}")
+        return [], STATUS_ERROR
+
+
+def run_vendor_searches(tasks: Dict[str, Callable[[], List[Dict]]],
+                        failures: Optional[RequestFailureTracker] = None,
+                        status: Optional[Dict[str, str]] = None,
+                        timeout: Optional[float] = None) -> Dict[str, List[Dict]]:
+    """
+    Tedarikçi aramalarını paralel çalıştır
+
+    Args:
+        tasks: tedarikçi adı -> arama fonksiyonu
+        failures: Motorun başarısız istek sayacı (opsiyonel)
+        status: Doldurulacak tedarikçi adı -> durum sözlüğü (opsiyonel)
+        timeout: Tedarikçi başına süre sınırı (saniye). Süre, görev havuzda
+            çalışmaya başladığında işler; süresinde bitmeyen tedarikçinin
+            sonucu atılır ve durumu 'timeout' olur. Kuyrukta bekleyen görevler
+            istek deadline'ı dolunca çalıştırılmadan bırakılır.
+
+    Returns:
+        Tedarikçi bazında sonuçlar (sıra tasks ile aynıdır)
+    """
+    executor = get_vendor_executor()
+    request_deadline = current_deadline()
+    started: Dict[str, float] = {}
+    # Her görev çağıranın bağlamının kopyasında çalışır (sayaçlar, istek kapsamlı değerler)
+    futures: Dict[Future, str] = {
+        executor.submit(
+            contextvars.copy_context().run, _run_vendor_search, vendor_name, search, failures, timeout, started
+        ): vendor_name
+        for vendor_name, search in tasks.items()
+    }
+
+    outcomes: Dict[str, Tuple[List[Dict], str]] = {}
+    pending = set(futures)
+    while pending:
+        now = time.monotonic()
+        # Çalışan görevlerden süresi dolanlar beklenmez
+        if timeout is not None:
+            expired = {future for future in pending
+                       if futures[future] in started and now - started[futures[future]] >= timeout}
+            pending -= expired
+        if request_deadline is not None and request_deadline.expired():
+            break
+        if not pending:
+            break
+
+        # Bir sonraki uyanma: en yakın tedarikçi süresi veya istek deadline'ı
+        wakeups = [started[futures[future]] + timeout - now
+                   for future in pending if timeout is not None and futures[future] in started]
+        if request_deadline is not None:
+            wakeups.append(request_deadline.remaining())
+        if timeout is not None and any(futures[future] not in started for future in pending):
+            # Başlamamış görev var - saati başladığında işlesin diye kısa aralıklarla kontrol et
+            wakeups.append(VENDOR_START_POLL)
+        done, pending = wait(pending, timeout=min(wakeups) if wakeups else None, return_when=FIRST_COMPLETED)
+        for future in done:
+            outcomes[futures[future]] = future.result()
+
+    # Bitmeyenler: henüz başlamadıysa iptal et, çalışıyorsa sonucu yok say
+    for future, vendor_name in futures.items():
+        if vendor_name in outcomes:
+            continue
+        future.cancel()
+        logger.warning(f"{vendor_name} did not finish within its time limit, dropping its results")
+
+    all_results = {}
+    for vendor_name in tasks:
+        results, vendor_status = outcomes.get(vendor_name, ([], STATUS_TIMEOUT))
+        all_results[vendor_name] = results
+        if status is not None:
+            status[vendor_name] = vendor_status
+
+    return all_results
@@ -5,26 +5,34 @@ Küçük tedarikçiler ve özel mağazalar için optimize edilmiş
 
 import requests
 import re
-import json
-import time
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin
 from typing import List, Dict, Optional
 import logging
 
+from http_client import HttpClient, get_http_client
+from json_ld_extract import extract_product_json_ld
+from keyword_matcher import compile_keywords
+from page_document import page_document
+from page_fetcher import get_page_fetcher
+from vendor_tasks import RequestFailureTracker, run_vendor_searches
+
 # Logging setup
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class WooCommerceSearchEngine:
-    def __init__(self, rate_limit_delay: float = 0.5):
+    def __init__(self, rate_limit_delay: float = 0.5, http_client: Optional[HttpClient] = None):
         """
         WooCommerce arama motoru
         
         Args:
-            rate_limit_delay: Domain başına istekler arası bekleme süresi (saniye)
+            rate_limit_delay: Hız ayarı olmayan domainler için istekler arası bekleme süresi (saniye)
+            http_client: Paylaşılan HTTP istemcisi (verilmezse süreç geneli istemci kullanılır)
         """
         self.rate_limit_delay = rate_limit_delay
-        self.last_request_time = {}
+        self.failures = RequestFailureTracker()
+        self.http = http_client or get_http_client()
+        self.pages = get_page_fetcher()
         
         self.headers = {
             'User-Agent': (
@@ -58,31 +66,18 @@ class WooCommerceSearchEngine:
             }
         }
 
-    def _rate_limit(self, domain: str):
-        """Domain başına rate limiting"""
-        if domain in self.last_request_time:
-            elapsed = time.time() - self.last_request_time[domain]
-            if elapsed < self.rate_limit_delay:
-                time.sleep(self.rate_limit_delay - elapsed)
-        self.last_request_time[domain] = time.time()
-
-    def _make_request(self, url: str, timeout: int = 10, params: Dict = None) -> Optional[requests.Response]:
+    def _make_request(self, url: str, timeout: Optional[float] = None,
+                      params: Dict = None) -> Optional[requests.Response]:
         """Rate-limited HTTP request"""
         try:
-            domain = urlparse(url).netloc
-            self._rate_limit(domain)
-            
-            response = requests.get(
-                url, 
-                headers=self.headers, 
-                timeout=timeout,
-                params=params,
-                allow_redirects=True
-            )
+            # Domain başına hız sınırı paylaşılan istemcide uygulanır
+            response = self.http.get(url, headers=self.headers, timeout=timeout, params=params,
+                                     rate=1.0 / self.rate_limit_delay if self.rate_limit_delay else None)
             response.raise_for_status()
             return response
         except Exception as e:
             logger.warning(f"Request failed for {url}: {e}")
+            self.failures.record()
             return None
 
     def search_store_api(self, domain: str, query: str, per_page: int = 10) -> List[Dict]:
@@ -150,6 +145,41 @@ class WooCommerceSearchEngine:
             logger.warning(f"Failed to parse WC v3 API for {domain}: {e}")
             return []
 
+    def get_store_products(self, domain: str, page: int = 1, per_page: int = 100,
+                           modified_after: Optional[str] = None) -> List[Dict]:
+        """
+        Store API'den ürün listesini sayfa sayfa al (katalog senkronizasyonu için)
+        
+        Args:
+            domain: Tedarikçi domain
+            page: Sayfa numarası
+            per_page: Sayfa başına ürün sayısı (Store API en fazla 100)
+            modified_after: Yalnızca bu andan (ISO 8601, UTC) sonra değişen ürünler
+            
+        Returns:
+            Ürün bilgileri listesi
+        """
+        if not domain.startswith('http'):
+            domain = f"https://{domain}"
+            
+        url = f"{domain}/wp-json/wc/store/products"
+        params = {'page': page, 'per_page': per_page}
+        if modified_after:
+            params.update({'after': modified_after, 'date_column': 'modified_gmt'})
+        
+        response = self._make_request(url, params=params)
+        if not response:
+            return []
+            
+        try:
+            data = response.json()
+            return data if isinstance(data, list) else []
+        except Exception as e:
+            logger.warning(f"Failed to parse Store API products for {domain}: {e}")
+            # Bozuk yanıt boş sayfa gibi görünmesin (katalog senkronizasyonu bunu son sayfa sanar)
+            self.failures.record()
+            return []
+
     def search_products_endpoint(self, domain: str, query: str) -> List[Dict]:
         """
         /products/ endpoint'ini kullanarak arama yap
@@ -177,14 +207,9 @@ class WooCommerceSearchEngine:
             html = response.text
             product_links = re.findall(r'href="([^"]*products/[^"]*)"', html)
             
-            results = []
-            for link in product_links[:10]:  # İlk 10 ürün
-                full_url = urljoin(domain, link)
-                product_info = self._extract_product_from_page(full_url)
-                if product_info:
-                    results.append(product_info)
-                    
-            return results
+            product_urls = [urljoin(domain, link) for link in product_links[:10]]  # İlk 10 ürün
+            products = self.pages.map(self._extract_product_from_page, product_urls)
+            return [product for product in products if product]
         except Exception as e:
             logger.warning(f"Failed to parse products page for {domain}: {e}")
             return []
@@ -207,7 +232,7 @@ class WooCommerceSearchEngine:
             html = response.text
             
             # JSON-LD Product verisi ara
-            json_ld = self._extract_json_ld(html)
+            json_ld = page_document(url, html).json_ld
             if json_ld:
                 return self._parse_json_ld_product(json_ld, url)
             
@@ -220,28 +245,7 @@ class WooCommerceSearchEngine:
 
     def _extract_json_ld(self, html: str) -> Optional[Dict]:
         """HTML'den JSON-LD Product verilerini çıkar"""
-        try:
-            pattern = r'<script[^>]+type="application/ld\+json"[^>]*>(.*?)</script>'
-            matches = re.findall(pattern, html, re.DOTALL | re.IGNORECASE)
-            
-            for match in matches:
-                try:
-                    data = json.loads(match.strip())
-                    
-                    if isinstance(data, list):
-                        for item in data:
-                            if item.get('@type') == 'Product':
-                                return item
-                    elif isinstance(data, dict) and data.get('@type') == 'Product':
-                        return data
-                        
-                except json.JSONDecodeError:
-                    continue
-                    
-        except Exception as e:
-            logger.warning(f"Failed to extract JSON-LD: {e}")
-            
-        return None
+        return extract_product_json_ld(html)
 
     def _parse_json_ld_product(self, json_ld: Dict, url: str) -> Dict:
         """JSON-LD Product verisini parse et"""
@@ -411,34 +415,30 @@ class WooCommerceSearchEngine:
             product.get('sku', '') or '',
         ]).lower()
         
-        # Zorunlu anahtar kelimeleri kontrol et
-        must_keywords = [kw.lower() for kw in canonical_specs['must_keywords']]
-        return all(keyword in text_content for keyword in must_keywords)
+        # Zorunlu anahtar kelimeleri kontrol et (derlenmiş liste, ilk eksikte durur)
+        return compile_keywords(canonical_specs['must_keywords']).contains_all(text_content)
 
-    def search_all_vendors(self, query: str, canonical_specs: Optional[Dict] = None) -> Dict[str, List[Dict]]:
+    def search_all_vendors(self, query: str, canonical_specs: Optional[Dict] = None,
+                           status: Optional[Dict[str, str]] = None,
+                           timeout: Optional[float] = None) -> Dict[str, List[Dict]]:
         """
         Tüm WooCommerce tedarikçilerinde arama yap
         
         Args:
             query: Arama terimi
             canonical_specs: Canonical parça özellikleri
+            status: Tedarikçi adı -> 'ok' / 'empty' / 'error' / 'timeout' ile doldurulur (opsiyonel)
+            timeout: Tedarikçi başına süre sınırı (saniye) - tedarikçiler paralel aranır
             
         Returns:
             Tedarikçi bazında sonuçlar
         """
-        all_results = {}
-        
-        for domain, vendor_info in self.woocommerce_vendors.items():
-            try:
-                logger.info(f"Searching {vendor_info['name']} ({domain}) for: {query}")
-                results = self.search_vendor(domain, query, canonical_specs)
-                all_results[vendor_info['name']] = results
-                logger.info(f"Found {len(results)} products from {vendor_info['name']}")
-            except Exception as e:
-                logger.error(f"Error searching {domain}: {e}")
-                all_results[vendor_info['name']] = []
-                
-        return all_results
+        tasks = {
+            vendor_info['name']: (lambda domain=domain: self.search_vendor(domain, query, canonical_specs))
+            for domain, vendor_info in self.woocommerce_vendors.items()
+        }
+        logger.info(f"Searching WooCommerce vendors for: {query}")
+        return run_vendor_searches(tasks, self.failures, status, timeout)
 
 
 # Test ve örnek kullanım
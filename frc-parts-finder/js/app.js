@@ -46,11 +46,127 @@ function normalizeQuery(text) {
     return text.toLowerCase().replace(/[^a-z0-9]/g, '');
 }
 
-// Enter tuşu ile arama yapabilme
+// Enter tuşu ile arama yapabilme (seçili öneri varsa onu arar)
 document.getElementById('searchInput').addEventListener('keypress', function(e) {
     if (e.key === 'Enter') {
         e.preventDefault(); // prevent implicit form submit / page reload
-        searchParts();
+        if (suggestActive >= 0) {
+            selectSuggestion(suggestActive);
+        } else {
+            searchParts();
+        }
+    }
+});
+
+// Autocomplete: /api/suggest while typing (debounced, stale requests aborted)
+const SUGGEST_DEBOUNCE_MS = 150;
+let suggestTimer = null;
+let suggestController = null;
+let suggestItems = [];
+let suggestActive = -1;
+
+function cancelSuggestions() {
+    clearTimeout(suggestTimer);
+    if (suggestController) {
+        suggestController.abort();
+        suggestController = null;
+    }
+    renderSuggestions([]);
+}
+
+function renderSuggestions(items) {
+    const list = document.getElementById('suggestions');
+    suggestItems = items;
+    suggestActive = -1;
+    if (!items.length) {
+        list.hidden = true;
+        list.innerHTML = '';
+        return;
+    }
+    list.innerHTML = items.map((item, index) => {
+        const detail = item.kind === 'sku' ? `SKU · ${item.vendor}` : (item.vendor || 'FRC part');
+        return `
+            <li class="suggestion" role="option" data-index="${index}">
+                <span class="suggestion-text">${escapeHtml(item.text)}</span>
+                <span class="suggestion-kind">${escapeHtml(detail)}</span>
+            </li>
+        `;
+    }).join('');
+    list.hidden = false;
+}
+
+function highlightSuggestion(index) {
+    const options = document.querySelectorAll('#suggestions .suggestion');
+    suggestActive = index;
+    options.forEach((option, i) => option.classList.toggle('active', i === index));
+}
+
+function selectSuggestion(index) {
+    const item = suggestItems[index];
+    if (!item) return;
+    document.getElementById('searchInput').value = item.query;
+    cancelSuggestions();
+    searchParts();
+}
+
+async function fetchSuggestions(prefix) {
+    // A newer keystroke makes the previous request irrelevant
+    if (suggestController) {
+        suggestController.abort();
+    }
+    const controller = new AbortController();
+    suggestController = controller;
+
+    try {
+        const response = await fetch(`http://localhost:5001/api/suggest?q=${encodeURIComponent(prefix)}`, {
+            signal: controller.signal
+        });
+        if (!response.ok) {
+            throw new Error(`Backend returned ${response.status}`);
+        }
+        const data = await response.json();
+        if (controller === suggestController) {
+            renderSuggestions(Array.isArray(data.suggestions) ? data.suggestions : []);
+        }
+    } catch (error) {
+        if (error.name !== 'AbortError') {
+            console.warn('Suggestions unavailable:', error);
+            renderSuggestions([]);
+        }
+    }
+}
+
+document.getElementById('searchInput').addEventListener('input', function() {
+    const prefix = this.value.trim();
+    clearTimeout(suggestTimer);
+    if (!prefix) {
+        cancelSuggestions();
+        return;
+    }
+    suggestTimer = setTimeout(() => fetchSuggestions(prefix), SUGGEST_DEBOUNCE_MS);
+});
+
+document.getElementById('searchInput').addEventListener('keydown', function(e) {
+    if (!suggestItems.length) return;
+    if (e.key === 'ArrowDown') {
+        e.preventDefault();
+        highlightSuggestion((suggestActive + 1) % suggestItems.length);
+    } else if (e.key === 'ArrowUp') {
+        e.preventDefault();
+        highlightSuggestion(suggestActive <= 0 ? suggestItems.length - 1 : suggestActive - 1);
+    } else if (e.key === 'Escape') {
+        cancelSuggestions();
+    }
+});
+
+document.getElementById('searchInput').addEventListener('blur', cancelSuggestions);
+
+// mousedown fires before the input blurs, so the click is not lost
+document.getElementById('suggestions').addEventListener('mousedown', function(e) {
+    const option = e.target.closest('.suggestion');
+    if (option) {
+        e.preventDefault();
+        selectSuggestion(Number(option.dataset.index));
     }
 });
 
@@ -63,6 +179,7 @@ async function searchParts(event) {
     }
 
     const searchQuery = document.getElementById('searchInput').value.trim();
+    cancelSuggestions();
 
     if (!searchQuery) {
         alert('Please enter a part name!');
@@ -131,6 +248,16 @@ async function searchParts(event) {
 
         displayResults(results, source);
 
+        // Show how old cached vendor data is
+        if (data.freshness && data.freshness.cached) {
+            insertResultsNotice(describeFreshness(data.freshness));
+        }
+
+        // Warn when the server's time budget ran out before every vendor answered
+        if (data.partial) {
+            insertResultsNotice(describePartialResults(data.unfinished_vendors || []));
+        }
+
         // Search Chief Delphi forum
         searchChiefDelphi(searchQuery);
 
@@ -1393,6 +1520,39 @@ function insertResultsNotice(message) {
     }
 }
 
+// Human readable age of cached vendor results
+function formatDataAge(seconds) {
+    if (seconds < 60) return 'az önce';
+    const minutes = Math.round(seconds / 60);
+    if (minutes < 60) return `${minutes} dk önce`;
+    const hours = Math.round(minutes / 60);
+    return `${hours} saat önce`;
+}
+
+// Build the freshness notice for cached (possibly stale) results
+function describeFreshness(freshness) {
+    const age = formatDataAge(freshness.age_seconds || 0);
+    if (freshness.stale) {
+        return `
+            <strong>🕒 Önbellek:</strong> Satıcı verileri ${age} güncellendi.
+            <br><small>Arka planda yenileniyor - sonraki aramada güncel veriler gelecek.</small>
+        `;
+    }
+    return `<strong>🕒 Önbellek:</strong> Satıcı verileri ${age} güncellendi.`;
+}
+
+// Build the notice for partial results returned when the search budget expired
+function describePartialResults(unfinishedVendors) {
+    if (unfinishedVendors.length === 0) {
+        return `<strong>⏱️ Kısmi sonuç:</strong> Süre doldu, yalnızca doğrulanabilen ürünler gösteriliyor.`;
+    }
+    const vendors = [...new Set(unfinishedVendors)].map(escapeHtml).join(', ');
+    return `
+        <strong>⏱️ Kısmi sonuç:</strong> Süre doldu, bazı satıcılar yanıt vermedi.
+        <br><small>Yanıt vermeyen: ${vendors}</small>
+    `;
+}
+
 // Get source information for display
 function getSourceInfo(source) {
     const sourceMap = {
@@ -1412,6 +1572,18 @@ function getSourceInfo(source) {
             name: 'WooCommerce Vendors',
             badge: translations[currentLanguage]['live-data']
         },
+        'catalog': {
+            name: 'Vendor Catalog',
+            badge: translations[currentLanguage]['verified']
+        },
+        'local_index': {
+            name: 'Local Full-Text Index',
+            badge: translations[currentLanguage]['verified']
+        },
+        'part_number': {
+            name: 'Part Number Match',
+            badge: translations[currentLanguage]['verified']
+        },
         'real_vendors': {
             name: 'Real FRC Vendors',
             badge: translations[currentLanguage]['live-data']
@@ -1509,6 +1681,17 @@ function createPartCard(part, isCheapest = false) {
         `;
     }
 
+    // Same product from other vendors (grouped by SKU/MPN/GTIN on the backend)
+    const otherOffers = Array.isArray(part.offers) ? part.offers.filter(offer => offer.url && offer.url !== primaryHref) : [];
+    otherOffers.forEach(offer => {
+        const offerPrice = Number(offer.price) > 0 ? ` · $${Number(offer.price).toFixed(2)}` : '';
+        linksHTML += `
+            <a href="${offer.url}" target="_blank" class="view-product-btn secondary">
+                <i class="fas fa-store"></i> ${escapeHtml(offer.vendor || 'Other vendor')}${offerPrice}
+            </a>
+        `;
+    });
+
     card.innerHTML = `
         ${bestPriceBadge}
         <div class="part-info">